@@ -0,0 +1,280 @@
+# === benchmarks/bench_api.py ===
+"""API load test: latency percentiles, throughput and SQL queries per hot endpoint, with baselines.
+
+    python benchmarks/bench_api.py [--produtos 5000] [--vendas 2000] [--clientes 500] [--ajustes 2000]
+        [--requests 200] [--rounds 3] [--concurrency 8] [--workers 2] [--endpoints produtos_lista,venda_criar]
+        [--json results.json] [--save-baseline PATH] [--baseline PATH] [--tolerance 0.25]
+
+Seeds a synthetic shop (benchmarks/seed.py) into DATABASE_URL, or into a throwaway SQLite file
+when it is unset, starts gunicorn (gunicorn.conf.py, wsgi:app) on it and drives each endpoint
+with `--requests` requests from `--concurrency` threads: the read endpoints first, then the
+writes (sales, exchanges, imports), each write using its own in-stock products so none fails
+for lack of stock. Each endpoint runs --rounds times and the round with the median p95 is
+kept. The SQL count comes from the Server-Timing header.
+
+With --url the requests go to an already running server instead; it must use the same
+DATABASE_URL and JWT_SECRET as this script (pass --skip-seed if it is already seeded).
+
+--baseline compares against a saved run and exits with 1 when an endpoint regressed: p95
+latency above the baseline by more than --tolerance (a fraction), throughput below it by more
+than --tolerance, more SQL queries per request (by more than --sql-tolerance) or more errors.
+Latencies only compare on the same machine and database; save the baseline where the suite
+runs (benchmarks/baselines/api_sqlite.json was recorded on a development machine with the defaults).
+SQL counts don't depend on the machine.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The server runs in another process, so the default database is a file, not sqlite://
+_TEMP_DIR = None
+if "DATABASE_URL" not in os.environ:
+    _TEMP_DIR = tempfile.mkdtemp(prefix="bench_api_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEMP_DIR, 'bench.db')}"
+for name, value in (("SECRET_KEY", "bench"), ("JWT_SECRET", "bench-secret-key-of-32-bytes-min")):
+    os.environ.setdefault(name, value)
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+
+from benchmarks.loadgen import format_summary, free_port, run_requests, wait_until_up  # noqa: E402
+from benchmarks.seed import AGORA, seed  # noqa: E402
+from src.main import create_app  # noqa: E402
+from src.models import db, ItemVenda, Produto, Venda  # noqa: E402
+
+INICIO = (AGORA - timedelta(days=365)).date().isoformat()
+FIM = AGORA.date().isoformat()
+PERIODO = f"start_date={INICIO}&end_date={FIM}"
+
+# name -> path; GETs, run before the writes
+LEITURAS = {
+    "produtos_lista": "/api/produtos/",
+    "fifo_info": "/api/vendas/fifo_info",
+    "estoque_niveis": "/api/relatorios/estoque/niveis",
+    "vendas_sumario": f"/api/relatorios/vendas/sumario?{PERIODO}",
+    "vendas_serie": f"/api/relatorios/vendas/serie?{PERIODO}&granularidade=semana",
+    "recebiveis": "/api/relatorios/vendas/recebiveis",
+    "dashboard": "/api/dashboard/",
+}
+ESCRITAS = ("venda_criar", "troca_criar", "produtos_importar")
+
+# Metrics compared against the baseline: (key, higher is worse)
+METRICAS = (("p95_ms", True), ("throughput_rps", False), ("sql_queries_mean", True), ("errors", True))
+
+
+def _pools(app):
+    """In-stock products, split between sales and exchanges, and one sold item per sale."""
+    with app.app_context():
+        em_estoque = db.session.execute(
+            select(Produto.id, Produto.preco_venda).where(Produto.quantidade_atual > 0).order_by(Produto.id)
+        ).all()
+        item_por_venda = (
+            select(ItemVenda.venda_id, func.min(ItemVenda.produto_id).label("produto_id"))
+            .group_by(ItemVenda.venda_id)
+            .subquery()
+        )
+        vendidos = db.session.execute(
+            select(Venda.id, item_por_venda.c.produto_id, Venda.cliente_nome, Venda.cliente_sobrenome)
+            .join(item_por_venda, item_por_venda.c.venda_id == Venda.id)
+            .order_by(Venda.id)
+        ).all()
+    metade = len(em_estoque) // 2
+    return {"vendas": em_estoque[:metade], "trocas": em_estoque[metade:], "vendidos": vendidos}
+
+
+def _builders(base_url, headers, pools, args):
+    """name -> build_request(i) for run_requests."""
+    builders = {
+        nome: (lambda caminho: lambda i: ("GET", base_url + caminho, headers, None))(caminho)
+        for nome, caminho in LEITURAS.items()
+    }
+
+    def venda(i):
+        produto_id, preco = pools["vendas"][i % len(pools["vendas"])]
+        return "POST", f"{base_url}/api/vendas/", headers, {
+            "cliente_nome": "Cliente Carga", "cliente_sobrenome": f"{i}", "forma_pagamento": "Pix",
+            "produtos": [{"produto_id": produto_id, "preco_venda": preco}],
+        }
+
+    def troca(i):
+        venda_id, devolvido, nome, sobrenome = pools["vendidos"][i % len(pools["vendidos"])]
+        novo, _ = pools["trocas"][i % len(pools["trocas"])]
+        return "POST", f"{base_url}/api/trocas/", headers, {
+            "venda_original_id": venda_id, "cliente_nome": nome, "cliente_sobrenome": sobrenome or "Silva",
+            "produtos_devolvidos": [{"produto_id": devolvido}], "produtos_novos": [{"produto_id": novo}],
+        }
+
+    def importacao(i):
+        return "POST", f"{base_url}/api/produtos/import", headers, {"products": [
+            {"nome": f"Body importado {i}-{n}", "tamanho": "M", "sexo": "Unissex", "cor_estampa": "Azul",
+             "fornecedor": "Fornecedor 1", "custo": "20.00", "preco_venda": "45.00", "quantidade": "2",
+             "data_compra": FIM}
+            for n in range(args.import_batch)
+        ]}
+
+    builders.update({"venda_criar": venda, "troca_criar": troca, "produtos_importar": importacao})
+    return builders
+
+
+def _start_server(args):
+    port = free_port()
+    env = dict(os.environ)
+    env.update({"SERVING_MODE": args.serving_mode, "SERVER_TIMING_ENABLED": "true", "PROMETHEUS_MULTIPROC_DIR": ""})
+    # Query counts end up in the results; keep the per-request slow query and N+1 warnings quiet
+    env.setdefault("SLOW_QUERY_MS", "60000")
+    env.setdefault("N_PLUS_ONE_THRESHOLD", "1000000")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--workers", str(args.workers),
+         "--bind", f"127.0.0.1:{port}", "--log-level", "warning", "wsgi:app"],
+        cwd=ROOT, env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_up(base_url, proc)
+    except Exception:
+        proc.terminate()
+        raise
+    return proc, base_url
+
+
+def _median_round(rodadas):
+    """The round with the median p95, plus every round's p95 to show the spread."""
+    mediana = sorted(rodadas, key=lambda r: r["p95_ms"])[len(rodadas) // 2]
+    return {**mediana, "rounds_p95_ms": [r["p95_ms"] for r in rodadas]}
+
+
+def compare(resultados, baseline, tolerance, sql_tolerance):
+    """Rows (endpoint, metric, baseline, current, regressed) for the endpoints present in both."""
+    linhas = []
+    for nome, atual in resultados["endpoints"].items():
+        base = baseline["endpoints"].get(nome)
+        if base is None:
+            continue
+        for metrica, maior_pior in METRICAS:
+            antes, agora = base.get(metrica), atual.get(metrica)
+            if antes is None or agora is None:
+                continue
+            if metrica == "sql_queries_mean":
+                regrediu = agora > antes + sql_tolerance
+            elif metrica == "errors":
+                regrediu = agora > antes
+            elif maior_pior:
+                regrediu = agora > antes * (1 + tolerance)
+            else:
+                regrediu = agora < antes * (1 - tolerance)
+            linhas.append((nome, metrica, antes, agora, regrediu))
+    return linhas
+
+
+def _print_comparison(linhas, baseline, resultados):
+    diferentes = [k for k in ("dialect", "seed", "requests", "rounds", "concurrency", "workers")
+                  if baseline["meta"].get(k) != resultados["meta"].get(k)]
+    if diferentes:
+        print(f"warning: baseline recorded with different {', '.join(diferentes)}; latencies may not compare")
+    print(f"\n{'endpoint':<18} {'metric':<17} {'baseline':>10} {'current':>10} {'change':>8}")
+    for nome, metrica, antes, agora, regrediu in linhas:
+        variacao = f"{(agora - antes) / antes * 100:+7.1f}%" if antes else "       -"
+        print(f"{nome:<18} {metrica:<17} {antes:10.1f} {agora:10.1f} {variacao}{'  REGRESSION' if regrediu else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--produtos", type=int, default=5000)
+    parser.add_argument("--vendas", type=int, default=2000)
+    parser.add_argument("--clientes", type=int, default=500)
+    parser.add_argument("--ajustes", type=int, default=2000, help="extra 'ajuste' ledger rows")
+    parser.add_argument("--requests", type=int, default=200, help="per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3, help="runs per endpoint; the median one (by p95) is kept")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests before each read endpoint")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--serving-mode", default="sync")
+    parser.add_argument("--import-batch", type=int, default=20, help="products per import request")
+    parser.add_argument("--endpoints", default=",".join([*LEITURAS, *ESCRITAS]))
+    parser.add_argument("--url", help="target an already running server instead of starting gunicorn")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--save-baseline", help="write the results as a baseline to this file")
+    parser.add_argument("--baseline", help="compare against this baseline; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--sql-tolerance", type=float, default=0.5)
+    args = parser.parse_args()
+
+    endpoints = args.endpoints.split(",")
+    desconhecidos = set(endpoints) - set(LEITURAS) - set(ESCRITAS)
+    if desconhecidos:
+        parser.error(f"unknown endpoints: {', '.join(sorted(desconhecidos))}")
+
+    app = create_app()
+    contagens = None
+    with app.app_context():
+        if not args.skip_seed:
+            contagens = seed(produtos=args.produtos, vendas=args.vendas, clientes=args.clientes, ajustes=args.ajustes)
+        headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+        dialect = db.engine.dialect.name
+    pools = _pools(app)
+    for nome, pool in (("venda_criar", "vendas"), ("troca_criar", "trocas"), ("troca_criar", "vendidos")):
+        if nome in endpoints and len(pools[pool]) < args.requests * args.rounds:
+            print(f"warning: only {len(pools[pool])} rows for {nome}; later requests reuse them and may fail")
+
+    proc, base_url = (None, args.url.rstrip("/")) if args.url else _start_server(args)
+    resultados = {
+        "meta": {
+            "dialect": dialect, "seed": contagens, "requests": args.requests, "rounds": args.rounds,
+            "concurrency": args.concurrency, "workers": None if args.url else args.workers, "python": platform.python_version(),
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        },
+        "endpoints": {},
+    }
+    try:
+        builders = _builders(base_url, headers, pools, args)
+        print(f"{dialect}, {args.requests} requests per endpoint, {args.concurrency} concurrent clients")
+        for nome in endpoints:
+            if nome in LEITURAS:
+                run_requests(builders[nome], args.warmup, args.concurrency)
+            rodadas = []
+            for rodada in range(args.rounds):
+                # Writes continue from where the previous round stopped, so no product is sold twice
+                deslocamento = rodada * args.requests
+                rodadas.append(run_requests(
+                    lambda i: builders[nome](deslocamento + i), args.requests, args.concurrency
+                ))
+            resultados["endpoints"][nome] = _median_round(rodadas)
+            print(format_summary(nome, resultados["endpoints"][nome], width=18))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+        if _TEMP_DIR:
+            shutil.rmtree(_TEMP_DIR, ignore_errors=True)
+
+    for destino in (args.json, args.save_baseline):
+        if destino:
+            os.makedirs(os.path.dirname(os.path.abspath(destino)), exist_ok=True)
+            with open(destino, "w") as f:
+                json.dump(resultados, f, indent=2, sort_keys=True)
+                f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        linhas = compare(resultados, baseline, args.tolerance, args.sql_tolerance)
+        _print_comparison(linhas, baseline, resultados)
+        regressoes = [linha for linha in linhas if linha[-1]]
+        if regressoes:
+            print(f"\n{len(regressoes)} regression(s)")
+            sys.exit(1)
+        print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# === benchmarks/bench_columnar.py ===
+"""Row vs columnar (?format=columnar) product payloads: size, server time and parse time.
+
+    python benchmarks/bench_columnar.py [--produtos 20000] [--repeat 5]
+
+Parse time is json.loads in CPython, a stand-in for JSON.parse on the client; the columnar
+payload has far fewer objects and strings to allocate.
+"""
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+for name, value in (("DATABASE_URL", "sqlite://"), ("SECRET_KEY", "bench"), ("JWT_SECRET", "bench-secret-key-of-32-bytes-min")):
+    os.environ.setdefault(name, value)
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from benchmarks.seed import seed  # noqa: E402
+from src.main import create_app  # noqa: E402
+
+
+def _median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--produtos", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        seed(produtos=args.produtos, vendas=0)
+        headers = {"Authorization": f"Bearer {create_access_token(identity='1')}", "Accept-Encoding": "identity"}
+    client = app.test_client()
+
+    print(f"{args.produtos} products")
+    print(f"{'endpoint':<48} {'bytes':>11} {'gzip':>9} {'server ms':>10} {'parse ms':>9}")
+    for base in ("/api/produtos/", "/api/relatorios/estoque/niveis"):
+        for url in (base, f"{base}?format=columnar"):
+            server_ms, response = _median_ms(lambda: client.get(url, headers=headers), args.repeat)
+            corpo = response.get_data()
+            parse_ms, _ = _median_ms(lambda: json.loads(corpo), args.repeat)
+            print(f"{url:<48} {len(corpo):>11,} {len(gzip.compress(corpo)):>9,} {server_ms:>10.1f} {parse_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
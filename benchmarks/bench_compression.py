@@ -0,0 +1,73 @@
+# === benchmarks/bench_compression.py ===
+"""Bytes on the wire and CPU cost of response compression, per endpoint and encoding.
+
+    python benchmarks/bench_compression.py [--produtos 5000] [--vendas 2000] [--repeat 5]
+
+Seeds an in-memory SQLite database (benchmarks/seed.py) and requests each endpoint through the
+test client with Accept-Encoding identity, gzip and br. CPU is process time per request, so the
+compression overhead is the difference from the identity row.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+for name, value in (("DATABASE_URL", "sqlite://"), ("SECRET_KEY", "bench"), ("JWT_SECRET", "bench-secret-key-of-32-bytes-min")):
+    os.environ.setdefault(name, value)
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from benchmarks.seed import seed  # noqa: E402
+from src.compression import brotli  # noqa: E402
+from src.main import create_app  # noqa: E402
+
+ENDPOINTS = [
+    "/api/produtos/",
+    "/api/vendas/",
+    "/api/transacoes/",
+    "/api/relatorios/estoque/niveis",
+    "/api/vendas/?format=ndjson",
+    "/api/exportacoes/vendas",
+]
+
+
+def measure(client, url, encoding, headers, repeat):
+    cpu, tamanho = [], 0
+    for _ in range(repeat):
+        started = time.process_time()
+        response = client.get(url, headers={**headers, "Accept-Encoding": encoding})
+        tamanho = len(response.get_data())
+        cpu.append((time.process_time() - started) * 1000)
+        assert response.status_code == 200, (url, response.status_code)
+    return tamanho, statistics.median(cpu)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--produtos", type=int, default=5000)
+    parser.add_argument("--vendas", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        seed(produtos=args.produtos, vendas=args.vendas)
+        headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+    client = app.test_client()
+
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    print(f"{'endpoint':<34} {'encoding':<9} {'bytes':>12} {'ratio':>7} {'cpu ms':>9} {'+cpu ms':>8}")
+    for url in ENDPOINTS:
+        base_size, base_cpu = None, None
+        for encoding in encodings:
+            tamanho, cpu = measure(client, url, encoding, headers, args.repeat)
+            if base_size is None:
+                base_size, base_cpu = tamanho, cpu
+            print(f"{url:<34} {encoding:<9} {tamanho:>12,} {base_size / tamanho:>6.1f}x {cpu:>9.1f} {cpu - base_cpu:>+8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# === benchmarks/bench_json.py ===
+"""Micro-benchmark: JSON serialization of realistic Produto/Venda list payloads.
+
+    python benchmarks/bench_json.py [--produtos 20000] [--vendas 5000] [--repeat 5]
+
+Compares Flask's stdlib provider on the old payloads (dates pre-converted with .isoformat())
+with the providers in src/json_provider.py on to_dict() output. Builds transient model
+objects, so no database is needed.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+for name, value in (("DATABASE_URL", "sqlite://"), ("SECRET_KEY", "bench"), ("JWT_SECRET", "bench")):
+    os.environ.setdefault(name, value)
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from src.json_provider import IsoJSONProvider, OrjsonProvider, orjson  # noqa: E402
+from src.main import create_app  # noqa: E402
+from src.models.product import Produto  # noqa: E402
+from src.models.sale import ItemVenda, Venda  # noqa: E402
+from src.models.supplier import Fornecedor  # noqa: E402
+
+TAMANHOS = ["RN", "P", "M", "G", "1", "2", "3", "4", "6", "8"]
+CORES = ["Azul", "Rosa", "Branco", "Listrado", "Floral", "Verde", "Amarelo"]
+
+
+def build_payloads(n_produtos, n_vendas, seed=42):
+    rng = random.Random(seed)
+    agora = datetime(2025, 6, 1, 12, 0, 0)
+    fornecedores = [Fornecedor(id=i, nome=f"Fornecedor {i}") for i in range(1, 21)]
+    produtos = []
+    for i in range(1, n_produtos + 1):
+        fornecedor = rng.choice(fornecedores)
+        produtos.append(Produto(
+            id=i, sku=f"SKU{i:06d}", nome=f"Body manga longa {i}", sexo=rng.choice(["Masculino", "Feminino"]),
+            tamanho=rng.choice(TAMANHOS), cor_estampa=rng.choice(CORES), fornecedor_id=fornecedor.id,
+            fornecedor=fornecedor, custo=round(rng.uniform(10, 60), 2), preco_venda=round(rng.uniform(30, 150), 2),
+            quantidade_atual=rng.randint(0, 30), limite_reabastecimento=5,
+            data_compra=date(2025, 1, 1) + timedelta(days=rng.randint(0, 150)),
+            created_at=agora - timedelta(days=rng.randint(0, 365), seconds=rng.randint(0, 86400)),
+            updated_at=agora - timedelta(seconds=rng.randint(0, 86400 * 30)),
+        ))
+    vendas = []
+    for i in range(1, n_vendas + 1):
+        data_venda = agora - timedelta(days=rng.randint(0, 365), seconds=rng.randint(0, 86400))
+        venda = Venda(
+            id=i, cliente_id=rng.randint(1, 500), cliente_nome="Maria", cliente_sobrenome="Silva",
+            data_venda=data_venda, data_pagamento=data_venda + timedelta(days=rng.randint(0, 30)),
+            valor_total=round(rng.uniform(30, 600), 2), forma_pagamento=rng.choice(["Pix", "Crédito", "Dinheiro"]),
+            status="Pago", observacoes=None, desconto_percentual=None, desconto_valor=None,
+        )
+        for j in range(rng.randint(1, 4)):
+            produto = rng.choice(produtos)
+            venda.itens.append(ItemVenda(
+                id=i * 10 + j, venda_id=i, produto_id=produto.id, produto=produto, quantidade=1,
+                preco_unitario=produto.preco_venda, custo_unitario=produto.custo,
+            ))
+        vendas.append(venda)
+    return [p.to_dict() for p in produtos], [v.to_dict() for v in vendas]
+
+
+def _as_isoformat(value):
+    """The payloads as the models used to build them: dates already turned into strings."""
+    if isinstance(value, dict):
+        return {k: _as_isoformat(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_as_isoformat(v) for v in value]
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _time(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(fn())
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--produtos", type=int, default=20000)
+    parser.add_argument("--vendas", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        produtos, vendas = build_payloads(args.produtos, args.vendas)
+        old_produtos, old_vendas = _as_isoformat(produtos), _as_isoformat(vendas)
+        candidates = [("flask stdlib (isoformat in to_dict)", DefaultJSONProvider(app), True),
+                      ("IsoJSONProvider", IsoJSONProvider(app), False)]
+        if orjson is not None:
+            candidates.append(("OrjsonProvider", OrjsonProvider(app), False))
+
+        for label, payload, old in (("produtos", produtos, old_produtos), ("vendas", vendas, old_vendas)):
+            print(f"\n{label}: {len(payload)} rows")
+            baseline = None
+            for name, provider, uses_old in candidates:
+                body = {"success": True, label: old if uses_old else payload}
+                seconds, size = _time(lambda: provider.response(body).get_data(), args.repeat)
+                baseline = baseline or seconds
+                print(f"  {name:<38} {seconds * 1000:8.1f} ms  {len(payload) / seconds:10.0f} rows/s  "
+                      f"{size / 1024:8.0f} KiB  {baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# === benchmarks/bench_read_path.py ===
+"""ORM to_dict() vs plain SQL rows (src/utils/list_rows.py) for the list endpoints' read path.
+
+    python benchmarks/bench_read_path.py [--produtos 20000] [--vendas 5000] [--repeat 5]
+
+Both paths build the same list of dicts; the timings cover the queries and dict building,
+not JSON encoding.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+for name, value in (("DATABASE_URL", "sqlite://"), ("SECRET_KEY", "bench"), ("JWT_SECRET", "bench-secret-key-of-32-bytes-min")):
+    os.environ.setdefault(name, value)
+
+from sqlalchemy.orm import joinedload, selectinload  # noqa: E402
+
+from benchmarks.seed import seed  # noqa: E402
+from src.main import create_app  # noqa: E402
+from src.models import db, Cliente, Fornecedor, ItemVenda, Produto, TransacaoEstoque, Venda  # noqa: E402
+from src.utils import list_rows  # noqa: E402
+
+
+def _median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--produtos", type=int, default=20000)
+    parser.add_argument("--vendas", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        seed(produtos=args.produtos, vendas=args.vendas)
+        casos = (
+            ("produtos",
+             lambda: [p.to_dict() for p in Produto.query.options(joinedload(Produto.fornecedor)).order_by(Produto.id)],
+             lambda: list_rows.row_dicts(list_rows.produto_select().order_by(Produto.id))),
+            ("vendas",
+             lambda: [v.to_dict() for v in Venda.query.options(
+                 selectinload(Venda.itens).joinedload(ItemVenda.produto)).order_by(Venda.id)],
+             lambda: list_rows.venda_dicts(list_rows.venda_select().order_by(Venda.id))),
+            ("transacoes",
+             lambda: [t.to_dict() for t in TransacaoEstoque.query.options(
+                 joinedload(TransacaoEstoque.produto)).order_by(TransacaoEstoque.id)],
+             lambda: list_rows.row_dicts(list_rows.transacao_select().order_by(TransacaoEstoque.id))),
+            ("clientes",
+             lambda: [c.to_dict() for c in Cliente.query.order_by(Cliente.id)],
+             lambda: list_rows.row_dicts(list_rows.cliente_select().order_by(Cliente.id))),
+            ("fornecedores",
+             lambda: [f.to_dict() for f in Fornecedor.query.order_by(Fornecedor.id)],
+             lambda: list_rows.row_dicts(list_rows.fornecedor_select().order_by(Fornecedor.id))),
+        )
+
+        print(f"{'entity':<14} {'rows':>8} {'orm ms':>9} {'rows ms':>9} {'orm rows/s':>12} {'rows rows/s':>12}")
+        for nome, orm, linhas in casos:
+            orm_ms, total = _median_ms(orm, args.repeat)
+            rows_ms, _ = _median_ms(linhas, args.repeat)
+            print(f"{nome:<14} {total:>8} {orm_ms:>9.1f} {rows_ms:>9.1f} "
+                  f"{total / orm_ms * 1000:>12,.0f} {total / rows_ms * 1000:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# === benchmarks/bench_serving_modes.py ===
+"""Load test: sync vs gevent gunicorn workers on an I/O-bound route.
+
+    python benchmarks/bench_serving_modes.py [--workers 2] [--concurrency 50] [--requests 400] [--io-ms 100]
+
+Starts gunicorn (with gunicorn.conf.py) once per SERVING_MODE on benchmarks.io_app:app and
+drives GET /_bench/io?ms=<io-ms> concurrently. With sync workers throughput is capped near
+workers * 1000 / io_ms; gevent workers overlap the waits. Uses DATABASE_URL if set (PostgreSQL
+exercises psycogreen via pg_sleep), otherwise an in-memory SQLite database.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.loadgen import format_summary, free_port, run_load, wait_until_up  # noqa: E402
+
+
+def run_mode(mode, args):
+    port = free_port()
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "bench")
+    env.setdefault("JWT_SECRET", "bench")
+    env.update({
+        "SERVING_MODE": mode,
+        "GUNICORN_WORKER_CONNECTIONS": str(args.concurrency),
+        # Let each worker's greenlets check out enough connections for the wait
+        "DB_POOL_SIZE": env.get("DB_POOL_SIZE", str(args.concurrency)),
+        "PROMETHEUS_MULTIPROC_DIR": "",
+    })
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--workers", str(args.workers),
+         "--bind", f"127.0.0.1:{port}", "--log-level", "warning", "benchmarks.io_app:app"],
+        cwd=ROOT, env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_up(base_url, proc)
+        url = f"{base_url}/_bench/io?ms={args.io_ms}"
+        run_load(url, requests=args.concurrency, concurrency=args.concurrency)  # warm-up
+        return run_load(url, requests=args.requests, concurrency=args.concurrency)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--io-ms", type=int, default=100)
+    parser.add_argument("--modes", default="sync,gevent")
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers, {args.concurrency} concurrent clients, "
+          f"{args.requests} requests, {args.io_ms} ms I/O per request")
+    results = {}
+    for mode in args.modes.split(","):
+        results[mode] = run_mode(mode, args)
+        print(format_summary(mode, results[mode]))
+
+    if "sync" in results and "gevent" in results and results["sync"]["throughput_rps"]:
+        gain = results["gevent"]["throughput_rps"] / results["sync"]["throughput_rps"]
+        print(f"gevent throughput: {gain:.1f}x sync")
+
+
+if __name__ == "__main__":
+    main()
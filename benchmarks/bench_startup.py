@@ -0,0 +1,82 @@
+# === benchmarks/bench_startup.py ===
+"""Cold-start benchmark: time `import src.main` and `create_app()` in fresh interpreters.
+
+    python benchmarks/bench_startup.py [--runs 10] [--importtime]
+
+Each run is a new subprocess, so nothing is cached in-process. Uses an in-memory SQLite URL
+unless DATABASE_URL is set; create_app must not touch the database either way. With
+--importtime, also prints the slowest top-level imports from `python -X importtime`.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+from src.main import create_app
+t1 = time.perf_counter()
+create_app()
+t2 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "create_app_ms": (t2 - t1) * 1000}))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "bench")
+    env.setdefault("JWT_SECRET", "bench")
+    return env
+
+
+def run_once():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, env=_env(), check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def slowest_imports(limit=15):
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "from src.main import create_app"],
+        cwd=ROOT, env=_env(), check=True, capture_output=True, text=True
+    ).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Three-space indent = imported directly by src.main
+        if name.startswith("   ") and not name.startswith("    "):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--importtime", action="store_true")
+    args = parser.parse_args()
+
+    run_once()  # warm the OS file cache and .pyc files
+    results = [run_once() for _ in range(args.runs)]
+    for key in ("import_ms", "create_app_ms"):
+        values = [r[key] for r in results]
+        print(f"{key:>14}: median {statistics.median(values):7.1f}  min {min(values):7.1f}  max {max(values):7.1f}")
+    totals = [r["import_ms"] + r["create_app_ms"] for r in results]
+    print(f"{'total_ms':>14}: median {statistics.median(totals):7.1f}")
+
+    if args.importtime:
+        print("\nslowest imports (cumulative ms):")
+        for micros, name in slowest_imports():
+            print(f"{micros / 1000:8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
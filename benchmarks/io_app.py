@@ -0,0 +1,30 @@
+# === benchmarks/io_app.py ===
+"""The real app plus one I/O-bound route, for comparing serving modes.
+
+GET /_bench/io?ms=100 waits `ms` milliseconds in the database (pg_sleep on PostgreSQL) or, on
+SQLite, in time.sleep (cooperative under gevent, like a socket wait). Not for production.
+"""
+import time
+
+from src.concurrency import patch_for_serving_mode
+
+patch_for_serving_mode()
+
+from flask import jsonify, request
+from sqlalchemy import text
+
+from src.main import create_app
+from src.models import db
+
+app = create_app()
+
+
+@app.route("/_bench/io")
+def bench_io():
+    ms = request.args.get("ms", 100, type=int)
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(text("SELECT pg_sleep(:s)"), {"s": ms / 1000})
+    else:
+        time.sleep(ms / 1000)
+        db.session.execute(text("SELECT 1"))
+    return jsonify({"success": True, "ms": ms})
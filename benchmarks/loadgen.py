@@ -0,0 +1,115 @@
+# === benchmarks/loadgen.py ===
+"""Minimal concurrent HTTP load driver shared by the benchmark scripts (stdlib only)."""
+import json
+import re
+import socket
+import statistics
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Query count of the "db" entry of the Server-Timing header (src/instrumentation.py)
+SQL_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(base_url, proc, timeout=30):
+    """Polls /health/live until the server process proc answers."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with {proc.returncode}")
+        try:
+            urllib.request.urlopen(f"{base_url}/health/live", timeout=1).read()
+            return
+        except Exception:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start in time")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of values (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _request(url, headers, timeout, method="GET", body=None):
+    """Returns (status, latency ms, SQL queries from Server-Timing or None); status is None on connection errors."""
+    started = time.perf_counter()
+    queries = None
+    try:
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers = {**(headers or {}), "Content-Type": "application/json"}
+        req = urllib.request.Request(url, data=data, headers=headers or {}, method=method)
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            status = resp.status
+            timing = resp.headers.get("Server-Timing", "")
+    except urllib.error.HTTPError as e:
+        status = e.code
+        timing = e.headers.get("Server-Timing", "") if e.headers else ""
+    except Exception:
+        status, timing = None, ""
+    match = SQL_QUERIES_RE.search(timing)
+    if match:
+        queries = int(match.group(1))
+    return status, (time.perf_counter() - started) * 1000, queries
+
+
+def run_requests(build_request, requests, concurrency, timeout=60):
+    """Sends `requests` requests from `concurrency` threads; build_request(i) returns
+    (method, url, headers, json body or None) for the i-th one. Returns a summary dict (times in ms)."""
+    def send(i):
+        method, url, headers, body = build_request(i)
+        return _request(url, headers, timeout, method=method, body=body)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(send, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    ok = [(ms, queries) for status, ms, queries in results if status is not None and status < 400]
+    latencies = [ms for ms, _ in ok]
+    queries = [q for _, q in ok if q is not None]
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": len(results) - len(ok),
+        "status_codes": dict(sorted(Counter(str(status) for status, _, _ in results).items())),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(ok) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "sql_queries_mean": statistics.fmean(queries) if queries else None,
+        "sql_queries_max": max(queries) if queries else None,
+    }
+
+
+def run_load(url, requests, concurrency, headers=None, timeout=60):
+    """Sends `requests` GETs to url from `concurrency` threads; returns a summary dict (times in ms)."""
+    return run_requests(lambda _: ("GET", url, headers, None), requests, concurrency, timeout=timeout)
+
+
+def format_summary(label, summary, width=10):
+    linha = (
+        f"{label:<{width}} {summary['throughput_rps']:8.1f} req/s  "
+        f"p50 {summary['p50_ms']:7.1f}  p95 {summary['p95_ms']:7.1f}  p99 {summary['p99_ms']:7.1f} ms  "
+        f"errors {summary['errors']}"
+    )
+    if summary.get("sql_queries_mean") is not None:
+        linha += f"  sql {summary['sql_queries_mean']:.1f}/req"
+    return linha
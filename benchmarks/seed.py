@@ -0,0 +1,116 @@
+# === benchmarks/seed.py ===
+"""Deterministic synthetic data for the benchmarks: suppliers, clients, products, sales with
+items and the matching stock ledger (plus optional manual adjustments), inserted in bulk.
+Run inside an app context."""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, text
+
+from src.models import db, Cliente, Fornecedor, ItemVenda, Produto, TransacaoEstoque, Venda
+
+TAMANHOS = ["RN", "P", "M", "G", "1", "2", "3", "4", "6", "8"]
+CORES = ["Azul", "Rosa", "Branco", "Listrado", "Floral", "Verde", "Amarelo", "Cinza"]
+PECAS = ["Body manga longa", "Body manga curta", "Macacão", "Vestido", "Conjunto", "Calça", "Pijama"]
+FORMAS_PAGAMENTO = ["Pix", "Crédito", "Débito", "Dinheiro"]
+STATUS = ["Pago", "Pago", "Pago", "Pagamento Pendente"]
+# Fixed "now" so runs are reproducible; sales fall in the year before it
+AGORA = datetime(2026, 6, 1, 12)
+# Tables seeded with explicit ids
+SEQUENCE_TABLES = (Fornecedor, Cliente, Produto, Venda)
+
+
+def _reset_sequences():
+    # PostgreSQL serials don't see explicitly inserted ids; move each sequence past them so the API can create rows afterwards
+    if db.engine.dialect.name != "postgresql":
+        return
+    for model in SEQUENCE_TABLES:
+        tabela = model.__tablename__
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{tabela}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {tabela}), false)"
+        ))
+
+
+def seed(produtos=5000, vendas=2000, clientes=500, fornecedores=20, ajustes=0, seed=42, batch_size=5000):
+    """Creates the tables if needed and inserts the rows; returns the counts inserted.
+
+    ajustes adds that many manual 'ajuste' ledger entries on random products, on top of the
+    'compra' and 'venda' entries every product and sale gets.
+    """
+    rng = random.Random(seed)
+    agora = AGORA
+    db.create_all()
+
+    def bulk(model, rows):
+        for i in range(0, len(rows), batch_size):
+            db.session.execute(insert(model), rows[i:i + batch_size])
+
+    base_fornecedor = db.session.query(func.coalesce(func.max(Fornecedor.id), 0)).scalar()
+    bulk(Fornecedor, [{"id": base_fornecedor + i, "nome": f"Fornecedor {base_fornecedor + i}"}
+                      for i in range(1, fornecedores + 1)])
+    base_cliente = db.session.query(func.coalesce(func.max(Cliente.id), 0)).scalar()
+    bulk(Cliente, [{"id": base_cliente + i, "nome": f"Cliente {base_cliente + i}",
+                    "telefone": f"11 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"}
+                   for i in range(1, clientes + 1)])
+
+    base_produto = db.session.query(func.coalesce(func.max(Produto.id), 0)).scalar()
+    linhas_produtos, linhas_transacoes = [], []
+    for i in range(1, produtos + 1):
+        produto_id = base_produto + i
+        custo = round(rng.uniform(10, 60), 2)
+        quantidade = rng.randint(0, 30)
+        criado = agora - timedelta(days=rng.randint(30, 400))
+        linhas_produtos.append({
+            "id": produto_id, "sku": f"SKU{produto_id:07d}", "nome": f"{rng.choice(PECAS)} {produto_id}",
+            "sexo": rng.choice(["Masculino", "Feminino", "Unissex"]), "tamanho": rng.choice(TAMANHOS),
+            "cor_estampa": rng.choice(CORES), "fornecedor_id": base_fornecedor + rng.randint(1, fornecedores),
+            "custo": custo, "preco_venda": round(custo * rng.uniform(1.8, 2.6), 2),
+            "quantidade_atual": quantidade, "limite_reabastecimento": 5,
+            "data_compra": criado.date(), "created_at": criado, "updated_at": criado,
+        })
+        linhas_transacoes.append({
+            "produto_id": produto_id, "tipo_transacao": "compra", "quantidade": quantidade + 5,
+            "data_transacao": criado, "created_at": criado, "custo_unitario_transacao": custo,
+        })
+    bulk(Produto, linhas_produtos)
+
+    base_venda = db.session.query(func.coalesce(func.max(Venda.id), 0)).scalar()
+    linhas_vendas, linhas_itens = [], []
+    for i in range(1, vendas + 1):
+        venda_id = base_venda + i
+        data_venda = agora - timedelta(days=rng.randint(0, 365), minutes=rng.randint(0, 600))
+        status = rng.choice(STATUS)
+        itens = rng.sample(linhas_produtos, k=min(rng.randint(1, 4), len(linhas_produtos)))
+        for produto in itens:
+            linhas_itens.append({
+                "venda_id": venda_id, "produto_id": produto["id"], "quantidade": 1,
+                "preco_unitario": produto["preco_venda"], "custo_unitario": produto["custo"],
+            })
+            linhas_transacoes.append({
+                "produto_id": produto["id"], "tipo_transacao": "venda", "quantidade": -1, "venda_id": venda_id,
+                "data_transacao": data_venda, "created_at": data_venda, "custo_unitario_transacao": produto["custo"],
+            })
+        cliente_id = base_cliente + rng.randint(1, clientes)
+        linhas_vendas.append({
+            "id": venda_id, "cliente_id": cliente_id, "cliente_nome": f"Cliente {cliente_id}",
+            "cliente_sobrenome": "Silva", "data_venda": data_venda, "status": status,
+            "data_pagamento": data_venda + timedelta(days=rng.randint(0, 20)) if status == "Pago" else None,
+            "valor_total": round(sum(p["preco_venda"] for p in itens), 2),
+            "forma_pagamento": rng.choice(FORMAS_PAGAMENTO),
+        })
+    for _ in range(ajustes):
+        produto = rng.choice(linhas_produtos)
+        data_ajuste = agora - timedelta(days=rng.randint(0, 365), minutes=rng.randint(0, 600))
+        linhas_transacoes.append({
+            "produto_id": produto["id"], "tipo_transacao": "ajuste", "quantidade": rng.choice([-2, -1, 1, 2]),
+            "data_transacao": data_ajuste, "created_at": data_ajuste, "custo_unitario_transacao": produto["custo"],
+            "observacoes": "Ajuste de inventário",
+        })
+    bulk(Venda, linhas_vendas)
+    bulk(ItemVenda, linhas_itens)
+    bulk(TransacaoEstoque, linhas_transacoes)
+    _reset_sequences()
+    db.session.commit()
+    return {"produtos": produtos, "vendas": vendas, "itens_venda": len(linhas_itens),
+            "transacoes": len(linhas_transacoes), "ajustes": ajustes, "clientes": clientes, "fornecedores": fornecedores}
@@ -0,0 +1,34 @@
+# gunicorn.conf.py
+# Loaded automatically by gunicorn from the working directory.
+import os
+import shutil
+
+from src.concurrency import patch_for_serving_mode
+
+# SERVING_MODE=gevent: patch before the app (and psycopg2) is imported, in the master when
+# preloading and again harmlessly in each worker. See src/concurrency.py.
+serving_mode = patch_for_serving_mode()
+if serving_mode == "gevent":
+    worker_class = "gevent"
+    # Concurrent requests per worker; size the DB pool to match
+    worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "100"))
+
+
+def on_starting(server):
+    # Start each deploy with an empty multiprocess metrics directory
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Drop the live gauges of workers that exit
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+# create_app does no database I/O, so the app can be imported once in the master and forked;
+# workers then start without re-importing. Disable with GUNICORN_PRELOAD=false.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
@@ -0,0 +1,44 @@
+"""Rebuild produtos.search_vector with separators normalized to spaces
+
+Revision ID: 0d1e2f3a4b5c
+Revises: 9c0d1e2f3a4b
+Create Date: 2026-10-20 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0d1e2f3a4b5c'
+down_revision = '9c0d1e2f3a4b'
+branch_labels = None
+depends_on = None
+
+
+def _backfill(coluna):
+    op.execute(f"""
+        UPDATE produtos p SET search_vector =
+            setweight(to_tsvector('simple', {coluna('p.nome')}), 'A') ||
+            setweight(to_tsvector('simple', {coluna('p.sku')}), 'A') ||
+            setweight(to_tsvector('simple', {coluna('p.cor_estampa')}), 'B') ||
+            setweight(to_tsvector('simple', {coluna('p.tamanho')}), 'B') ||
+            setweight(to_tsvector('simple', {coluna('f.nome')}), 'C')
+        FROM fornecedores f
+        WHERE f.id = p.fornecedor_id
+    """)
+
+
+def upgrade():
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql' or 'produtos' not in sa.inspect(conn).get_table_names():
+        return
+    # Must match utils.product_search._search_vector_expression
+    _backfill(lambda c: f"regexp_replace(coalesce({c}, ''), '[^[:alnum:]]+', ' ', 'g')")
+
+
+def downgrade():
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql' or 'produtos' not in sa.inspect(conn).get_table_names():
+        return
+    _backfill(lambda c: f"coalesce({c}, '')")
@@ -0,0 +1,42 @@
+"""Add troca_id to transacoes_estoque
+
+Revision ID: 2b3c4d5e6f7a
+Revises: 1a2b3c4d5e6f
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b3c4d5e6f7a'
+down_revision = '1a2b3c4d5e6f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    # Table is created by db.create_all() on fresh installs
+    if 'transacoes_estoque' not in inspector.get_table_names():
+        return
+
+    column_names = [col['name'] for col in inspector.get_columns('transacoes_estoque')]
+    if 'troca_id' not in column_names:
+        op.add_column('transacoes_estoque', sa.Column('troca_id', sa.Integer(), nullable=True))
+        op.create_foreign_key(
+            'fk_transacoes_estoque_troca_id', 'transacoes_estoque', 'trocas', ['troca_id'], ['id']
+        )
+
+    index_names = [idx['name'] for idx in inspector.get_indexes('transacoes_estoque')]
+    if 'ix_transacoes_estoque_troca_id' not in index_names:
+        op.create_index('ix_transacoes_estoque_troca_id', 'transacoes_estoque', ['troca_id'])
+
+
+def downgrade():
+    op.drop_index('ix_transacoes_estoque_troca_id', table_name='transacoes_estoque')
+    op.drop_constraint('fk_transacoes_estoque_troca_id', 'transacoes_estoque', type_='foreignkey')
+    op.drop_column('transacoes_estoque', 'troca_id')
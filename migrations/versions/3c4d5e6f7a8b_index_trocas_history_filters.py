@@ -0,0 +1,35 @@
+"""Index trocas history filters
+
+Revision ID: 3c4d5e6f7a8b
+Revises: 2b3c4d5e6f7a
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c4d5e6f7a8b'
+down_revision = '2b3c4d5e6f7a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'trocas' not in inspector.get_table_names():
+        return
+
+    index_names = [idx['name'] for idx in inspector.get_indexes('trocas')]
+    if 'ix_trocas_data_troca' not in index_names:
+        op.create_index('ix_trocas_data_troca', 'trocas', ['data_troca'])
+    if 'ix_trocas_venda_original_id' not in index_names:
+        op.create_index('ix_trocas_venda_original_id', 'trocas', ['venda_original_id'])
+
+
+def downgrade():
+    op.drop_index('ix_trocas_venda_original_id', table_name='trocas')
+    op.drop_index('ix_trocas_data_troca', table_name='trocas')
@@ -0,0 +1,36 @@
+"""Partial index on pending vendas
+
+Revision ID: 4d5e6f7a8b9c
+Revises: 3c4d5e6f7a8b
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d5e6f7a8b9c'
+down_revision = '3c4d5e6f7a8b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'vendas' not in inspector.get_table_names():
+        return
+
+    index_names = [idx['name'] for idx in inspector.get_indexes('vendas')]
+    if 'ix_vendas_pendentes_data_venda' not in index_names:
+        predicado = sa.text("status = 'Pagamento Pendente'")
+        op.create_index(
+            'ix_vendas_pendentes_data_venda', 'vendas', ['data_venda', 'id'],
+            postgresql_where=predicado, sqlite_where=predicado
+        )
+
+
+def downgrade():
+    op.drop_index('ix_vendas_pendentes_data_venda', table_name='vendas')
@@ -0,0 +1,40 @@
+"""Trigram indexes for clientes search
+
+Revision ID: 5e6f7a8b9c0d
+Revises: 4d5e6f7a8b9c
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e6f7a8b9c0d'
+down_revision = '4d5e6f7a8b9c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    # pg_trgm is PostgreSQL-only; other backends fall back to LIKE scans in the search route
+    if conn.dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Expressions must match the ones used by search_clientes for the planner to pick the indexes
+    op.execute('CREATE INDEX IF NOT EXISTS ix_clientes_nome_trgm ON clientes USING gin (lower(nome) gin_trgm_ops)')
+    op.execute("CREATE INDEX IF NOT EXISTS ix_clientes_email_trgm ON clientes USING gin (lower(coalesce(email, '')) gin_trgm_ops)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_clientes_telefone_trgm ON clientes USING gin (coalesce(telefone, '') gin_trgm_ops)")
+
+
+def downgrade():
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+
+    op.execute('DROP INDEX IF EXISTS ix_clientes_telefone_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_clientes_email_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_clientes_nome_trgm')
@@ -0,0 +1,52 @@
+"""Full-text search vector on produtos
+
+Revision ID: 6f7a8b9c0d1e
+Revises: 5e6f7a8b9c0d
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '6f7a8b9c0d1e'
+down_revision = '5e6f7a8b9c0d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'produtos' not in inspector.get_table_names():
+        return
+
+    is_postgresql = conn.dialect.name == 'postgresql'
+    column_names = [col['name'] for col in inspector.get_columns('produtos')]
+    if 'search_vector' not in column_names:
+        column_type = postgresql.TSVECTOR() if is_postgresql else sa.Text()
+        op.add_column('produtos', sa.Column('search_vector', column_type, nullable=True))
+
+    if not is_postgresql:
+        return
+
+    # Backfill with this revision's expression; 0d1e2f3a4b5c rebuilds it with separators normalized
+    op.execute("""
+        UPDATE produtos p SET search_vector =
+            setweight(to_tsvector('simple', coalesce(p.nome, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(p.sku, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(p.cor_estampa, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(p.tamanho, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(f.nome, '')), 'C')
+        FROM fornecedores f
+        WHERE f.id = p.fornecedor_id
+    """)
+    op.execute('CREATE INDEX IF NOT EXISTS ix_produtos_search_vector ON produtos USING gin (search_vector)')
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_produtos_search_vector')
+    op.drop_column('produtos', 'search_vector')
@@ -0,0 +1,37 @@
+"""Dashboard snapshots table
+
+Revision ID: 7a8b9c0d1e2f
+Revises: 6f7a8b9c0d1e
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a8b9c0d1e2f'
+down_revision = '6f7a8b9c0d1e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'dashboard_snapshots' in inspector.get_table_names():
+        return
+
+    op.create_table(
+        'dashboard_snapshots',
+        sa.Column('chave', sa.String(length=50), nullable=False),
+        sa.Column('dados', sa.JSON(), nullable=False),
+        sa.Column('gerado_em', sa.DateTime(), nullable=False),
+        sa.Column('desatualizado', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.PrimaryKeyConstraint('chave')
+    )
+
+
+def downgrade():
+    op.drop_table('dashboard_snapshots')
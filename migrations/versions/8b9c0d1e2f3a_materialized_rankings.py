@@ -0,0 +1,63 @@
+"""Materialized top-seller and basket pair tables
+
+Revision ID: 8b9c0d1e2f3a
+Revises: 7a8b9c0d1e2f
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b9c0d1e2f3a'
+down_revision = '7a8b9c0d1e2f'
+branch_labels = None
+depends_on = None
+
+
+def _familia(sufixo=''):
+    return [
+        sa.Column(f'nome{sufixo}', sa.String(length=150), nullable=False),
+        sa.Column(f'tamanho{sufixo}', sa.String(length=50), nullable=False),
+        sa.Column(f'sexo{sufixo}', sa.String(length=10), nullable=False),
+        sa.Column(f'cor_estampa{sufixo}', sa.String(length=50), nullable=False),
+    ]
+
+
+def upgrade():
+    conn = op.get_bind()
+    tabelas = sa.inspect(conn).get_table_names()
+
+    # Primary keys lead with dia, so period queries are range scans
+    if 'vendas_familia_diarias' not in tabelas:
+        op.create_table(
+            'vendas_familia_diarias',
+            sa.Column('dia', sa.Date(), nullable=False),
+            *_familia(),
+            sa.Column('unidades', sa.Integer(), nullable=False),
+            sa.Column('receita', sa.Float(), nullable=False),
+            sa.Column('custo', sa.Float(), nullable=False),
+            sa.Column('vendas', sa.Integer(), nullable=False),
+            sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('dia', 'nome', 'tamanho', 'sexo', 'cor_estampa')
+        )
+
+    if 'pares_familia_diarios' not in tabelas:
+        op.create_table(
+            'pares_familia_diarios',
+            sa.Column('dia', sa.Date(), nullable=False),
+            *_familia('_a'),
+            *_familia('_b'),
+            sa.Column('vendas', sa.Integer(), nullable=False),
+            sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint(
+                'dia', 'nome_a', 'tamanho_a', 'sexo_a', 'cor_estampa_a',
+                'nome_b', 'tamanho_b', 'sexo_b', 'cor_estampa_b'
+            )
+        )
+
+
+def downgrade():
+    op.drop_table('pares_familia_diarios')
+    op.drop_table('vendas_familia_diarias')
@@ -0,0 +1,39 @@
+"""Dashboard invalidation log replaces the snapshot's desatualizado flag
+
+Revision ID: 9c0d1e2f3a4b
+Revises: 8b9c0d1e2f3a
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c0d1e2f3a4b'
+down_revision = '8b9c0d1e2f3a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'dashboard_invalidacoes' not in inspector.get_table_names():
+        op.create_table(
+            'dashboard_invalidacoes',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('criado_em', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'desatualizado' in [c['name'] for c in inspector.get_columns('dashboard_snapshots')]:
+        with op.batch_alter_table('dashboard_snapshots') as batch_op:
+            batch_op.drop_column('desatualizado')
+
+
+def downgrade():
+    with op.batch_alter_table('dashboard_snapshots') as batch_op:
+        batch_op.add_column(sa.Column('desatualizado', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.drop_table('dashboard_invalidacoes')
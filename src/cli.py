@@ -0,0 +1,88 @@
+# === cli.py ===
+import os
+
+import click
+
+from src.models import db
+from src.models.user import User
+
+
+def bootstrap_database(app):
+    """Creates missing tables and seeds the initial admin user if there are no users yet."""
+    with app.app_context():
+        # Ensure tables exist
+        db.create_all()
+
+        # Auto-seed initial admin user if none exists
+        try:
+            user_count = User.query.count()
+        except Exception as e:
+            app.logger.error(f"Error counting users: {e}")
+            user_count = 0
+
+        if user_count == 0:
+            admin_email = os.getenv("ADMIN_EMAIL", "").strip()
+            admin_pass  = os.getenv("ADMIN_PASS", "").strip()
+            if admin_email and admin_pass:
+                admin = User(email=admin_email, name="Administrator")
+                admin.set_password(admin_pass)
+                admin.role = "admin"
+                db.session.add(admin)
+                db.session.commit()
+                app.logger.info(f"Auto-created admin user: {admin_email}")
+            else:
+                app.logger.warning(
+                    "No ADMIN_EMAIL/ADMIN_PASS set or empty; skipping auto-seed of admin user."
+                )
+
+
+def register_cli(app):
+    """Registers the project's flask CLI commands."""
+
+    @app.cli.command("bootstrap")
+    def bootstrap_command():
+        """Create missing tables and seed the admin user (ADMIN_EMAIL/ADMIN_PASS)."""
+        bootstrap_database(app)
+        click.echo("Bootstrap concluído.")
+
+    @app.cli.command("dashboard-atualizar")
+    def dashboard_atualizar_command():
+        """Recompute the dashboard snapshot (src/dashboard.py); meant for cron."""
+        from src.dashboard import refresh_snapshot
+
+        with app.app_context():
+            snapshot = refresh_snapshot(app)
+            click.echo(f"Dashboard atualizado em {snapshot.gerado_em:%Y-%m-%d %H:%M:%S}")
+
+    @app.cli.command("rankings-atualizar")
+    @click.option("--desde", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+                  help="Rebuild from this day (default: the last RANKINGS_REFRESH_DAYS days)")
+    @click.option("--completo", is_flag=True, help="Rebuild the whole history")
+    def rankings_atualizar_command(desde, completo):
+        """Rebuild the top-seller and basket pair aggregates (src/rankings.py); meant for nightly cron."""
+        from src.rankings import refresh_rankings, refresh_start
+
+        with app.app_context():
+            inicio = desde.date() if desde else refresh_start(app, completo)
+            familias, pares = refresh_rankings(inicio)
+        click.echo(f"Rankings atualizados desde {inicio or 'o início'}: {familias} linhas de famílias, {pares} de pares")
+
+    @app.cli.command("exportar")
+    @click.argument("nome")
+    @click.argument("saida", type=click.Path(dir_okay=False, writable=True))
+    @click.option("--formato", type=click.Choice(["csv", "xlsx"]), default="csv")
+    @click.option("--filtro", "filtros", multiple=True, metavar="CHAVE=VALOR",
+                  help="Same filters as the list endpoint, e.g. --filtro start_date=2025-01-01")
+    def exportar_command(nome, saida, formato, filtros):
+        """Write export NOME (see src/exports.py) to SAIDA, e.g. from cron for very large ranges."""
+        from werkzeug.datastructures import MultiDict
+        from src.exports import ExportError, validate_export, write_export
+
+        args = MultiDict([f.split("=", 1) for f in filtros if "=" in f])
+        try:
+            validate_export(nome, formato)
+            with app.app_context():
+                write_export(nome, formato, args, saida)
+        except ExportError as e:
+            raise click.ClickException(str(e))
+        click.echo(f"Exportação gravada em {saida}")
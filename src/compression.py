@@ -0,0 +1,130 @@
+# === compression.py ===
+"""gzip/brotli response compression.
+
+Responses are compressed when the client accepts it, the mimetype is in COMPRESS_MIMETYPES
+and, for buffered responses, the body is at least COMPRESS_MIN_SIZE bytes (smaller bodies
+gain little and still cost CPU). Brotli is preferred when the brotli package is installed.
+
+Streamed responses (exports, ?stream=1) are compressed chunk by chunk with a sync flush after
+each chunk, so clients keep receiving rows as they are produced.
+
+File responses (send_file) and responses that already carry a Content-Encoding are left
+alone. Strong ETags are turned into weak ones, since the compressed bytes differ from the
+representation the ETag was computed on; conditional requests still match.
+"""
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/plain",
+    "text/html",
+    "text/css",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+
+class _Encoder:
+    def __init__(self, encoding, level):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            # wbits 16+: gzip container
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data, flush=False):
+        if self.encoding == "br":
+            out = self._compressor.process(data)
+            return out + self._compressor.flush() if flush else out
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self):
+        return self._compressor.finish() if self.encoding == "br" else self._compressor.flush()
+
+
+def choose_encoding(accept_encodings):
+    """'br', 'gzip' or None, from the request's Accept-Encoding."""
+    if brotli is not None and accept_encodings["br"]:
+        return "br"
+    if accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+
+def _compress_stream(chunks, encoder):
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if chunk:
+                yield encoder.compress(chunk, flush=True)
+        yield encoder.finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def _level(app, encoding):
+    if encoding == "br":
+        return app.config.get("COMPRESS_BR_LEVEL", 4)
+    return app.config.get("COMPRESS_LEVEL", 6)
+
+
+def compress_response(app, response):
+    """Compresses response in place when it qualifies; returns it."""
+    if (
+        request.method == "HEAD"
+        or not 200 <= response.status_code < 300
+        or response.status_code in (204, 206)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in app.config.get("COMPRESS_MIMETYPES", DEFAULT_MIMETYPES)
+    ):
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    response.vary.add("Accept-Encoding")
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        encoder = _Encoder(encoding, _level(app, encoding))
+        response.response = _compress_stream(response.response, encoder)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < app.config.get("COMPRESS_MIN_SIZE", 1024):
+            return response
+        encoder = _Encoder(encoding, _level(app, encoding))
+        response.set_data(encoder.compress(data) + encoder.finish())
+
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Registers the compression hook. Controlled by COMPRESSION_ENABLED.
+
+    Call before the other after_request hooks are registered so it runs last.
+    """
+    if not app.config.get("COMPRESSION_ENABLED", True):
+        return
+
+    @app.after_request
+    def compress(response):
+        return compress_response(app, response)
@@ -0,0 +1,55 @@
+# === concurrency.py ===
+"""Serving modes.
+
+SERVING_MODE=sync (default) runs plain gunicorn sync workers: one request per worker.
+
+SERVING_MODE=gevent runs gevent workers: each worker serves up to GUNICORN_WORKER_CONNECTIONS
+requests at once, switching greenlets while one waits on PostgreSQL or the network, so a slow
+report or import no longer pins the whole worker. This needs two patches, applied by
+patch_for_serving_mode() before anything imports socket/ssl/psycopg2 users:
+
+- gevent.monkey.patch_all() makes sockets, locks and sleeps cooperative;
+- psycogreen makes psycopg2 (a C driver gevent cannot patch) wait on the socket cooperatively.
+
+Both are optional dependencies: pip install -r requirements-gevent.txt.
+
+Greenlets of one worker share its SQLAlchemy pool, so raise DB_POOL_SIZE/DB_MAX_OVERFLOW (or use
+PgBouncer with DB_PGBOUNCER=true) in line with the worker connections that hit the database.
+CPU-bound work (large imports, Excel parsing) still blocks the other greenlets of its worker.
+
+This module is imported by wsgi.py and gunicorn.conf.py before the app, so it must stay
+dependency-free at import time.
+"""
+import os
+
+SERVING_MODES = ("sync", "gevent")
+
+_patched_mode = None
+
+
+def serving_mode():
+    mode = os.environ.get("SERVING_MODE", "sync").strip().lower()
+    if mode not in SERVING_MODES:
+        raise RuntimeError(f"SERVING_MODE must be one of {', '.join(SERVING_MODES)}, got {mode!r}")
+    return mode
+
+
+def patch_for_serving_mode():
+    """Applies the monkey patches the configured mode needs. Safe to call more than once."""
+    global _patched_mode
+    mode = serving_mode()
+    if mode == "sync" or _patched_mode == mode:
+        return mode
+
+    try:
+        from gevent import monkey
+        from psycogreen.gevent import patch_psycopg
+    except ImportError as e:
+        raise RuntimeError(
+            "SERVING_MODE=gevent requires the gevent and psycogreen packages (requirements-gevent.txt)"
+        ) from e
+
+    monkey.patch_all()
+    patch_psycopg()
+    _patched_mode = mode
+    return mode
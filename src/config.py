@@ -1,25 +1,141 @@
 import os
 from datetime import timedelta
 
+def _parse_timeouts(value):
+    """Parses "report_bp=60000,alerta_bp=30000" into {"report_bp": 60000, "alerta_bp": 30000}."""
+    timeouts = {}
+    for item in value.split(','):
+        if '=' in item:
+            blueprint, ms = item.split('=', 1)
+            timeouts[blueprint.strip()] = int(ms)
+    return timeouts
+
+def _engine_options(database_url):
+    """SQLALCHEMY_ENGINE_OPTIONS from DB_* env vars. SQLite keeps Flask-SQLAlchemy's pool defaults."""
+    if database_url.startswith('sqlite'):
+        return {}
+
+    options = {
+        # Test connections on checkout so the first request after idle periods doesn't hit a dead one
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',
+        # Recycle before server/proxy idle timeouts drop the connection
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', '1800')),
+        'connect_args': {'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', '5'))},
+    }
+    if os.environ.get('DB_PGBOUNCER', 'false').lower() == 'true':
+        # PgBouncer pools the server connections; a local pool would only hold idle clients
+        from sqlalchemy.pool import NullPool
+        options['poolclass'] = NullPool
+    else:
+        options.update({
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', '5')),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', '10')),
+            'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        })
+    return options
+
+REQUIRED_ENV_VARS = ('DATABASE_URL', 'SECRET_KEY', 'JWT_SECRET')
+
+def check_required_env():
+    """Raises if a required environment variable is missing; called by create_app, not at import."""
+    for name in REQUIRED_ENV_VARS:
+        if name not in os.environ:
+            raise RuntimeError(f"{name} environment variable is not set")
+
 class Config:
-    # Required environment variables
-    if 'DATABASE_URL' not in os.environ:
-        raise RuntimeError("DATABASE_URL environment variable is not set")
-    if 'SECRET_KEY' not in os.environ:
-        raise RuntimeError("SECRET_KEY environment variable is not set")
-    if 'JWT_SECRET' not in os.environ:
-        raise RuntimeError("JWT_SECRET environment variable is not set")
-
-    SQLALCHEMY_DATABASE_URI = os.environ['DATABASE_URL']
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI or '')
+
+    # Optional read replica, used for GET requests on READ_REPLICA_ROUTES (blueprints or endpoints)
+    if os.environ.get('DATABASE_REPLICA_URL'):
+        SQLALCHEMY_BINDS = {
+            'replica': {
+                'url': os.environ['DATABASE_REPLICA_URL'],
+                **_engine_options(os.environ['DATABASE_REPLICA_URL'])
+            }
+        }
+    READ_REPLICA_ROUTES = [
+        route.strip() for route in os.environ.get(
+            'READ_REPLICA_ROUTES', 'report_bp,alerta_bp,transacao_bp.get_all_transacoes'
+        ).split(',') if route.strip()
+    ]
+    # Fall back to the primary when the replica is further behind than this
+    REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', '30'))
+    # How often each worker re-checks replica health and lag
+    REPLICA_CHECK_SECONDS = float(os.environ.get('REPLICA_CHECK_SECONDS', '5'))
+
+    # Per-transaction statement_timeout (PostgreSQL). Applied with SET LOCAL, which also works
+    # behind PgBouncer in transaction pooling mode. 0 disables.
+    STATEMENT_TIMEOUT_MS = int(os.environ.get('STATEMENT_TIMEOUT_MS', '5000'))
+    # Per-blueprint overrides: reports and full-table exports get more time than POS routes
+    STATEMENT_TIMEOUTS_BY_BLUEPRINT = _parse_timeouts(
+        os.environ.get('STATEMENT_TIMEOUTS_BY_BLUEPRINT', 'report_bp=60000,export_bp=60000')
+    )
 
     # Flask session signing
-    SECRET_KEY = os.environ['SECRET_KEY']
+    SECRET_KEY = os.environ.get('SECRET_KEY')
 
     # JWT configuration
-    JWT_SECRET_KEY = os.environ['JWT_SECRET']
+    JWT_SECRET_KEY = os.environ.get('JWT_SECRET')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(seconds=int(os.environ.get('JWT_ACCESS_TOKEN_EXPIRES', '900')))
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(seconds=int(os.environ.get('JWT_REFRESH_TOKEN_EXPIRES', '604800')))
 
+    # Request timing / SQL profiling (see src/instrumentation.py)
+    INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'true').lower() == 'true'
+    SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+    # Log statements slower than this many milliseconds (0 disables)
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '200'))
+    # Warn when one statement runs more than this many times in a request (0 disables)
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', '20'))
+
+    # Prometheus /metrics (see src/metrics.py). Scrapers send "Authorization: Bearer <token>";
+    # without a token the endpoint answers 403 (outside TESTING) unless METRICS_ALLOW_UNAUTHENTICATED
+    # is set, e.g. when only an internal network can reach it
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_AUTH_TOKEN = os.environ.get('METRICS_AUTH_TOKEN', '')
+    METRICS_ALLOW_UNAUTHENTICATED = os.environ.get('METRICS_ALLOW_UNAUTHENTICATED', 'false').lower() == 'true'
+
+    # Readiness probe (/health/ready)
+    READINESS_CACHE_SECONDS = float(os.environ.get('READINESS_CACHE_SECONDS', '2'))
+    READINESS_DB_TIMEOUT_MS = int(os.environ.get('READINESS_DB_TIMEOUT_MS', '1000'))
+    # Report not-ready while the DB revision differs from the migration head
+    READINESS_REQUIRE_MIGRATIONS = os.environ.get('READINESS_REQUIRE_MIGRATIONS', 'false').lower() == 'true'
+
+    # Seconds catalog facet counts are cached (server-side and via Cache-Control)
+    FACETS_CACHE_SECONDS = int(os.environ.get('FACETS_CACHE_SECONDS', '60'))
+
+    # gzip/brotli response compression (see src/compression.py); disable if a proxy compresses
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    # Buffered bodies smaller than this are sent uncompressed
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '1024'))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', '6'))
+    COMPRESS_BR_LEVEL = int(os.environ.get('COMPRESS_BR_LEVEL', '4'))
+
+    # CSV/XLSX exports (see src/exports.py): where background jobs write their files, how many
+    # run at once per worker and how long finished files are kept
+    EXPORT_DIR = os.environ.get('EXPORT_DIR', '')
+    EXPORT_JOB_WORKERS = int(os.environ.get('EXPORT_JOB_WORKERS', '2'))
+    EXPORT_JOB_TTL_HOURS = int(os.environ.get('EXPORT_JOB_TTL_HOURS', '24'))
+
+    # Home dashboard snapshot (see src/dashboard.py): recomputed when older than the max age,
+    # or when writes invalidated it and it is at least the min refresh age
+    DASHBOARD_SNAPSHOT_ENABLED = os.environ.get('DASHBOARD_SNAPSHOT_ENABLED', 'true').lower() == 'true'
+    DASHBOARD_MAX_AGE_SECONDS = int(os.environ.get('DASHBOARD_MAX_AGE_SECONDS', '300'))
+    DASHBOARD_MIN_REFRESH_SECONDS = int(os.environ.get('DASHBOARD_MIN_REFRESH_SECONDS', '5'))
+    DASHBOARD_TOP_N = int(os.environ.get('DASHBOARD_TOP_N', '5'))
+
+    # Days `flask rankings-atualizar` rebuilds on each (nightly) run (see src/rankings.py)
+    RANKINGS_REFRESH_DAYS = int(os.environ.get('RANKINGS_REFRESH_DAYS', '7'))
+
+    # jsonify backend: auto (orjson when installed), orjson or stdlib (see src/json_provider.py)
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'auto')
+
+    # Run `flask bootstrap` (create tables, seed admin) inside create_app; off by default
+    BOOTSTRAP_ON_STARTUP = os.environ.get('BOOTSTRAP_ON_STARTUP', 'false').lower() == 'true'
+    MIGRATIONS_DIRECTORY = os.environ.get(
+        'MIGRATIONS_DIRECTORY', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+    )
+
     DEBUG = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
     TESTING = os.environ.get('FLASK_TESTING', 'false').lower() == 'true'
@@ -0,0 +1,237 @@
+# === dashboard.py ===
+"""Precomputed home dashboard.
+
+The dashboard (today's sales, month-to-date revenue and margin, pending receivables, low-stock
+family count, top sellers) is computed by a handful of aggregate queries and stored as one
+DashboardSnapshot row, so GET /api/dashboard/ is a primary-key read.
+
+The snapshot is recomputed when it is read and:
+
+- a commit touched sales, sale items or products since it was generated: a session hook
+  inserts a DashboardInvalidacao row (in the same transaction as the write) and the next
+  read recomputes, at most once every DASHBOARD_MIN_REFRESH_SECONDS so bursts of sales
+  share one recompute;
+- it is older than DASHBOARD_MAX_AGE_SECONDS, which also covers the day/month rollover.
+
+Writers only insert, so concurrent sales never wait on a shared row lock. A read checks for
+invalidation rows in the same statement as the snapshot's primary-key read. A recompute
+deletes the rows it has seen before running its queries, so a write committing meanwhile
+leaves its row behind and the following read recomputes again.
+
+`flask dashboard-atualizar` recomputes it unconditionally; run it from cron (e.g. every few
+minutes) so readers rarely pay for a recompute themselves.
+"""
+import threading
+from datetime import datetime, time, timedelta
+from itertools import chain
+
+from flask import current_app, g, has_app_context
+from sqlalchemy import and_, case, delete, event, exists, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.models import db, DashboardInvalidacao, DashboardSnapshot, ItemVenda, Produto, Venda
+from src.models.product import FAMILIA_COLUMNS
+from src.models.sale import STATUS_CANCELADO, STATUS_PAGAMENTO_PENDENTE
+
+CHAVE_DASHBOARD = "dashboard"
+# Writes to these invalidate the snapshot
+DASHBOARD_MODELS = (Venda, ItemVenda, Produto)
+DASHBOARD_TABLES = frozenset(model.__table__ for model in DASHBOARD_MODELS)
+MAIS_VENDIDOS_DIAS = 30
+
+_refresh_lock = threading.Lock()
+
+
+def _dinheiro(valor):
+    return round(float(valor or 0), 2)
+
+
+def compute_dashboard(agora=None, top_n=5):
+    """Builds the dashboard payload from the live tables."""
+    agora = agora or datetime.utcnow()
+    hoje = datetime.combine(agora.date(), time.min)
+    inicio_mes = hoje.replace(day=1)
+
+    # Cancelled sales returned their stock, so they count as neither revenue nor units sold
+    nao_cancelada = Venda.status != STATUS_CANCELADO
+
+    # Today's and month-to-date sales in one pass over the month
+    de_hoje = Venda.data_venda >= hoje
+    vendas_hoje, valor_hoje, vendas_mes, receita_mes = db.session.execute(
+        select(
+            func.count(case((de_hoje, Venda.id))),
+            func.sum(case((de_hoje, Venda.valor_total), else_=0)),
+            func.count(Venda.id),
+            func.sum(Venda.valor_total),
+        ).where(Venda.data_venda >= inicio_mes, nao_cancelada)
+    ).one()
+
+    unidades_mes, custo_mes = db.session.execute(
+        select(func.sum(ItemVenda.quantidade), func.sum(ItemVenda.custo_unitario * ItemVenda.quantidade))
+        .join(Venda, and_(Venda.id == ItemVenda.venda_id, nao_cancelada))
+        .where(Venda.data_venda >= inicio_mes)
+    ).one()
+
+    # Same predicate as the partial index ix_vendas_pendentes_data_venda
+    pendentes, valor_pendente = db.session.execute(
+        select(func.count(Venda.id), func.sum(Venda.valor_total)).where(Venda.status == STATUS_PAGAMENTO_PENDENTE)
+    ).one()
+
+    familias_baixas = (
+        select(*FAMILIA_COLUMNS)
+        .group_by(*FAMILIA_COLUMNS)
+        .having(func.sum(Produto.quantidade_atual) <= func.max(Produto.limite_reabastecimento))
+        .subquery()
+    )
+    familias_estoque_baixo = db.session.execute(select(func.count()).select_from(familias_baixas)).scalar()
+
+    unidades = func.sum(ItemVenda.quantidade).label("unidades")
+    mais_vendidos = db.session.execute(
+        select(*FAMILIA_COLUMNS, unidades, func.sum(ItemVenda.preco_unitario * ItemVenda.quantidade).label("receita"))
+        .join(ItemVenda, ItemVenda.produto_id == Produto.id)
+        .join(Venda, and_(Venda.id == ItemVenda.venda_id, nao_cancelada))
+        .where(Venda.data_venda >= hoje - timedelta(days=MAIS_VENDIDOS_DIAS))
+        .group_by(*FAMILIA_COLUMNS)
+        .order_by(unidades.desc(), *FAMILIA_COLUMNS)
+        .limit(top_n)
+    ).all()
+
+    receita_mes = _dinheiro(receita_mes)
+    margem_mes = _dinheiro(receita_mes - float(custo_mes or 0))
+    return {
+        "vendas_hoje": {"quantidade": int(vendas_hoje or 0), "valor_total": _dinheiro(valor_hoje)},
+        "mes_atual": {
+            "inicio": inicio_mes.date().isoformat(),
+            "quantidade_vendas": int(vendas_mes or 0),
+            "unidades": int(unidades_mes or 0),
+            "receita": receita_mes,
+            "custo": _dinheiro(custo_mes),
+            "margem": margem_mes,
+            "margem_percentual": round(margem_mes / receita_mes * 100, 2) if receita_mes else 0.0,
+        },
+        "recebiveis_pendentes": {"quantidade": int(pendentes or 0), "valor_total": _dinheiro(valor_pendente)},
+        "familias_estoque_baixo": int(familias_estoque_baixo or 0),
+        "mais_vendidos": [
+            {
+                "nome": nome,
+                "tamanho": tamanho,
+                "sexo": sexo,
+                "cor_estampa": cor_estampa,
+                "unidades": int(qtd),
+                "receita": _dinheiro(receita),
+            }
+            for nome, tamanho, sexo, cor_estampa, qtd, receita in mais_vendidos
+        ],
+        "periodo_mais_vendidos_dias": MAIS_VENDIDOS_DIAS,
+    }
+
+
+def refresh_snapshot(app):
+    """Recomputes and stores the snapshot; returns the DashboardSnapshot row."""
+    # Before computing: invalidations committed after this DELETE survive it, so their
+    # writes are never lost even if the queries below miss them
+    db.session.execute(delete(DashboardInvalidacao))
+    dados = compute_dashboard(top_n=app.config.get("DASHBOARD_TOP_N", 5))
+    snapshot = db.session.get(DashboardSnapshot, CHAVE_DASHBOARD)
+    if snapshot is None:
+        snapshot = DashboardSnapshot(chave=CHAVE_DASHBOARD)
+        db.session.add(snapshot)
+    snapshot.dados = dados
+    snapshot.gerado_em = datetime.utcnow()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another worker inserted the first snapshot meanwhile; theirs is as fresh as ours
+        db.session.rollback()
+        snapshot = db.session.get(DashboardSnapshot, CHAVE_DASHBOARD)
+    return snapshot
+
+
+def _read_snapshot():
+    """(snapshot or None, whether writes happened since it was computed), in one query."""
+    invalidado = exists().where(DashboardInvalidacao.id.isnot(None)).label("invalidado")
+    linha = db.session.execute(
+        select(DashboardSnapshot, invalidado).where(DashboardSnapshot.chave == CHAVE_DASHBOARD)
+    ).first()
+    return (linha[0], bool(linha[1])) if linha else (None, True)
+
+
+def _needs_refresh(app, snapshot, desatualizado, agora):
+    if snapshot is None:
+        return True
+    idade = (agora - snapshot.gerado_em).total_seconds()
+    if idade >= app.config.get("DASHBOARD_MAX_AGE_SECONDS", 300):
+        return True
+    return desatualizado and idade >= app.config.get("DASHBOARD_MIN_REFRESH_SECONDS", 5)
+
+
+def get_snapshot(app):
+    """(snapshot, desatualizado): the current snapshot, recomputed first if it is missing,
+    invalidated or too old, and whether writes happened since it was computed.
+
+    While another thread of this worker is recomputing, the existing snapshot is returned as is.
+    """
+    snapshot, desatualizado = _read_snapshot()
+    if not _needs_refresh(app, snapshot, desatualizado, datetime.utcnow()):
+        return snapshot, desatualizado
+
+    if not _refresh_lock.acquire(blocking=snapshot is None):
+        return snapshot, desatualizado
+    try:
+        # Re-read: the recompute we waited for may have stored a fresh snapshot
+        if snapshot is None:
+            snapshot, desatualizado = _read_snapshot()
+            if not _needs_refresh(app, snapshot, desatualizado, datetime.utcnow()):
+                return snapshot, desatualizado
+        return refresh_snapshot(app), False
+    finally:
+        _refresh_lock.release()
+
+
+# --- Invalidation --- #
+
+def _tracking_enabled():
+    return has_app_context() and current_app.config.get("DASHBOARD_SNAPSHOT_ENABLED", True)
+
+
+def _pending_changes(session):
+    return any(isinstance(obj, DASHBOARD_MODELS) for obj in chain(session.new, session.dirty, session.deleted))
+
+
+def _track_statement(conn, clauseelement, multiparams, params, execution_options, result):
+    # Sees both flushes and bulk statements (e.g. confirming payments). The flag lives in g:
+    # Flask-SQLAlchemy scopes sessions per app context, so it belongs to the request's session.
+    # (A session do_orm_execute hook would also work, but it breaks yield_per with selectinload.)
+    if getattr(clauseelement, "is_dml", False) and clauseelement.table in DASHBOARD_TABLES and has_app_context():
+        g.dashboard_invalidado = True
+
+
+def _invalidate_before_commit(session):
+    invalidado = g.pop("dashboard_invalidado", False) if has_app_context() else False
+    if not (invalidado or _pending_changes(session)) or not _tracking_enabled():
+        return
+    # Part of the committing transaction, so a rolled-back write leaves the snapshot valid.
+    # An insert rather than an UPDATE of the snapshot row: concurrent writers don't block
+    # each other (on PostgreSQL, UPDATEs of one row queue on its lock until commit).
+    session.execute(insert(DashboardInvalidacao).values(criado_em=datetime.utcnow()))
+
+
+def _clear_flag(session):
+    # Also after commit: the commit's own final flush runs after before_commit
+    if has_app_context():
+        g.pop("dashboard_invalidado", None)
+
+
+def init_dashboard(app):
+    """Registers the snapshot invalidation hooks. Controlled by DASHBOARD_SNAPSHOT_ENABLED."""
+    listeners = (
+        (Engine, "after_execute", _track_statement),
+        (Session, "before_commit", _invalidate_before_commit),
+        (Session, "after_commit", _clear_flag),
+        (Session, "after_rollback", _clear_flag),
+    )
+    for target, nome, listener in listeners:
+        if not event.contains(target, nome, listener):
+            event.listen(target, nome, listener)
@@ -0,0 +1,103 @@
+# === database.py ===
+"""Per-request database session settings.
+
+Statement timeouts: each transaction opened by the ORM session during a request starts with
+SET LOCAL statement_timeout, using STATEMENT_TIMEOUT_MS or the override for the request's
+blueprint in STATEMENT_TIMEOUTS_BY_BLUEPRINT. SET LOCAL ends with the transaction, so pooled
+(and PgBouncer transaction-mode) connections never carry the setting into another request.
+
+Read replica: when DATABASE_REPLICA_URL is set, GET requests to READ_REPLICA_ROUTES read from
+the "replica" bind, as long as it answers and lags less than REPLICA_MAX_LAG_SECONDS.
+Everything else, and any flush, uses the primary.
+"""
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from src.utils.cache import TTLCache
+
+REPLICA_BIND = "replica"
+
+_replica_status_cache = TTLCache(ttl=5, maxsize=4)
+
+
+class RoutingSession(FlaskSession):
+    """Session that sends reads to the replica bind when the current request allows it."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_request_context() and g.get("use_replica"):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def statement_timeout_for(app, blueprint):
+    """Statement timeout in ms for requests handled by blueprint (0 = no timeout)."""
+    overrides = app.config.get("STATEMENT_TIMEOUTS_BY_BLUEPRINT") or {}
+    return overrides.get(blueprint, app.config.get("STATEMENT_TIMEOUT_MS", 0))
+
+
+def _apply_statement_timeout(session, transaction, connection):
+    if not has_request_context() or connection.dialect.name != "postgresql":
+        return
+    timeout_ms = g.get("statement_timeout_ms")
+    if timeout_ms:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+def _replica_lag_seconds(engine):
+    with engine.connect() as conn:
+        if engine.dialect.name != "postgresql":
+            conn.execute(text("SELECT 1"))
+            return 0.0
+        conn.execute(text("SET LOCAL statement_timeout = 1000"))
+        lag = conn.execute(text(
+            "SELECT CASE WHEN NOT pg_is_in_recovery() "
+            "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+        )).scalar()
+        return float(lag or 0)
+
+
+def replica_available(app, db):
+    """Whether the replica answers and is within REPLICA_MAX_LAG_SECONDS; checked every few seconds."""
+    engine = db.engines.get(REPLICA_BIND)
+    if engine is None:
+        return False
+
+    available = _replica_status_cache.get(engine.url)
+    if available is None:
+        try:
+            lag = _replica_lag_seconds(engine)
+            available = lag <= app.config.get("REPLICA_MAX_LAG_SECONDS", 30)
+            if not available:
+                app.logger.warning(f"Read replica lagging {lag:.1f}s; using primary")
+        except Exception as e:
+            app.logger.warning(f"Read replica unavailable; using primary: {e}")
+            available = False
+        _replica_status_cache.set(engine.url, available, ttl=app.config.get("REPLICA_CHECK_SECONDS", 5))
+    return available
+
+
+def uses_replica(app):
+    """Whether the current request is a read on a route designated for the replica."""
+    if request.method not in ("GET", "HEAD"):
+        return False
+    routes = app.config.get("READ_REPLICA_ROUTES") or ()
+    return request.blueprint in routes or request.endpoint in routes
+
+
+def init_database(app, db):
+    """Registers the statement timeout and replica routing hooks on app."""
+    if not event.contains(Session, "after_begin", _apply_statement_timeout):
+        event.listen(Session, "after_begin", _apply_statement_timeout)
+
+    @app.before_request
+    def set_statement_timeout():
+        g.statement_timeout_ms = statement_timeout_for(app, request.blueprint)
+
+    @app.before_request
+    def route_reads_to_replica():
+        g.use_replica = uses_replica(app) and replica_available(app, db)
@@ -0,0 +1,375 @@
+# === exports.py ===
+"""CSV/XLSX exports of the catalog, sales, stock ledger and reports.
+
+Each dataset takes the same query args as its list/report endpoint (the filter helpers are
+shared) and yields rows from yield_per batches:
+
+- CSV is streamed to the client as the rows are read;
+- XLSX is written with xlsxwriter in constant_memory mode (each row is flushed to a temp file
+  as soon as it is written) and sent once the workbook is closed.
+
+Very large ranges can run as background jobs instead: the job runs in a thread of the worker
+that received it and writes its output and a small JSON status file to EXPORT_DIR, so any
+worker on the same host can report on it and serve the download. The file records the pid of
+that worker: a pending or running job whose worker has exited (restart, crash) is reported
+as failed instead of staying pending forever.
+"""
+import csv
+import io
+import json
+import os
+import re
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy.orm import joinedload
+from werkzeug.datastructures import MultiDict
+
+from src.models import db, Fornecedor, Produto, Venda, ItemVenda, TransacaoEstoque
+from src.routes.report_routes import (
+    customer_summary_query, low_stock_query, parse_data_referencia, parse_sales_period,
+    receivables_detail_query, sales_summary_query, stock_levels_query
+)
+from src.routes.sale_routes import filter_vendas
+from src.routes.transaction_routes import filter_transacoes
+from src.utils.product_search import parse_catalog_filters
+
+try:
+    import xlsxwriter
+except ImportError:  # optional dependency
+    xlsxwriter = None
+
+EXPORT_BATCH_SIZE = 1000
+CSV_FLUSH_ROWS = 500
+# Excel's row limit, minus the header row; longer exports continue on a new sheet
+XLSX_MAX_ROWS = 1048575
+FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Spreadsheet apps run cells starting with these as formulas; CSV values get a leading quote
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+_job_executor = None
+
+PRODUTO_COLUMNS = [
+    "id", "sku", "nome", "sexo", "tamanho", "cor_estampa", "fornecedor_id", "nome_fornecedor", "custo",
+    "preco_venda", "quantidade_atual", "limite_reabastecimento", "data_compra", "created_at", "updated_at",
+]
+
+
+class ExportError(ValueError):
+    """Invalid export request (unknown dataset/format, bad filter)."""
+
+
+def _produto_row(p):
+    return (
+        p.id, p.sku, p.nome, p.sexo, p.tamanho, p.cor_estampa, p.fornecedor_id,
+        p.fornecedor.nome if p.fornecedor else None, p.custo, p.preco_venda, p.quantidade_atual,
+        p.limite_reabastecimento, p.data_compra, p.created_at, p.updated_at,
+    )
+
+
+def _produtos(args):
+    """Catalog, with the /api/produtos/search filters (q, tamanho, cor_estampa, sexo, fornecedor, em_estoque)."""
+    filtros = parse_catalog_filters(args)
+    if args.get("em_estoque", "false").lower() == "true":
+        filtros.append(Produto.quantidade_atual > 0)
+    query = (
+        Produto.query
+        .outerjoin(Fornecedor, Produto.fornecedor_id == Fornecedor.id)
+        .options(joinedload(Produto.fornecedor))
+        .filter(*filtros)
+        .order_by(Produto.nome, Produto.id)
+    )
+    return PRODUTO_COLUMNS, (_produto_row(p) for p in query.yield_per(EXPORT_BATCH_SIZE))
+
+
+def _vendas(args):
+    """One row per sold item, with the sale's columns repeated; /api/vendas/ filters."""
+    query = filter_vendas(
+        db.session.query(
+            Venda.id, Venda.data_venda, Venda.cliente_id, Venda.cliente_nome, Venda.cliente_sobrenome,
+            Venda.status, Venda.forma_pagamento, Venda.data_pagamento, Venda.valor_total,
+            Venda.desconto_percentual, Venda.desconto_valor,
+            ItemVenda.produto_id, Produto.sku, Produto.nome, Produto.tamanho, Produto.cor_estampa,
+            ItemVenda.quantidade, ItemVenda.preco_unitario, ItemVenda.custo_unitario,
+        )
+        .join(ItemVenda, ItemVenda.venda_id == Venda.id)
+        .outerjoin(Produto, Produto.id == ItemVenda.produto_id),
+        args
+    ).order_by(Venda.data_venda.desc(), Venda.id.desc(), ItemVenda.id)
+    colunas = [
+        "venda_id", "data_venda", "cliente_id", "cliente_nome", "cliente_sobrenome", "status",
+        "forma_pagamento", "data_pagamento", "valor_total", "desconto_percentual", "desconto_valor",
+        "produto_id", "sku", "nome_produto", "tamanho", "cor_estampa", "quantidade", "preco_unitario",
+        "custo_unitario",
+    ]
+    return colunas, (tuple(linha) for linha in query.yield_per(EXPORT_BATCH_SIZE))
+
+
+def _transacoes(args):
+    """Stock ledger; /api/transacoes/ filters (produto_id, tipo_transacao, start_date, end_date)."""
+    query = filter_transacoes(
+        db.session.query(
+            TransacaoEstoque.id, TransacaoEstoque.data_transacao, TransacaoEstoque.produto_id, Produto.sku,
+            Produto.nome, TransacaoEstoque.tipo_transacao, TransacaoEstoque.quantidade,
+            TransacaoEstoque.custo_unitario_transacao, TransacaoEstoque.venda_id, TransacaoEstoque.troca_id,
+            TransacaoEstoque.observacoes,
+        )
+        .outerjoin(Produto, Produto.id == TransacaoEstoque.produto_id),
+        args
+    ).order_by(TransacaoEstoque.data_transacao.desc(), TransacaoEstoque.id.desc())
+    colunas = [
+        "id", "data_transacao", "produto_id", "sku", "nome_produto", "tipo_transacao", "quantidade",
+        "custo_unitario_transacao", "venda_id", "troca_id", "observacoes",
+    ]
+    return colunas, (tuple(linha) for linha in query.yield_per(EXPORT_BATCH_SIZE))
+
+
+def _estoque_niveis(args):
+    return PRODUTO_COLUMNS, (_produto_row(p) for p in stock_levels_query().yield_per(EXPORT_BATCH_SIZE))
+
+
+def _estoque_baixo(args):
+    return PRODUTO_COLUMNS, (_produto_row(p) for p in low_stock_query().yield_per(EXPORT_BATCH_SIZE))
+
+
+def _vendas_sumario(args):
+    start_date, end_date = parse_sales_period(args)
+    linhas = sales_summary_query(start_date, end_date).yield_per(EXPORT_BATCH_SIZE)
+    return (
+        ["cliente", "quantidade_itens", "total_vendas"],
+        ((cliente, int(qtd), float(total or 0)) for cliente, qtd, total in linhas)
+    )
+
+
+def _clientes_sumario(args):
+    linhas = customer_summary_query().yield_per(EXPORT_BATCH_SIZE)
+    return (
+        ["nome_cliente", "numero_compras", "total_gasto"],
+        ((nome, int(num), float(total or 0)) for nome, num, total in linhas)
+    )
+
+
+def _recebiveis(args):
+    data_referencia = parse_data_referencia(args)
+    linhas = receivables_detail_query(data_referencia).yield_per(EXPORT_BATCH_SIZE)
+    return (
+        ["venda_id", "cliente_id", "cliente_nome", "cliente_sobrenome", "data_venda", "dias_em_aberto",
+         "faixa", "valor_total", "forma_pagamento"],
+        (
+            (l.id, l.cliente_id, l.cliente_nome, l.cliente_sobrenome, l.data_venda,
+             (data_referencia - l.data_venda.date()).days if l.data_venda else None,
+             l.faixa, l.valor_total, l.forma_pagamento)
+            for l in linhas
+        )
+    )
+
+
+DATASETS = {
+    "produtos": _produtos,
+    "vendas": _vendas,
+    "transacoes": _transacoes,
+    "estoque_niveis": _estoque_niveis,
+    "estoque_baixo": _estoque_baixo,
+    "vendas_sumario": _vendas_sumario,
+    "clientes_sumario": _clientes_sumario,
+    "recebiveis": _recebiveis,
+}
+
+
+def validate_export(nome, formato):
+    if nome not in DATASETS:
+        raise ExportError(f"Exportação desconhecida: {nome}")
+    if formato not in FORMATS:
+        raise ExportError("Formato inválido. Use csv ou xlsx")
+    if formato == "xlsx" and xlsxwriter is None:
+        raise ExportError("Exportação XLSX indisponível (pacote xlsxwriter não instalado)")
+
+
+def dataset_rows(nome, args):
+    """(columns, row iterator) for dataset nome; ExportError on invalid filters."""
+    try:
+        return DATASETS[nome](args)
+    except ValueError as e:
+        raise ExportError("Formato de data inválido. Use YYYY-MM-DD") from e
+
+
+def export_filename(nome, formato):
+    return f"{nome}-{datetime.utcnow():%Y%m%d-%H%M%S}.{formato}"
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ", timespec="seconds")
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def iter_csv(colunas, linhas):
+    """CSV text chunks (UTF-8 BOM first, so Excel detects the encoding); text that would
+    be read as a formula is prefixed with a quote."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(colunas)
+    for i, linha in enumerate(linhas, 1):
+        writer.writerow([_csv_value(v) for v in linha])
+        if i % CSV_FLUSH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def write_xlsx(path, colunas, linhas, titulo="dados"):
+    """Writes the rows to an XLSX file at path in constant memory."""
+    workbook = xlsxwriter.Workbook(path, {
+        "constant_memory": True,
+        "tmpdir": os.path.dirname(path) or None,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",
+        "remove_timezone": True,
+        # Cell text is always written as text, never as a formula
+        "strings_to_formulas": False,
+    })
+    try:
+        cabecalho = workbook.add_format({"bold": True})
+        planilha, linha_atual, numero = None, XLSX_MAX_ROWS, 0
+        for linha in linhas:
+            if linha_atual >= XLSX_MAX_ROWS:
+                numero += 1
+                planilha = workbook.add_worksheet(titulo if numero == 1 else f"{titulo} {numero}")
+                planilha.write_row(0, 0, colunas, cabecalho)
+                linha_atual = 0
+            linha_atual += 1
+            planilha.write_row(linha_atual, 0, linha)
+        if planilha is None:
+            workbook.add_worksheet(titulo).write_row(0, 0, colunas, cabecalho)
+    finally:
+        workbook.close()
+
+
+def write_export(nome, formato, args, path):
+    """Writes a whole export to path; used by background jobs and `flask exportar`."""
+    colunas, linhas = dataset_rows(nome, args)
+    if formato == "xlsx":
+        write_xlsx(path, colunas, linhas, titulo=nome)
+        return
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for chunk in iter_csv(colunas, linhas):
+            f.write(chunk)
+
+
+# --- Background jobs --- #
+
+def export_dir(app):
+    directory = app.config.get("EXPORT_DIR") or os.path.join(tempfile.gettempdir(), "tutto-exports")
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def _job_path(app, job_id, suffix):
+    if not _JOB_ID.match(job_id or ""):
+        return None
+    return os.path.join(export_dir(app), f"{job_id}{suffix}")
+
+
+def _save_job(app, job):
+    path = _job_path(app, job["id"], ".json")
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(job, f)
+    os.replace(tmp, path)
+
+
+def _worker_ativo(pid):
+    if not pid:
+        return True  # job files written before the pid was recorded
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # exists but belongs to another user, or no signals on this platform
+    return True
+
+
+def get_job(app, job_id):
+    """The job's status dict, or None if it doesn't exist."""
+    path = _job_path(app, job_id, ".json")
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        job = json.load(f)
+    if job["status"] in ("pendente", "processando") and not _worker_ativo(job.get("pid")):
+        job.update(status="erro", erro="Exportação interrompida: o processo que a gerava foi encerrado")
+    return job
+
+
+def job_output_path(app, job):
+    return _job_path(app, job["id"], f".{job['formato']}")
+
+
+def _run_job(app, job):
+    with app.app_context():
+        job.update(status="processando", iniciado_em=datetime.utcnow().isoformat())
+        _save_job(app, job)
+        destino = job_output_path(app, job)
+        try:
+            write_export(job["nome"], job["formato"], MultiDict(job["filtros"]), f"{destino}.part")
+            os.replace(f"{destino}.part", destino)
+            job.update(status="concluido", tamanho_bytes=os.path.getsize(destino))
+        except Exception as e:
+            app.logger.error(f"Export job {job['id']} failed: {e}", exc_info=True)
+            job.update(status="erro", erro=str(e) if isinstance(e, ExportError) else "Erro ao gerar exportação")
+            if os.path.exists(f"{destino}.part"):
+                os.remove(f"{destino}.part")
+        finally:
+            db.session.remove()
+        job["concluido_em"] = datetime.utcnow().isoformat()
+        _save_job(app, job)
+
+
+def _cleanup_jobs(app):
+    """Deletes job files older than EXPORT_JOB_TTL_HOURS."""
+    limite = datetime.utcnow().timestamp() - timedelta(hours=app.config.get("EXPORT_JOB_TTL_HOURS", 24)).total_seconds()
+    directory = export_dir(app)
+    for nome in os.listdir(directory):
+        path = os.path.join(directory, nome)
+        try:
+            if os.path.getmtime(path) < limite:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def start_export_job(nome, formato, args):
+    """Queues an export in a background thread; returns the job status dict."""
+    global _job_executor
+    validate_export(nome, formato)
+    app = current_app._get_current_object()
+    _cleanup_jobs(app)
+    if _job_executor is None:
+        _job_executor = ThreadPoolExecutor(
+            max_workers=app.config.get("EXPORT_JOB_WORKERS", 2), thread_name_prefix="export"
+        )
+    job = {
+        "id": uuid.uuid4().hex,
+        "nome": nome,
+        "formato": formato,
+        "filtros": args.to_dict(flat=False),
+        "status": "pendente",
+        "criado_em": datetime.utcnow().isoformat(),
+        # The job runs in this process's thread pool
+        "pid": os.getpid(),
+    }
+    _save_job(app, job)
+    _job_executor.submit(_run_job, app, dict(job))
+    return job
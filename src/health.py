@@ -0,0 +1,102 @@
+# === health.py ===
+"""Liveness and readiness probes.
+
+/health and /health/live never touch the database. /health/ready runs a bounded SELECT 1,
+reports DB pool usage and the migration revision, and caches its result for a second or two
+so probes from several load balancers don't add load on the database.
+"""
+import os
+import time
+
+from flask import jsonify
+from sqlalchemy import text
+
+from src.utils.cache import TTLCache
+
+_readiness_cache = TTLCache(ttl=2, maxsize=1)
+_migration_heads = {}
+
+
+def pool_status(engine):
+    """Size, checked-out and overflow counts of the engine's pool (None where the pool has no limits)."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+    }
+
+
+def _migration_head(directory):
+    if directory not in _migration_heads:
+        from alembic.script import ScriptDirectory
+        _migration_heads[directory] = ScriptDirectory(directory).get_current_head()
+    return _migration_heads[directory]
+
+
+def _check_database(engine, timeout_ms):
+    inicio = time.perf_counter()
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            # SET LOCAL only lasts for this transaction
+            conn.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+        conn.execute(text("SELECT 1"))
+
+        from alembic.runtime.migration import MigrationContext
+        current = MigrationContext.configure(conn).get_current_revision()
+    return (time.perf_counter() - inicio) * 1000, current
+
+
+def check_readiness(app, db):
+    """Runs the readiness checks; returns (payload, ready)."""
+    engine = db.engine
+    pool = pool_status(engine)
+    payload = {"database": {"ok": False}, "pool": pool}
+
+    # A saturated pool would block the checkout below for pool_timeout seconds
+    if pool and pool["max_overflow"] >= 0 and pool["checked_out"] >= pool["size"] + pool["max_overflow"]:
+        payload["database"]["error"] = "Pool de conexões esgotado"
+        return payload, False
+
+    try:
+        latency_ms, current = _check_database(engine, app.config.get("READINESS_DB_TIMEOUT_MS", 1000))
+    except Exception:
+        # The endpoint is public: details (hosts, SQL) only go to the log
+        app.logger.warning("Readiness check failed", exc_info=True)
+        payload["database"]["error"] = "erro"
+        return payload, False
+    payload["database"] = {"ok": True, "latency_ms": round(latency_ms, 1)}
+
+    head = None
+    directory = app.config.get("MIGRATIONS_DIRECTORY")
+    if directory and os.path.isdir(directory):
+        try:
+            head = _migration_head(directory)
+        except Exception as e:
+            app.logger.warning(f"Could not read migration head: {e}")
+    payload["migrations"] = {"current": current, "head": head, "up_to_date": current == head}
+
+    ready = payload["migrations"]["up_to_date"] or not app.config.get("READINESS_REQUIRE_MIGRATIONS", False)
+    return payload, ready
+
+
+def init_health(app, db):
+    """Registers /health, /health/live and /health/ready on app."""
+
+    @app.route("/health")
+    @app.route("/health/live")
+    def health_check():
+        return jsonify({"status": "ok"}), 200
+
+    @app.route("/health/ready")
+    def readiness_check():
+        result = _readiness_cache.get("ready")
+        if result is None:
+            result = check_readiness(app, db)
+            _readiness_cache.set("ready", result, ttl=app.config.get("READINESS_CACHE_SECONDS", 2))
+        payload, ready = result
+        payload = {"status": "ok" if ready else "unavailable", **payload}
+        return jsonify(payload), 200 if ready else 503
@@ -0,0 +1,129 @@
+# === instrumentation.py ===
+"""Per-request timing and SQL profiling.
+
+Each request gets a RequestStats on flask.g that counts SQL statements and DB time via engine
+cursor events. On the way out it adds a Server-Timing header, and it warns about slow statements
+and about statements repeated often enough to look like an N+1 loop.
+"""
+import time
+from collections import Counter
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_QUERY_START_KEY = "instrumentation_query_start"
+
+
+class RequestStats:
+    """Timing and SQL counters for the current request."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.duration = None
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.statements = Counter()
+
+    def record(self, statement, elapsed):
+        self.sql_count += 1
+        self.sql_time += elapsed
+        self.statements[statement] += 1
+
+    def finish(self):
+        self.duration = time.perf_counter() - self.started_at
+        return self.duration
+
+
+def current_stats():
+    """The RequestStats of the active request, or None outside a request."""
+    if not has_request_context():
+        return None
+    return g.get("request_stats")
+
+
+def describe_route():
+    """Method and URL rule of the active request, for log lines."""
+    if not has_request_context():
+        return "-"
+    rule = request.url_rule.rule if request.url_rule else request.path
+    return f"{request.method} {rule}"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_QUERY_START_KEY, []).append((context, time.perf_counter()))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_QUERY_START_KEY)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()[1]
+
+    stats = current_stats()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if not has_app_context():
+        return
+    slow_query_ms = current_app.config.get("SLOW_QUERY_MS")
+    if slow_query_ms and elapsed * 1000 >= slow_query_ms:
+        # Parameterized SQL only; bound values may hold customer data
+        current_app.logger.warning(
+            "Slow query (%.1f ms) on %s: %s", elapsed * 1000, describe_route(), statement
+        )
+
+
+def _handle_error(context):
+    # after_cursor_execute doesn't run for a failed statement: drop its start time so the
+    # connection's stack doesn't grow. Errors raised before before_cursor_execute (or after
+    # after_cursor_execute) have no entry of their own on top, and leave the stack alone.
+    if context.connection is None or context.execution_context is None:
+        return
+    starts = context.connection.info.get(_QUERY_START_KEY)
+    if starts and starts[-1][0] is context.execution_context:
+        starts.pop()
+
+
+def _register_engine_listeners():
+    # Class-level listeners cover every engine, including ones created after startup
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+def init_instrumentation(app):
+    """Registers the request hooks on app. Controlled by INSTRUMENTATION_ENABLED."""
+    if not app.config.get("INSTRUMENTATION_ENABLED", True):
+        return
+
+    _register_engine_listeners()
+
+    @app.before_request
+    def start_request_stats():
+        g.request_stats = RequestStats()
+
+    @app.after_request
+    def finish_request_stats(response):
+        stats = current_stats()
+        if stats is None:
+            return response
+        duration = stats.finish()
+
+        if app.config.get("SERVER_TIMING_ENABLED", True):
+            response.headers.add(
+                "Server-Timing",
+                f'app;dur={duration * 1000:.1f}, '
+                f'db;dur={stats.sql_time * 1000:.1f};desc="{stats.sql_count} queries"'
+            )
+
+        threshold = app.config.get("N_PLUS_ONE_THRESHOLD")
+        if threshold:
+            for statement, count in stats.statements.items():
+                if count > threshold:
+                    app.logger.warning(
+                        "Possible N+1 on %s: statement ran %d times: %s",
+                        describe_route(), count, statement
+                    )
+        return response
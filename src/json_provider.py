@@ -0,0 +1,89 @@
+# === json_provider.py ===
+"""JSON serialization for jsonify/request.get_json.
+
+JSON_PROVIDER selects the implementation:
+- "auto" (default): orjson when installed, otherwise the stdlib provider;
+- "orjson": require orjson;
+- "stdlib": Flask's json-based provider.
+
+Both serialize datetime and date values as ISO 8601 strings (Flask's default would use RFC 822
+HTTP dates), so models hand datetimes over as-is instead of calling .isoformat() themselves.
+"""
+from datetime import date
+
+from flask.json.provider import DefaultJSONProvider, _default as _flask_default
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(o):
+    if isinstance(o, date):  # includes datetime
+        return o.isoformat()
+    return _flask_default(o)
+
+
+class IsoJSONProvider(DefaultJSONProvider):
+    """Flask's stdlib provider with ISO 8601 dates."""
+
+    default = staticmethod(_default)
+
+
+class OrjsonProvider(IsoJSONProvider):
+    """orjson-backed provider: several times faster on large lists of to_dict() payloads.
+
+    orjson serializes datetime/date natively in the same ISO 8601 form as .isoformat(); other
+    types it doesn't know (Decimal, UUID, dataclasses...) go through the same default hook.
+    Output is UTF-8 rather than ASCII-escaped. Calls with stdlib-only keyword arguments fall
+    back to the stdlib implementation.
+    """
+
+    # Sorting keys costs ~30% of the dump time and clients don't depend on key order
+    sort_keys = False
+
+    def _options(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps_bytes(self, obj, indent=False):
+        return orjson.dumps(obj, default=self.default, option=self._options(indent))
+
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.pop("indent", None)
+        kwargs.pop("separators", None)
+        if kwargs or indent not in (None, 2):
+            return super().dumps(obj, indent=indent, **kwargs)
+        return self.dumps_bytes(obj, indent=indent == 2).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        # Bytes straight into the response, skipping the str round trip
+        return self._app.response_class(self.dumps_bytes(obj, indent) + b"\n", mimetype=self.mimetype)
+
+
+def json_provider_class(name):
+    name = (name or "auto").lower()
+    if name == "stdlib":
+        return IsoJSONProvider
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("JSON_PROVIDER=orjson requires the orjson package")
+    if name in ("auto", "orjson"):
+        return OrjsonProvider if orjson is not None else IsoJSONProvider
+    raise RuntimeError(f"Unknown JSON_PROVIDER: {name}")
+
+
+def init_json(app):
+    """Installs the configured JSON provider on app (JSON_PROVIDER)."""
+    app.json = json_provider_class(app.config.get("JSON_PROVIDER"))(app)
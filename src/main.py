@@ -2,60 +2,57 @@ import os
 from flask import Flask, jsonify
 from werkzeug.exceptions import HTTPException
 from flask_cors import CORS
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 
-from src.config import Config
+from src.config import Config, check_required_env
+from src.cli import bootstrap_database, register_cli
+from src.compression import init_compression
+from src.dashboard import init_dashboard
+from src.instrumentation import init_instrumentation
+from src.json_provider import init_json
+from src.metrics import init_metrics
+from src.health import init_health
+from src.database import init_database
 from src.models import db
-from src.models.user import User
 from src.routes import register_routes
 
 def create_app():
+    """Builds the app without touching the database, so workers boot fast (and with --preload)."""
+    check_required_env()
     app = Flask(__name__)
     app.config.from_object(Config)
+    init_json(app)
+
+    # Registered first so it runs after every other after_request hook
+    init_compression(app)
 
     # Initialize extensions
     db.init_app(app)
-    Migrate(app, db)
+    init_database(app, db)
     JWTManager(app)
+    init_instrumentation(app)
+    init_metrics(app, db)
+    init_dashboard(app)
+
+    # Flask-Migrate pulls in alembic (the slowest import); only the `flask db` commands need it
+    if os.environ.get("FLASK_RUN_FROM_CLI") == "true":
+        from flask_migrate import Migrate
+        Migrate(app, db, directory=app.config["MIGRATIONS_DIRECTORY"])
+    register_cli(app)
 
     # Restrict CORS to your frontend domain
     CORS(app, origins=["https://www.tuttobaby.com.br"], supports_credentials=True)
 
-    # Ensure database tables exist and seed initial admin user if none exists
-    with app.app_context():
-        # Ensure tables exist
-        db.create_all()
-
-        # Auto-seed initial admin user if none exists
-        try:
-            user_count = User.query.count()
-        except Exception as e:
-            app.logger.error(f"Error counting users: {e}")
-            user_count = 0
-
-        if user_count == 0:
-            admin_email = os.getenv("ADMIN_EMAIL", "").strip()
-            admin_pass  = os.getenv("ADMIN_PASS", "").strip()
-            if admin_email and admin_pass:
-                admin = User(email=admin_email, name="Administrator")
-                admin.set_password(admin_pass)
-                admin.role = "admin"
-                db.session.add(admin)
-                db.session.commit()
-                app.logger.info(f"Auto-created admin user: {admin_email}")
-            else:
-                app.logger.warning(
-                    "No ADMIN_EMAIL/ADMIN_PASS set or empty; skipping auto-seed of admin user."
-                )
+    # Schema creation and admin seeding run via `flask bootstrap`; opt back in for
+    # single-process deployments that relied on doing it at boot
+    if app.config.get("BOOTSTRAP_ON_STARTUP"):
+        bootstrap_database(app)
 
     # Register blueprints
     register_routes(app)
 
-    # Health-check endpoint
-    @app.route("/health")
-    def health_check():
-        return jsonify({"status": "ok"}), 200
+    # Liveness and readiness endpoints
+    init_health(app, db)
 
     # HTTP exception handler
     @app.errorhandler(HTTPException)
@@ -69,6 +66,3 @@ def create_app():
         return jsonify({"success": False, "error": "Erro interno do servidor"}), 500
 
     return app
-
-# Entrypoint
-app = create_app()
@@ -0,0 +1,106 @@
+# === metrics.py ===
+"""Prometheus metrics: request latency and status per blueprint/endpoint, SQL statements per
+request, DB pool gauges and business counters, exposed on /metrics.
+
+Under gunicorn, set PROMETHEUS_MULTIPROC_DIR so every worker writes its samples to a shared
+directory and /metrics aggregates them (see gunicorn.conf.py for the worker cleanup hooks).
+"""
+import hmac
+import os
+import time
+
+from flask import Response, abort, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+from src.health import pool_status
+from src.instrumentation import current_stats
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency",
+    ["blueprint", "endpoint", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+REQUEST_COUNT = Counter(
+    "http_requests", "Requests by status code",
+    ["blueprint", "endpoint", "method", "status"]
+)
+REQUEST_SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements", "SQL statements executed per request",
+    ["blueprint", "endpoint"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250, 1000)
+)
+
+# livesum: the scrape reports the sum over live workers
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool size", multiprocess_mode="livesum")
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections checked out", multiprocess_mode="livesum")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Overflow connections in use", multiprocess_mode="livesum")
+
+# Business counters, incremented by the routes after a successful commit
+VENDAS_CRIADAS = Counter("vendas_criadas", "Sales created")
+TROCAS_CRIADAS = Counter("trocas_criadas", "Exchanges created")
+PRODUTOS_IMPORTADOS = Counter("produtos_importados", "Product rows created by imports")
+
+
+def _route_labels():
+    # Unmatched URLs share one label set to keep cardinality bounded
+    return request.blueprint or "app", request.endpoint or "unmatched"
+
+
+def update_pool_gauges(engine):
+    # Only QueuePool reports these (SQLite test pools don't)
+    status = pool_status(engine)
+    if status:
+        DB_POOL_SIZE.set(status["size"])
+        DB_POOL_CHECKED_OUT.set(status["checked_out"])
+        DB_POOL_OVERFLOW.set(status["overflow"])
+
+
+def _registry():
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def init_metrics(app, db):
+    """Registers the request hooks and the /metrics endpoint. Controlled by METRICS_ENABLED."""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    @app.before_request
+    def start_metrics_timer():
+        g.metrics_started_at = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started_at = g.get("metrics_started_at")
+        if started_at is None:
+            return response
+        blueprint, endpoint = _route_labels()
+        REQUEST_LATENCY.labels(blueprint, endpoint, request.method).observe(time.perf_counter() - started_at)
+        REQUEST_COUNT.labels(blueprint, endpoint, request.method, str(response.status_code)).inc()
+
+        stats = current_stats()
+        if stats is not None:
+            REQUEST_SQL_STATEMENTS.labels(blueprint, endpoint).observe(stats.sql_count)
+
+        try:
+            update_pool_gauges(db.engine)
+        except Exception as e:
+            app.logger.debug(f"Could not read DB pool stats: {e}")
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        token = app.config.get("METRICS_AUTH_TOKEN")
+        if token:
+            enviado = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+            if not hmac.compare_digest(enviado, token):
+                abort(401)
+        elif not (app.testing or app.config.get("METRICS_ALLOW_UNAUTHENTICATED")):
+            # Business counters (sales, revenue) aren't public by default
+            abort(403, description="Defina METRICS_AUTH_TOKEN para habilitar /metrics")
+        return Response(generate_latest(_registry()), mimetype=CONTENT_TYPE_LATEST)
@@ -1,7 +1,9 @@
 # === models/__init__.py ===
 from flask_sqlalchemy import SQLAlchemy
+from src.database import RoutingSession
 
-db = SQLAlchemy()
+# RoutingSession sends designated read-only requests to the "replica" bind
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 # Import models here to ensure they are registered with SQLAlchemy
 from .product import Produto
@@ -11,3 +13,5 @@ from .field_option import FieldOption
 from .client import Cliente
 from .sale import Venda, ItemVenda
 from .troca import Troca, ItemTroca
+from .dashboard import DashboardInvalidacao, DashboardSnapshot
+from .ranking import VendaFamiliaDiaria, ParFamiliaDiario
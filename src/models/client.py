@@ -25,8 +25,8 @@ class Cliente(db.Model):
             'email': self.email,
             'endereco': self.endereco,
             'observacoes': self.observacoes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
             'total_gasto': sum(v.valor_total for v in self.vendas) # Example insight
         }
 
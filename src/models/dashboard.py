@@ -0,0 +1,28 @@
+# === models/dashboard.py ===
+from . import db
+from datetime import datetime
+
+class DashboardSnapshot(db.Model):
+    """Precomputed dashboard payload (see src/dashboard.py); one row per chave, read by primary key."""
+    __tablename__ = 'dashboard_snapshots'
+
+    chave = db.Column(db.String(50), primary_key=True)
+    dados = db.Column(db.JSON, nullable=False)
+    gerado_em = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        return {
+            'chave': self.chave,
+            'dados': self.dados,
+            'gerado_em': self.gerado_em
+        }
+
+class DashboardInvalidacao(db.Model):
+    """One row per commit that touched the dashboard's tables since the last recompute.
+
+    Append-only, so concurrent writers never wait on each other; a recompute deletes the rows.
+    """
+    __tablename__ = 'dashboard_invalidacoes'
+
+    id = db.Column(db.Integer, primary_key=True)
+    criado_em = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -16,5 +16,5 @@ class FieldOption(db.Model):
             'type': self.type,
             'value': self.value,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at
         }
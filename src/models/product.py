@@ -1,10 +1,13 @@
 # === models/product.py ===
 from . import db
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import MONEY # Consider using appropriate type for currency
+from sqlalchemy.dialects.postgresql import MONEY, TSVECTOR # Consider using appropriate type for currency
 
 class Produto(db.Model):
     __tablename__ = 'produtos'
+    __table_args__ = (
+        db.Index('ix_produtos_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     # sku will be generated automatically later
@@ -23,6 +26,9 @@ class Produto(db.Model):
     # Removed data_venda, will be handled by Sales model
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Full-text search document (nome, sku, cor_estampa, tamanho, supplier name); maintained by
+    # utils.product_search.refresh_search_vectors. Plain text and unused outside PostgreSQL.
+    search_vector = db.Column(db.Text().with_variant(TSVECTOR(), 'postgresql'), nullable=True)
 
     fornecedor = db.relationship('Fornecedor', backref=db.backref('produtos', lazy=True))
     transacoes = db.relationship('TransacaoEstoque', backref='produto', lazy=True)
@@ -43,9 +49,12 @@ class Produto(db.Model):
             'preco_venda': self.preco_venda,
             'quantidade_atual': self.quantidade_atual,
             'limite_reabastecimento': self.limite_reabastecimento,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'data_compra': self.data_compra.isoformat() if self.data_compra else None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'data_compra': self.data_compra,
             # 'data_venda' removed
         }
 
+
+# A product family: the units that only differ by purchase lot (same grouping as /vendas/fifo_info)
+FAMILIA_COLUMNS = (Produto.nome, Produto.tamanho, Produto.sexo, Produto.cor_estampa)
@@ -0,0 +1,34 @@
+# === models/ranking.py ===
+from . import db
+
+class VendaFamiliaDiaria(db.Model):
+    """Units, revenue and cost sold per product family and day; materialized by src/rankings.py."""
+    __tablename__ = 'vendas_familia_diarias'
+
+    dia = db.Column(db.Date, primary_key=True)
+    nome = db.Column(db.String(150), primary_key=True)
+    tamanho = db.Column(db.String(50), primary_key=True)
+    sexo = db.Column(db.String(10), primary_key=True)
+    cor_estampa = db.Column(db.String(50), primary_key=True)
+    unidades = db.Column(db.Integer, nullable=False, default=0)
+    receita = db.Column(db.Float, nullable=False, default=0)
+    custo = db.Column(db.Float, nullable=False, default=0)
+    # Distinct sales containing the family
+    vendas = db.Column(db.Integer, nullable=False, default=0)
+    atualizado_em = db.Column(db.DateTime, nullable=False)
+
+class ParFamiliaDiario(db.Model):
+    """Sales containing both families (a < b) per day; materialized by src/rankings.py."""
+    __tablename__ = 'pares_familia_diarios'
+
+    dia = db.Column(db.Date, primary_key=True)
+    nome_a = db.Column(db.String(150), primary_key=True)
+    tamanho_a = db.Column(db.String(50), primary_key=True)
+    sexo_a = db.Column(db.String(10), primary_key=True)
+    cor_estampa_a = db.Column(db.String(50), primary_key=True)
+    nome_b = db.Column(db.String(150), primary_key=True)
+    tamanho_b = db.Column(db.String(50), primary_key=True)
+    sexo_b = db.Column(db.String(10), primary_key=True)
+    cor_estampa_b = db.Column(db.String(50), primary_key=True)
+    vendas = db.Column(db.Integer, nullable=False, default=0)
+    atualizado_em = db.Column(db.DateTime, nullable=False)
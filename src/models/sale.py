@@ -1,9 +1,22 @@
 # === models/sale.py ===
 from datetime import datetime
+from sqlalchemy import text
 from src.models import db
 
+STATUS_PAGAMENTO_PENDENTE = 'Pagamento Pendente'
+# Cancelled sales had their stock returned; sales figures leave them out
+STATUS_CANCELADO = 'Cancelado'
+
 class Venda(db.Model):
     __tablename__ = 'vendas'
+    __table_args__ = (
+        # Partial index: only the (few) pending sales, for the receivables report
+        db.Index(
+            'ix_vendas_pendentes_data_venda', 'data_venda', 'id',
+            postgresql_where=text(f"status = '{STATUS_PAGAMENTO_PENDENTE}'"),
+            sqlite_where=text(f"status = '{STATUS_PAGAMENTO_PENDENTE}'")
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     cliente_id = db.Column(db.Integer, db.ForeignKey('clientes.id'), nullable=True)
@@ -13,7 +26,7 @@ class Venda(db.Model):
     data_pagamento = db.Column(db.DateTime, nullable=True)
     valor_total = db.Column(db.Float, nullable=False, default=0)
     forma_pagamento = db.Column(db.String(50), nullable=True)
-    status = db.Column(db.String(50), default='Pagamento Pendente', nullable=False)
+    status = db.Column(db.String(50), default=STATUS_PAGAMENTO_PENDENTE, nullable=False)
     observacoes = db.Column(db.Text, nullable=True)
     desconto_percentual = db.Column(db.Float, nullable=True)
     desconto_valor = db.Column(db.Float, nullable=True)
@@ -30,8 +43,8 @@ class Venda(db.Model):
             'cliente_id': self.cliente_id,
             'cliente_nome': self.cliente_nome,
             'cliente_sobrenome': self.cliente_sobrenome,
-            'data_venda': self.data_venda.isoformat() if self.data_venda else None,
-            'data_pagamento': self.data_pagamento.isoformat() if self.data_pagamento else None,
+            'data_venda': self.data_venda,
+            'data_pagamento': self.data_pagamento,
             'valor_total': self.valor_total,
             'forma_pagamento': self.forma_pagamento,
             'status': self.status,
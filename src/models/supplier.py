@@ -20,8 +20,8 @@ class Fornecedor(db.Model):
             'nome': self.nome,
             'is_active': self.is_active,
             # 'contact_info': self.contact_info,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
             # 'product_count': len(self.produtos) # Avoid calculating this here for performance, query if needed
         }
 
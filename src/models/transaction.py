@@ -20,6 +20,8 @@ class TransacaoEstoque(db.Model):
     custo_unitario_transacao = db.Column(db.Float) # Store the product cost at the time of transaction
     # Added sale_id to link sales transactions to the Sale model
     venda_id = db.Column(db.Integer, db.ForeignKey('vendas.id'), nullable=True)
+    # Links exchange transactions ('troca_devolucao' / 'troca_saida') to their Troca
+    troca_id = db.Column(db.Integer, db.ForeignKey('trocas.id'), nullable=True, index=True)
 
     def to_dict(self):
         return {
@@ -28,10 +30,11 @@ class TransacaoEstoque(db.Model):
             'nome_produto': self.produto.nome if self.produto else None,
             'tipo_transacao': self.tipo_transacao,
             'quantidade': self.quantidade,
-            'data_transacao': self.data_transacao.isoformat() if self.data_transacao else None,
+            'data_transacao': self.data_transacao,
             'observacoes': self.observacoes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': self.created_at,
             'custo_unitario_transacao': self.custo_unitario_transacao,
-            'venda_id': self.venda_id
+            'venda_id': self.venda_id,
+            'troca_id': self.troca_id
         }
 
@@ -6,10 +6,10 @@ class Troca(db.Model):
     __tablename__ = 'trocas'
     
     id = db.Column(db.Integer, primary_key=True)
-    venda_original_id = db.Column(db.Integer, db.ForeignKey('vendas.id'), nullable=False)
+    venda_original_id = db.Column(db.Integer, db.ForeignKey('vendas.id'), nullable=False, index=True)
     cliente_nome = db.Column(db.String(100), nullable=False)
     cliente_sobrenome = db.Column(db.String(100), nullable=False)
-    data_troca = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    data_troca = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     valor_produtos_devolvidos = db.Column(db.Float, nullable=False, default=0)
     valor_produtos_novos = db.Column(db.Float, nullable=False, default=0)
     diferenca_valor = db.Column(db.Float, nullable=False, default=0)
@@ -19,17 +19,17 @@ class Troca(db.Model):
     itens = db.relationship('ItemTroca', backref='troca', cascade='all, delete-orphan')
     vendas = db.relationship('Venda', backref='troca_origem', primaryjoin="Venda.troca_id==Troca.id")
     
-    def to_dict(self):
+    def to_dict(self, compact=False):
         return {
             'id': self.id,
             'venda_original_id': self.venda_original_id,
             'cliente_nome': self.cliente_nome,
             'cliente_sobrenome': self.cliente_sobrenome,
-            'data_troca': self.data_troca.isoformat() if self.data_troca else None,
+            'data_troca': self.data_troca,
             'valor_produtos_devolvidos': self.valor_produtos_devolvidos,
             'valor_produtos_novos': self.valor_produtos_novos,
             'diferenca_valor': self.diferenca_valor,
-            'itens': [item.to_dict() for item in self.itens] if self.itens else []
+            'itens': [item.to_dict(compact=compact) for item in self.itens] if self.itens else []
         }
 
 class ItemTroca(db.Model):
@@ -44,12 +44,23 @@ class ItemTroca(db.Model):
     # Relationships
     produto = db.relationship('Produto')
     
-    def to_dict(self):
+    def to_dict(self, compact=False):
+        if compact:
+            # Only the product attributes shown in exchange history; skips the fornecedor lookup
+            produto = {
+                'id': self.produto.id,
+                'sku': self.produto.sku,
+                'nome': self.produto.nome,
+                'tamanho': self.produto.tamanho,
+                'cor_estampa': self.produto.cor_estampa
+            } if self.produto else None
+        else:
+            produto = self.produto.to_dict() if self.produto else None
         return {
             'id': self.id,
             'troca_id': self.troca_id,
             'produto_id': self.produto_id,
             'tipo': self.tipo,
             'valor': self.valor,
-            'produto': self.produto.to_dict() if self.produto else None
+            'produto': produto
         }
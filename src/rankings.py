@@ -0,0 +1,181 @@
+# === rankings.py ===
+"""Top-selling product families and frequently-bought-together pairs.
+
+Both reports read daily aggregates materialized from itens_venda:
+
+- vendas_familia_diarias: units, revenue, cost and number of sales per family and day;
+- pares_familia_diarios: number of sales containing both families of a pair, per day
+  (itens_venda self-joined on venda_id, each pair stored once with family a < family b).
+
+A sale happens on a single day, so summing the daily rows gives exact totals for any
+period, and a request reads at most (days x families sold) rows however long the history.
+
+`flask rankings-atualizar` rebuilds the last RANKINGS_REFRESH_DAYS days (the first run, or
+--completo, rebuilds everything); run it nightly from cron. Delete and insert happen in one
+transaction, in SQL (INSERT ... SELECT), so readers never see a half-built day. Figures
+are gross sales: returned items (trocas) are not subtracted, while cancelled sales, whose
+stock went back, are left out.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, delete, distinct, func, insert, literal, or_, select, true, tuple_
+
+from src.models import db, ItemVenda, ParFamiliaDiario, Produto, Venda, VendaFamiliaDiaria
+from src.models.product import FAMILIA_COLUMNS
+from src.models.sale import STATUS_CANCELADO
+
+FAMILIA_KEYS = tuple(coluna.key for coluna in FAMILIA_COLUMNS)
+RANKING_ORDENS = ("unidades", "receita")
+
+
+def _dia():
+    # date() is a function on both PostgreSQL and SQLite
+    return func.date(Venda.data_venda).label("dia")
+
+
+def _desde_filtro(desde):
+    return Venda.data_venda >= datetime.combine(desde, datetime.min.time()) if desde else true()
+
+
+def refresh_rankings(desde=None):
+    """Rebuilds the daily aggregates from desde (a date; None rebuilds all history).
+
+    Returns the number of (family, day) and (pair, day) rows written.
+    """
+    agora = datetime.utcnow()
+    dia = _dia()
+
+    familias = (
+        select(
+            dia,
+            *FAMILIA_COLUMNS,
+            func.sum(ItemVenda.quantidade),
+            func.sum(ItemVenda.preco_unitario * ItemVenda.quantidade),
+            func.sum(ItemVenda.custo_unitario * ItemVenda.quantidade),
+            func.count(distinct(ItemVenda.venda_id)),
+            literal(agora),
+        )
+        .select_from(ItemVenda)
+        .join(Produto, Produto.id == ItemVenda.produto_id)
+        .join(Venda, Venda.id == ItemVenda.venda_id)
+        .where(_desde_filtro(desde), Venda.status != STATUS_CANCELADO)
+        .group_by(dia, *FAMILIA_COLUMNS)
+    )
+
+    # One row per (sale, family), then pairs of families within each sale
+    por_venda = (
+        select(ItemVenda.venda_id, dia, *FAMILIA_COLUMNS)
+        .select_from(ItemVenda)
+        .join(Produto, Produto.id == ItemVenda.produto_id)
+        .join(Venda, Venda.id == ItemVenda.venda_id)
+        .where(_desde_filtro(desde), Venda.status != STATUS_CANCELADO)
+        .distinct()
+        .subquery()
+    )
+    a, b = por_venda.alias("a"), por_venda.alias("b")
+    familia_a = [a.c[k] for k in FAMILIA_KEYS]
+    familia_b = [b.c[k] for k in FAMILIA_KEYS]
+    pares = (
+        select(a.c.dia, *familia_a, *familia_b, func.count(), literal(agora))
+        .join(b, b.c.venda_id == a.c.venda_id)
+        .where(tuple_(*familia_a) < tuple_(*familia_b))
+        .group_by(a.c.dia, *familia_a, *familia_b)
+    )
+
+    colunas_par = ["dia", *[f"{k}_a" for k in FAMILIA_KEYS], *[f"{k}_b" for k in FAMILIA_KEYS], "vendas", "atualizado_em"]
+    try:
+        for modelo in (VendaFamiliaDiaria, ParFamiliaDiario):
+            stmt = delete(modelo)
+            if desde:
+                stmt = stmt.where(modelo.dia >= desde)
+            db.session.execute(stmt)
+        escritas_familias = db.session.execute(
+            insert(VendaFamiliaDiaria).from_select(
+                ["dia", *FAMILIA_KEYS, "unidades", "receita", "custo", "vendas", "atualizado_em"], familias
+            )
+        ).rowcount
+        escritas_pares = db.session.execute(insert(ParFamiliaDiario).from_select(colunas_par, pares)).rowcount
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return escritas_familias, escritas_pares
+
+
+def refresh_start(app, completo=False):
+    """First day the nightly refresh rebuilds: None (everything) when empty or completo."""
+    if completo or db.session.execute(select(VendaFamiliaDiaria.dia).limit(1)).first() is None:
+        return None
+    return datetime.utcnow().date() - timedelta(days=app.config.get("RANKINGS_REFRESH_DAYS", 7) - 1)
+
+
+def _periodo(modelo, inicio, fim):
+    return modelo.dia.between(inicio, fim)
+
+
+def top_families_query(inicio, fim, ordem="unidades", limite=20):
+    """Top families between inicio and fim (dates, inclusive) by units or revenue."""
+    unidades = func.sum(VendaFamiliaDiaria.unidades).label("unidades")
+    receita = func.sum(VendaFamiliaDiaria.receita).label("receita")
+    familia = [getattr(VendaFamiliaDiaria, k) for k in FAMILIA_KEYS]
+    principal, desempate = (receita, unidades) if ordem == "receita" else (unidades, receita)
+    return (
+        select(
+            *familia,
+            unidades,
+            receita,
+            func.sum(VendaFamiliaDiaria.custo).label("custo"),
+            func.sum(VendaFamiliaDiaria.vendas).label("vendas"),
+        )
+        .where(_periodo(VendaFamiliaDiaria, inicio, fim))
+        .group_by(*familia)
+        .order_by(principal.desc(), desempate.desc(), *familia)
+        .limit(limite)
+    )
+
+
+def basket_pairs(inicio, fim, min_vendas=2, limite=20):
+    """Most frequent pairs between inicio and fim, as row mappings with each family's sale count
+    (vendas_a, vendas_b). The counts are only read for the families in the top pairs."""
+    familia_a = [getattr(ParFamiliaDiario, f"{k}_a") for k in FAMILIA_KEYS]
+    familia_b = [getattr(ParFamiliaDiario, f"{k}_b") for k in FAMILIA_KEYS]
+    juntas = func.sum(ParFamiliaDiario.vendas).label("vendas_juntas")
+    pares = db.session.execute(
+        select(*familia_a, *familia_b, juntas)
+        .where(_periodo(ParFamiliaDiario, inicio, fim))
+        .group_by(*familia_a, *familia_b)
+        .having(juntas >= min_vendas)
+        .order_by(juntas.desc(), *familia_a, *familia_b)
+        .limit(limite)
+    ).mappings().all()
+    if not pares:
+        return []
+
+    familias = {tuple(par[f"{k}{lado}"] for k in FAMILIA_KEYS) for par in pares for lado in ("_a", "_b")}
+    familia = [getattr(VendaFamiliaDiaria, k) for k in FAMILIA_KEYS]
+    vendas_por_familia = dict(
+        (tuple(linha[:-1]), linha[-1])
+        for linha in db.session.execute(
+            select(*familia, func.sum(VendaFamiliaDiaria.vendas))
+            .where(
+                _periodo(VendaFamiliaDiaria, inicio, fim),
+                or_(*[and_(*[c == v for c, v in zip(familia, chave)]) for chave in familias])
+            )
+            .group_by(*familia)
+        )
+    )
+    return [
+        {
+            **par,
+            "vendas_a": vendas_por_familia.get(tuple(par[f"{k}_a"] for k in FAMILIA_KEYS)),
+            "vendas_b": vendas_por_familia.get(tuple(par[f"{k}_b"] for k in FAMILIA_KEYS)),
+        }
+        for par in pares
+    ]
+
+
+def last_refresh():
+    """When the most recent day was last materialized (None before the first run); a primary-key read."""
+    return db.session.execute(
+        select(VendaFamiliaDiaria.atualizado_em).order_by(VendaFamiliaDiaria.dia.desc()).limit(1)
+    ).scalar()
@@ -10,58 +10,73 @@ from .field_routes import field_bp
 from .report_routes import report_bp
 from .alert_routes import alerta_bp
 from .exchange_routes import exchange_bp
+from .export_routes import export_bp
+from .dashboard_routes import dashboard_bp
+
+# Secure all other blueprints under JWT protection. Attached once at import (not per
+# create_app), so the app factory can be called repeatedly (tests, --preload, CLI).
+@produto_bp.before_request
+@jwt_required()
+def secure_produtos(): pass
+
+@fornecedor_bp.before_request
+@jwt_required()
+def secure_fornecedores(): pass
+
+@transacao_bp.before_request
+@jwt_required()
+def secure_transacoes(): pass
+
+@venda_bp.before_request
+@jwt_required()
+def secure_vendas(): pass
+
+@cliente_bp.before_request
+@jwt_required()
+def secure_clientes(): pass
+
+@opcao_campo_bp.before_request
+@jwt_required()
+def secure_opcoes_campo(): pass
+
+@field_bp.before_request
+@jwt_required()
+def secure_fields(): pass
+
+@report_bp.before_request
+@jwt_required()
+def secure_reports(): pass
+
+@alerta_bp.before_request
+@jwt_required()
+def secure_alertas(): pass
+
+@exchange_bp.before_request
+@jwt_required()
+def secure_exchanges(): pass
+
+@export_bp.before_request
+@jwt_required()
+def secure_exports(): pass
+
+@dashboard_bp.before_request
+@jwt_required()
+def secure_dashboard(): pass
 
 def register_routes(app):
     # Public auth endpoints
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
 
-    # Secure all other blueprints under JWT protection
-    @produto_bp.before_request
-    @jwt_required()
-    def secure_produtos(): pass
+    # JWT-protected blueprints (guards above)
     app.register_blueprint(produto_bp, url_prefix="/api/produtos")
-
-    @fornecedor_bp.before_request
-    @jwt_required()
-    def secure_fornecedores(): pass
     app.register_blueprint(fornecedor_bp, url_prefix="/api/fornecedores")
-
-    @transacao_bp.before_request
-    @jwt_required()
-    def secure_transacoes(): pass
     app.register_blueprint(transacao_bp, url_prefix="/api/transacoes")
-
-    @venda_bp.before_request
-    @jwt_required()
-    def secure_vendas(): pass
     app.register_blueprint(venda_bp, url_prefix="/api/vendas")
-
-    @cliente_bp.before_request
-    @jwt_required()
-    def secure_clientes(): pass
     app.register_blueprint(cliente_bp, url_prefix="/api/clientes")
-
-    @opcao_campo_bp.before_request
-    @jwt_required()
-    def secure_opcoes_campo(): pass
     app.register_blueprint(opcao_campo_bp, url_prefix="/api/opcoes_campo")
-
-    @field_bp.before_request
-    @jwt_required()
-    def secure_fields(): pass
     app.register_blueprint(field_bp, url_prefix="/api/fields")
-
-    @report_bp.before_request
-    @jwt_required()
-    def secure_reports(): pass
     app.register_blueprint(report_bp, url_prefix="/api")
-
-    @alerta_bp.before_request
-    @jwt_required()
-    def secure_alertas(): pass
     app.register_blueprint(alerta_bp, url_prefix="/api/alertas")
-    
-    @exchange_bp.before_request
-    @jwt_required()
-    def secure_exchanges(): pass
     app.register_blueprint(exchange_bp, url_prefix="/api/trocas")
+    app.register_blueprint(export_bp, url_prefix="/api/exportacoes")
+    app.register_blueprint(dashboard_bp, url_prefix="/api/dashboard")
@@ -1,14 +1,76 @@
 # === routes/client_routes.py ===
 from flask import Blueprint, request, jsonify
+from sqlalchemy import case, func, literal, or_
 from src.models import db, Cliente # Updated import path
+from src.utils.helpers import escape_like
+from src.utils.list_rows import cliente_select, row_dicts
 
 cliente_bp = Blueprint("cliente_bp", __name__)
 
+SEARCH_DEFAULT_LIMIT = 10
+SEARCH_MAX_LIMIT = 50
+
 @cliente_bp.route("/", methods=["GET"])
 def get_all_clientes():
-    # Add search/filtering later if needed
-    clientes = Cliente.query.order_by(Cliente.nome).all()
-    return jsonify({"success": True, "clientes": [c.to_dict() for c in clientes]}), 200
+    # Incremental lookups (POS autocomplete) should use /search instead
+    # Plain rows with total_gasto summed in SQL (see utils/list_rows.py)
+    clientes = row_dicts(cliente_select().order_by(Cliente.nome, Cliente.id))
+    return jsonify({"success": True, "clientes": clientes}), 200
+
+@cliente_bp.route("/search", methods=["GET"])
+def search_clientes():
+    """Autocomplete search over nome, telefone and email.
+
+    Prefix matches rank first, then substring matches. On PostgreSQL fuzzy (trigram) matches on
+    the name are included as well, served by the pg_trgm GIN indexes; elsewhere it falls back to LIKE.
+    """
+    termo = request.args.get("q", "").strip()
+    limit = min(request.args.get("limit", SEARCH_DEFAULT_LIMIT, type=int), SEARCH_MAX_LIMIT)
+    if not termo or limit < 1:
+        return jsonify({"success": True, "clientes": []}), 200
+
+    termo_lower = termo.lower()
+    escapado = escape_like(termo_lower)
+    prefixo = f"{escapado}%"
+    contem = f"%{escapado}%"
+
+    nome = func.lower(Cliente.nome)
+    email = func.lower(func.coalesce(Cliente.email, ""))
+    telefone = func.coalesce(Cliente.telefone, "")
+
+    condicoes = [
+        nome.like(contem, escape="\\"),
+        telefone.like(contem, escape="\\"),
+        email.like(contem, escape="\\"),
+    ]
+    ranking = case(
+        (nome.like(prefixo, escape="\\"), 0),
+        (or_(telefone.like(prefixo, escape="\\"), email.like(prefixo, escape="\\")), 1),
+        else_=2
+    )
+
+    if db.session.get_bind().dialect.name == "postgresql":
+        # "%" is pg_trgm's similarity operator (threshold pg_trgm.similarity_threshold, default 0.3)
+        condicoes.append(nome.op("%")(termo_lower))
+        similaridade = func.similarity(nome, termo_lower)
+    else:
+        similaridade = literal(0)
+
+    resultados = (
+        db.session.query(Cliente.id, Cliente.nome, Cliente.telefone, Cliente.email)
+        .filter(or_(*condicoes))
+        .order_by(ranking, similaridade.desc(), Cliente.nome)
+        .limit(limit)
+        .all()
+    )
+    # Compact rows: to_dict() would lazy-load every client's sales for total_gasto
+    return jsonify({
+        "success": True,
+        "clientes": [
+            {"id": id_, "nome": nome_, "telefone": telefone_, "email": email_}
+            for id_, nome_, telefone_, email_ in resultados
+        ]
+    }), 200
 
 @cliente_bp.route("/<int:cliente_id>", methods=["GET"])
 def get_cliente(cliente_id):
@@ -0,0 +1,25 @@
+# === routes/dashboard_routes.py ===
+from datetime import datetime
+from flask import Blueprint, current_app, jsonify
+from src.dashboard import compute_dashboard, get_snapshot
+
+dashboard_bp = Blueprint("dashboard_bp", __name__)
+
+@dashboard_bp.route("/", methods=["GET"])
+def get_dashboard():
+    """Home dashboard, served from the precomputed snapshot (see src/dashboard.py)."""
+    if not current_app.config.get("DASHBOARD_SNAPSHOT_ENABLED", True):
+        return jsonify({
+            "success": True,
+            "dashboard": compute_dashboard(top_n=current_app.config.get("DASHBOARD_TOP_N", 5)),
+            "gerado_em": datetime.utcnow(),
+            "desatualizado": False
+        }), 200
+
+    snapshot, desatualizado = get_snapshot(current_app)
+    return jsonify({
+        "success": True,
+        "dashboard": snapshot.dados,
+        "gerado_em": snapshot.gerado_em,
+        "desatualizado": desatualizado
+    }), 200
@@ -1,20 +1,74 @@
 # === routes/exchange_routes.py ===
 from flask import Blueprint, request, jsonify
 from src.models import db, Venda, ItemVenda, Produto, TransacaoEstoque, Troca, ItemTroca
-from datetime import datetime
-from sqlalchemy import func
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, or_
+from sqlalchemy.orm import selectinload
+from src.metrics import TROCAS_CRIADAS
+from src.utils.helpers import escape_like
 
 troca_bp = Blueprint("troca_bp", __name__)
 
+MAX_PER_PAGE = 200
+
+def _troca_load_options(compact=False):
+    """Eager-load items -> produto (-> fornecedor) so serializing a page costs a fixed number of queries."""
+    produto_loader = selectinload(Troca.itens).selectinload(ItemTroca.produto)
+    if compact:
+        # Compact items don't include nome_fornecedor
+        return [produto_loader]
+    return [produto_loader.joinedload(Produto.fornecedor)]
+
 @troca_bp.route("/", methods=["GET"])
 def get_all_trocas():
-    # Add filtering/pagination later if needed
-    trocas = Troca.query.order_by(Troca.data_troca.desc()).all()
-    return jsonify({"success": True, "trocas": [t.to_dict() for t in trocas]}), 200
+    page = request.args.get("page", 1, type=int)
+    per_page = min(request.args.get("per_page", 50, type=int), MAX_PER_PAGE)
+    compact = request.args.get("compact", "false").lower() == "true"
+    start_date_str = request.args.get("start_date")
+    end_date_str = request.args.get("end_date")
+    cliente = request.args.get("cliente", "").strip()
+    venda_original_id = request.args.get("venda_original_id", type=int)
+    
+    if page < 1 or per_page < 1:
+        return jsonify({"success": False, "error": "Parâmetros de paginação inválidos"}), 400
+    
+    query = Troca.query.options(*_troca_load_options(compact))
+    
+    try:
+        if start_date_str:
+            query = query.filter(Troca.data_troca >= datetime.strptime(start_date_str, "%Y-%m-%d"))
+        if end_date_str:
+            # Inclusive end date
+            query = query.filter(Troca.data_troca < datetime.strptime(end_date_str, "%Y-%m-%d") + timedelta(days=1))
+    except ValueError:
+        return jsonify({"success": False, "error": "Formato de data inválido. Use YYYY-MM-DD"}), 400
+    
+    if cliente:
+        padrao = f"%{escape_like(cliente)}%"
+        query = query.filter(or_(
+            Troca.cliente_nome.ilike(padrao, escape="\\"),
+            Troca.cliente_sobrenome.ilike(padrao, escape="\\")
+        ))
+    if venda_original_id:
+        query = query.filter(Troca.venda_original_id == venda_original_id)
+    
+    pagina = query.order_by(Troca.data_troca.desc(), Troca.id.desc()).paginate(
+        page=page, per_page=per_page, error_out=False
+    )
+    return jsonify({
+        "success": True,
+        "trocas": [t.to_dict(compact=compact) for t in pagina.items],
+        "pagination": {
+            "page": pagina.page,
+            "per_page": pagina.per_page,
+            "total": pagina.total,
+            "pages": pagina.pages
+        }
+    }), 200
 
 @troca_bp.route("/<int:troca_id>", methods=["GET"])
 def get_troca(troca_id):
-    troca = Troca.query.get(troca_id)
+    troca = Troca.query.options(*_troca_load_options()).filter(Troca.id == troca_id).first()
     if not troca:
         return jsonify({"success": False, "error": "Troca não encontrada"}), 404
     return jsonify({"success": True, "troca": troca.to_dict()}), 200
@@ -46,28 +100,36 @@ def create_troca():
     if not venda_original:
         return jsonify({"success": False, "error": f"Venda original com ID {venda_original_id} não encontrada"}), 404
     
+    ids_devolvidos = [item.get("produto_id") for item in produtos_devolvidos]
+    ids_novos = [item.get("produto_id") for item in produtos_novos]
+    if not all(ids_devolvidos):
+        return jsonify({"success": False, "error": "ID do produto devolvido é obrigatório"}), 400
+    if not all(ids_novos):
+        return jsonify({"success": False, "error": "ID do produto novo é obrigatório"}), 400
+    
+    # Preload every product and the original sale items with one IN query each
+    produtos = {
+        p.id: p for p in Produto.query.filter(Produto.id.in_(set(ids_devolvidos + ids_novos))).all()
+    }
+    produtos_venda_original = {
+        row.produto_id for row in db.session.query(ItemVenda.produto_id).filter(
+            ItemVenda.venda_id == venda_original_id,
+            ItemVenda.produto_id.in_(set(ids_devolvidos))
+        )
+    }
+    
     # Validate returned products
-    for item in produtos_devolvidos:
-        produto_id = item.get("produto_id")
-        if not produto_id:
-            return jsonify({"success": False, "error": "ID do produto devolvido é obrigatório"}), 400
-        
-        produto = Produto.query.get(produto_id)
-        if not produto:
+    for produto_id in ids_devolvidos:
+        if produto_id not in produtos:
             return jsonify({"success": False, "error": f"Produto com ID {produto_id} não encontrado"}), 404
         
         # Check if product belongs to the original sale
-        item_venda = ItemVenda.query.filter_by(venda_id=venda_original_id, produto_id=produto_id).first()
-        if not item_venda:
+        if produto_id not in produtos_venda_original:
             return jsonify({"success": False, "error": f"Produto com ID {produto_id} não pertence à venda original"}), 400
     
     # Validate new products
-    for item in produtos_novos:
-        produto_id = item.get("produto_id")
-        if not produto_id:
-            return jsonify({"success": False, "error": "ID do produto novo é obrigatório"}), 400
-        
-        produto = Produto.query.get(produto_id)
+    for produto_id in ids_novos:
+        produto = produtos.get(produto_id)
         if not produto:
             return jsonify({"success": False, "error": f"Produto com ID {produto_id} não encontrado"}), 404
         
@@ -76,114 +138,108 @@ def create_troca():
             return jsonify({"success": False, "error": f"Produto {produto.nome} não está disponível em estoque"}), 400
     
     try:
+        agora = datetime.utcnow()
+        valor_devolvidos = sum(produtos[produto_id].preco_venda for produto_id in ids_devolvidos)
+        valor_novos = sum(produtos[produto_id].preco_venda for produto_id in ids_novos)
+        diferenca_valor = valor_novos - valor_devolvidos
+        
         # Create exchange record
         nova_troca = Troca(
             venda_original_id=venda_original_id,
             cliente_nome=cliente_nome,
             cliente_sobrenome=cliente_sobrenome,
-            data_troca=datetime.utcnow(),
-            valor_produtos_devolvidos=0,  # Will be calculated
-            valor_produtos_novos=0,  # Will be calculated
-            diferenca_valor=0  # Will be calculated
+            data_troca=agora,
+            valor_produtos_devolvidos=valor_devolvidos,
+            valor_produtos_novos=valor_novos,
+            diferenca_valor=diferenca_valor
         )
         db.session.add(nova_troca)
         db.session.flush()  # Get ID for the new exchange
         
-        # Process returned products
-        valor_devolvidos = 0
-        for item in produtos_devolvidos:
-            produto_id = item.get("produto_id")
-            produto = Produto.query.get(produto_id)
-            
-            # Add to exchange items
-            item_troca = ItemTroca(
-                troca_id=nova_troca.id,
-                produto_id=produto_id,
-                tipo="devolvido",
-                valor=produto.preco_venda
-            )
-            db.session.add(item_troca)
-            
-            # Update inventory - return product to stock
-            produto.quantidade_atual = 1  # Set to 1 since it's being returned
-            
-            # Create inventory transaction
-            transacao = TransacaoEstoque(
-                produto_id=produto_id,
-                tipo_transacao="troca_devolucao",
-                quantidade=1,  # Positive for return to stock
-                data_transacao=datetime.utcnow(),
-                observacoes=f"Troca ID: {nova_troca.id} - Devolução",
-                troca_id=nova_troca.id
-            )
-            db.session.add(transacao)
-            
-            valor_devolvidos += produto.preco_venda
-        
-        # Process new products
-        valor_novos = 0
-        for item in produtos_novos:
-            produto_id = item.get("produto_id")
-            produto = Produto.query.get(produto_id)
-            
-            # Add to exchange items
-            item_troca = ItemTroca(
-                troca_id=nova_troca.id,
-                produto_id=produto_id,
-                tipo="novo",
-                valor=produto.preco_venda
-            )
-            db.session.add(item_troca)
-            
-            # Update inventory - remove from stock
-            produto.quantidade_atual = 0  # Set to 0 since it's being taken
-            
-            # Create inventory transaction
-            transacao = TransacaoEstoque(
-                produto_id=produto_id,
-                tipo_transacao="troca_saida",
-                quantidade=-1,  # Negative for removal from stock
-                data_transacao=datetime.utcnow(),
-                observacoes=f"Troca ID: {nova_troca.id} - Saída",
-                troca_id=nova_troca.id
-            )
-            db.session.add(transacao)
-            
-            valor_novos += produto.preco_venda
-        
-        # Update exchange values
-        nova_troca.valor_produtos_devolvidos = valor_devolvidos
-        nova_troca.valor_produtos_novos = valor_novos
-        nova_troca.diferenca_valor = valor_novos - valor_devolvidos
-        
         # Create a new sale record for the exchange
         nova_venda = Venda(
             cliente_nome=cliente_nome,
             cliente_sobrenome=cliente_sobrenome,
-            data_venda=datetime.utcnow(),
-            valor_total=max(0, nova_troca.diferenca_valor),  # Only positive difference
-            status="Troca" if nova_troca.diferenca_valor <= 0 else "Pagamento Pendente",
+            data_venda=agora,
+            valor_total=max(0, diferenca_valor),  # Only positive difference
+            status="Troca" if diferenca_valor <= 0 else "Pagamento Pendente",
             observacoes=f"Troca ID: {nova_troca.id}",
             troca_id=nova_troca.id
         )
         db.session.add(nova_venda)
         db.session.flush()
         
-        # Add items to the new sale
-        for item in produtos_novos:
-            produto_id = item.get("produto_id")
-            produto = Produto.query.get(produto_id)
-            
-            item_venda = ItemVenda(
-                venda_id=nova_venda.id,
-                produto_id=produto_id,
-                quantidade=1,  # Always 1 in single-unit paradigm
-                preco_unitario=produto.preco_venda,
-                custo_unitario=produto.custo
-            )
-            db.session.add(item_venda)
+        # Update inventory set-based: returned products back to stock (single-unit paradigm)
+        Produto.query.filter(Produto.id.in_(set(ids_devolvidos))).update(
+            {Produto.quantidade_atual: 1}, synchronize_session=False
+        )
+        
+        # New products leave stock; the guard catches units sold concurrently since validation
+        ids_novos_unicos = set(ids_novos)
+        retirados = Produto.query.filter(
+            Produto.id.in_(ids_novos_unicos),
+            Produto.quantidade_atual > 0
+        ).update({Produto.quantidade_atual: 0}, synchronize_session=False)
+        if retirados != len(ids_novos_unicos):
+            db.session.rollback()
+            return jsonify({"success": False, "error": "Um ou mais produtos novos não estão mais disponíveis em estoque"}), 409
+        
+        # Bulk insert exchange items, sale items and inventory transactions
+        itens_troca = [
+            {"troca_id": nova_troca.id, "produto_id": produto_id, "tipo": "devolvido", "valor": produtos[produto_id].preco_venda}
+            for produto_id in ids_devolvidos
+        ] + [
+            {"troca_id": nova_troca.id, "produto_id": produto_id, "tipo": "novo", "valor": produtos[produto_id].preco_venda}
+            for produto_id in ids_novos
+        ]
+        db.session.execute(insert(ItemTroca), itens_troca)
         
+        itens_venda = [
+            {
+                "venda_id": nova_venda.id,
+                "produto_id": produto_id,
+                "quantidade": 1,  # Always 1 in single-unit paradigm
+                "preco_unitario": produtos[produto_id].preco_venda,
+                "custo_unitario": produtos[produto_id].custo
+            }
+            for produto_id in ids_novos
+        ]
+        db.session.execute(insert(ItemVenda), itens_venda)
+        
+        transacoes = [
+            {
+                "produto_id": produto_id,
+                "tipo_transacao": "troca_devolucao",
+                "quantidade": 1,  # Positive for return to stock
+                "data_transacao": agora,
+                "created_at": agora,
+                "observacoes": f"Troca ID: {nova_troca.id} - Devolução",
+                "troca_id": nova_troca.id
+            }
+            for produto_id in ids_devolvidos
+        ] + [
+            {
+                "produto_id": produto_id,
+                "tipo_transacao": "troca_saida",
+                "quantidade": -1,  # Negative for removal from stock
+                "data_transacao": agora,
+                "created_at": agora,
+                "observacoes": f"Troca ID: {nova_troca.id} - Saída",
+                "troca_id": nova_troca.id
+            }
+            for produto_id in ids_novos
+        ]
+        db.session.execute(insert(TransacaoEstoque), transacoes)
+        
+        troca_id, venda_id = nova_troca.id, nova_venda.id
         db.session.commit()
+        TROCAS_CRIADAS.inc()
+        
+        # Reload with eager loading so serialization costs a fixed number of queries
+        nova_troca = Troca.query.options(*_troca_load_options()).filter(Troca.id == troca_id).one()
+        nova_venda = Venda.query.options(
+            selectinload(Venda.itens).joinedload(ItemVenda.produto)
+        ).filter(Venda.id == venda_id).one()
         return jsonify({
             "success": True, 
             "troca": nova_troca.to_dict(),
@@ -0,0 +1,65 @@
+# === routes/export_routes.py ===
+import os
+import tempfile
+from flask import Blueprint, Response, current_app, jsonify, request, send_file, stream_with_context
+from src.exports import (
+    FORMATS, ExportError, dataset_rows, export_dir, export_filename, get_job, iter_csv,
+    job_output_path, start_export_job, validate_export, write_xlsx
+)
+
+export_bp = Blueprint("export_bp", __name__)
+
+@export_bp.route("/<nome>", methods=["GET"])
+def exportar(nome):
+    """Downloads dataset nome as ?formato=csv (streamed, default) or xlsx, with the list endpoint's filters."""
+    formato = request.args.get("formato", "csv").lower()
+    try:
+        validate_export(nome, formato)
+        colunas, linhas = dataset_rows(nome, request.args)
+    except ExportError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    headers = {"Content-Disposition": f'attachment; filename="{export_filename(nome, formato)}"'}
+    if formato == "csv":
+        response = Response(stream_with_context(iter_csv(colunas, linhas)), mimetype=FORMATS["csv"], headers=headers)
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx", dir=export_dir(current_app))
+    os.close(fd)
+    try:
+        write_xlsx(path, colunas, linhas, titulo=nome)
+    except Exception:
+        os.remove(path)
+        raise
+    response = send_file(path, mimetype=FORMATS["xlsx"], as_attachment=True,
+                         download_name=export_filename(nome, formato))
+    response.call_on_close(lambda: os.remove(path))
+    return response
+
+@export_bp.route("/<nome>/jobs", methods=["POST"])
+def create_export_job(nome):
+    """Runs the export in the background (for very large ranges); poll GET /jobs/<id>."""
+    formato = request.args.get("formato", "csv").lower()
+    try:
+        job = start_export_job(nome, formato, request.args)
+    except ExportError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify({"success": True, "job": job}), 202
+
+@export_bp.route("/jobs/<job_id>", methods=["GET"])
+def get_export_job(job_id):
+    job = get_job(current_app, job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Exportação não encontrada"}), 404
+    return jsonify({"success": True, "job": job}), 200
+
+@export_bp.route("/jobs/<job_id>/download", methods=["GET"])
+def download_export_job(job_id):
+    job = get_job(current_app, job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Exportação não encontrada"}), 404
+    if job["status"] != "concluido":
+        return jsonify({"success": False, "error": f"Exportação ainda não concluída (status: {job['status']})"}), 409
+    return send_file(job_output_path(current_app, job), mimetype=FORMATS[job["formato"]], as_attachment=True,
+                     download_name=export_filename(job["nome"], job["formato"]))
@@ -1,11 +1,16 @@
 # === routes/field_routes.py ===
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request, current_app
 from src.models import db, Produto
 from sqlalchemy import distinct
+from src.utils.cache import TTLCache
+from src.utils.product_search import FACET_COLUMNS, parse_facet_filters, facet_counts
 import sys # Added for basic error printing
 
 field_bp = Blueprint("field_bp", __name__)
 
+# Facet counts per filter set; each entry gets FACETS_CACHE_SECONDS when set
+_facets_cache = TTLCache()
+
 # Map frontend names to backend/DB column names
 FIELD_MAP = {
     "size": "tamanho",
@@ -15,6 +20,32 @@ FIELD_MAP = {
 # Validate using frontend names
 ALLOWED_FRONTEND_FIELDS = list(FIELD_MAP.keys())
 
+@field_bp.route("/facets", methods=["GET"])
+def get_catalog_facets():
+    """Available values and in-stock counts for tamanho, cor_estampa, sexo and fornecedor.
+
+    Accepts the catalog filters (q, tamanho, cor_estampa, sexo, fornecedor); each facet is counted
+    without its own filter, so the other values stay selectable. Answers from one grouped query,
+    cached per filter set and sent with Cache-Control/ETag headers.
+    """
+    ttl = current_app.config["FACETS_CACHE_SECONDS"]
+    chave = tuple(
+        (nome, tuple(sorted(request.args.getlist(nome))))
+        for nome in ["q", *FACET_COLUMNS]
+        if request.args.getlist(nome)
+    )
+
+    facets = _facets_cache.get(chave)
+    if facets is None:
+        facets = facet_counts(*parse_facet_filters(request.args))
+        _facets_cache.set(chave, facets, ttl=ttl)
+
+    response = jsonify({"success": True, "facets": facets})
+    response.cache_control.private = True
+    response.cache_control.max_age = ttl
+    response.add_etag()
+    return response.make_conditional(request)
+
 @field_bp.route("/<frontend_field_name>", methods=["GET"])
 def get_distinct_field_values(frontend_field_name):
     if frontend_field_name not in ALLOWED_FRONTEND_FIELDS:
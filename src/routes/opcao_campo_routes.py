@@ -1,6 +1,7 @@
 # === routes/opcao_campo_routes.py ===
 from flask import Blueprint, request, jsonify
 from src.models import db, FieldOption, Produto, Fornecedor # Updated import path
+from src.utils.product_search import refresh_search_vectors
 
 # Rename blueprint
 opcao_campo_bp = Blueprint("opcao_campo_bp", __name__)
@@ -140,6 +141,8 @@ def update_opcao_campo(tipo_campo, opcao_id):
             
             # Commit all product updates
             if updated_count > 0:
+                db.session.flush()
+                refresh_search_vectors(produto_ids=[product.id for product in products])
                 db.session.commit()
         
         return jsonify({
@@ -6,13 +6,70 @@ from datetime import datetime
 import os
 from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
+from src.metrics import PRODUTOS_IMPORTADOS
+from src.utils.columnar import produtos_columnar, wants_columnar
+from src.utils.list_rows import produto_select, row_dicts
+from src.utils.product_search import (
+    tokenize, text_match, parse_facet_filters, facet_counts, refresh_search_vectors
+)
 
 produto_bp = Blueprint("produto_bp", __name__)
 
+SEARCH_MAX_PER_PAGE = 200
+
 @produto_bp.route("/", methods=["GET"])
 def get_all_produtos():
-    produtos = Produto.query.all()
-    return jsonify({"success": True, "produtos": [p.to_dict() for p in produtos]}), 200
+    # Compact column arrays with dictionary-encoded attributes (see utils/columnar.py)
+    if wants_columnar(request.args):
+        return jsonify({"success": True, "produtos": produtos_columnar()}), 200
+
+    # Plain rows, no ORM instances (see utils/list_rows.py)
+    produtos = row_dicts(produto_select().order_by(Produto.id))
+    return jsonify({"success": True, "produtos": produtos}), 200
+
+@produto_bp.route("/search", methods=["GET"])
+def search_produtos():
+    """Full-text search over nome, sku, cor_estampa, tamanho and supplier name, with facet counts."""
+    termo = request.args.get("q", "").strip()
+    em_estoque = request.args.get("em_estoque", "false").lower() == "true"
+    page = request.args.get("page", 1, type=int)
+    per_page = min(request.args.get("per_page", 50, type=int), SEARCH_MAX_PER_PAGE)
+    if page < 1 or per_page < 1:
+        return jsonify({"success": False, "error": "Parâmetros de paginação inválidos"}), 400
+
+    # Text match plus any tamanho/cor_estampa/sexo/fornecedor attribute filters
+    filtros, por_facet = parse_facet_filters(request.args)
+    tokens = tokenize(termo)
+    rank = text_match(tokens)[1] if tokens else None
+
+    # Facets describe the matches; the stock filter only narrows the listed products
+    facets = facet_counts(filtros, por_facet)
+    filtros = filtros + list(por_facet.values())
+    if em_estoque:
+        filtros.append(Produto.quantidade_atual > 0)
+
+    query = (
+        Produto.query
+        .outerjoin(Fornecedor, Produto.fornecedor_id == Fornecedor.id)
+        .options(joinedload(Produto.fornecedor))
+        .filter(*filtros)
+    )
+    total = query.order_by(None).count()
+    ordenacao = [Produto.nome, Produto.id] if rank is None else [rank.desc(), Produto.nome, Produto.id]
+    produtos = query.order_by(*ordenacao).limit(per_page).offset((page - 1) * per_page).all()
+
+    return jsonify({
+        "success": True,
+        "produtos": [p.to_dict() for p in produtos],
+        "facets": facets,
+        "pagination": {
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "pages": (total + per_page - 1) // per_page
+        }
+    }), 200
 
 @produto_bp.route("/<int:produto_id>", methods=["GET"])
 def get_produto(produto_id):
@@ -80,6 +137,8 @@ def create_produto():
             
             produtos_criados.append(novo_produto)
         
+        db.session.flush()
+        refresh_search_vectors(produto_ids=[p.id for p in produtos_criados])
         db.session.commit()
         return jsonify({
             "success": True, 
@@ -121,6 +180,8 @@ def update_produto(produto_id):
             return jsonify({"success": False, "error": "Formato de data inválido. Use YYYY-MM-DD"}), 400
     
     try:
+        db.session.flush()
+        refresh_search_vectors(produto_ids=[produto.id])
         db.session.commit()
         return jsonify({"success": True, "produto": produto.to_dict()}), 200
     except Exception as e:
@@ -293,7 +354,10 @@ def import_produtos():
                 
                 produtos_criados.append(novo_produto)
         
+        db.session.flush()
+        refresh_search_vectors(produto_ids=[p.id for p in produtos_criados])
         db.session.commit()
+        PRODUTOS_IMPORTADOS.inc(len(produtos_criados))
         
         # Clean up new_options to only include non-empty lists
         for key in list(new_options.keys()):
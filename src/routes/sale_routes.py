@@ -1,17 +1,52 @@
 # === routes/sale_routes.py ===
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from src.models import db, Venda, ItemVenda, Produto, TransacaoEstoque
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import selectinload
 from src.models.troca import Troca, ItemTroca
+from src.metrics import VENDAS_CRIADAS
+from src.utils.helpers import parse_date_range
+from src.utils.list_rows import venda_dicts, venda_select
+from src.utils.streaming import stream_mode, stream_query
 
 venda_bp = Blueprint("venda_bp", __name__)
 
+def filter_vendas(query, args):
+    """Applies the sale list filters (start_date, end_date, status, cliente_id); shared with exports.
+
+    Raises ValueError on a malformed date.
+    """
+    start, end = parse_date_range(args)
+    if start:
+        query = query.filter(Venda.data_venda >= start)
+    if end:
+        query = query.filter(Venda.data_venda < end)
+    status = args.get("status")
+    if status:
+        query = query.filter(Venda.status == status)
+    cliente_id = args.get("cliente_id", type=int)
+    if cliente_id:
+        query = query.filter(Venda.cliente_id == cliente_id)
+    return query
+
 @venda_bp.route("/", methods=["GET"])
 def get_all_vendas():
-    # Add filtering/pagination later if needed
-    vendas = Venda.query.order_by(Venda.data_venda.desc()).all()
-    return jsonify({"success": True, "vendas": [v.to_dict() for v in vendas]}), 200
+    ordem = (Venda.data_venda.desc(), Venda.id.desc())
+    try:
+        # Full exports: ?stream=1 or ?format=ndjson
+        mode = stream_mode()
+        if mode:
+            query = Venda.query.options(
+                selectinload(Venda.itens).selectinload(ItemVenda.produto)
+            ).order_by(*ordem)
+            return stream_query(filter_vendas(query, request.args), "vendas", mode)
+
+        # Plain rows, no ORM instances (see utils/list_rows.py)
+        vendas = venda_dicts(filter_vendas(venda_select().order_by(*ordem), request.args))
+    except ValueError:
+        return jsonify({"success": False, "error": "Formato de data inválido. Use YYYY-MM-DD"}), 400
+    return jsonify({"success": True, "vendas": vendas}), 200
 
 @venda_bp.route("/<int:venda_id>", methods=["GET"])
 def get_venda(venda_id):
@@ -103,6 +138,7 @@ def create_venda():
             db.session.add(transacao)
         
         db.session.commit()
+        VENDAS_CRIADAS.inc()
         return jsonify({"success": True, "venda": nova_venda.to_dict()}), 201
         
     except Exception as e:
@@ -155,6 +191,63 @@ def update_venda(venda_id):
             "details": str(e)
         }), 500
 
+MAX_BATCH_SIZE = 1000
+
+def _venda_id_valido(valor):
+    return isinstance(valor, int) and not isinstance(valor, bool) and valor > 0
+
+def _parse_venda_ids(valores):
+    """Validates a list of sale ids from a batch payload, dropping duplicates but keeping order."""
+    if not isinstance(valores, list) or len(valores) == 0:
+        return None
+    ids = []
+    for valor in valores:
+        if not _venda_id_valido(valor):
+            return None
+        if valor not in ids:
+            ids.append(valor)
+    return ids
+
+def _calcular_desconto(valor_total, valor_pago):
+    """Returns (desconto_valor, desconto_percentual) when less than the total was paid."""
+    desconto_valor = valor_total - valor_pago if valor_pago < valor_total else 0
+    desconto_percentual = (desconto_valor / valor_total) * 100 if valor_total > 0 and desconto_valor > 0 else 0
+    return desconto_valor, desconto_percentual
+
+def _cancelar_vendas(venda_ids):
+    """Cancels the given sales set-based: one UPDATE per table plus a bulk insert of ledger rows.
+
+    Does not commit; callers own the transaction.
+    """
+    agora = datetime.utcnow()
+    itens = db.session.query(ItemVenda.venda_id, ItemVenda.produto_id).filter(
+        ItemVenda.venda_id.in_(venda_ids)
+    ).all()
+    produto_ids = {item.produto_id for item in itens}
+    
+    if produto_ids:
+        # Return to inventory; single-unit paradigm sets quantity back to 1
+        Produto.query.filter(Produto.id.in_(produto_ids)).update(
+            {Produto.quantidade_atual: 1}, synchronize_session=False
+        )
+        db.session.execute(insert(TransacaoEstoque), [
+            {
+                "produto_id": item.produto_id,
+                "tipo_transacao": "cancelamento",
+                "quantidade": 1,  # Positive for return to stock
+                "data_transacao": agora,
+                "created_at": agora,
+                "observacoes": f"Cancelamento de Venda ID: {item.venda_id}",
+                "venda_id": item.venda_id
+            }
+            for item in itens
+        ])
+    
+    # Update sale status instead of deleting
+    Venda.query.filter(Venda.id.in_(venda_ids)).update(
+        {Venda.status: "Cancelado"}, synchronize_session=False
+    )
+
 @venda_bp.route("/<int:venda_id>", methods=["DELETE"])
 def delete_venda(venda_id):
     venda = Venda.query.get(venda_id)
@@ -162,29 +255,7 @@ def delete_venda(venda_id):
         return jsonify({"success": False, "error": "Venda não encontrada"}), 404
     
     try:
-        # Get all products from this sale
-        itens = ItemVenda.query.filter_by(venda_id=venda_id).all()
-        
-        # Return products to inventory if sale is being deleted
-        for item in itens:
-            produto = Produto.query.get(item.produto_id)
-            if produto:
-                # Return to inventory
-                produto.quantidade_atual = 1  # Set back to 1 since it's being returned
-                
-                # Create inventory transaction
-                transacao = TransacaoEstoque(
-                    produto_id=item.produto_id,
-                    tipo_transacao="cancelamento",
-                    quantidade=1,  # Positive for return to stock
-                    data_transacao=datetime.utcnow(),
-                    observacoes=f"Cancelamento de Venda ID: {venda_id}"
-                )
-                db.session.add(transacao)
-        
-        # Update sale status instead of deleting
-        venda.status = "Cancelado"
-        
+        _cancelar_vendas([venda_id])
         db.session.commit()
         return jsonify({"success": True, "message": "Venda cancelada com sucesso"}), 200
     except Exception as e:
@@ -195,47 +266,156 @@ def delete_venda(venda_id):
             "details": str(e)
         }), 500
 
-@venda_bp.route("/<int:venda_id>/confirm-payment", methods=["POST"])
-def confirm_payment(venda_id):
-    venda = Venda.query.get(venda_id)
-    if not venda:
-        return jsonify({"success": False, "error": "Venda não encontrada"}), 404
-    
-    if venda.status != "Pagamento Pendente":
-        return jsonify({"success": False, "error": "Esta venda não está com pagamento pendente"}), 400
+@venda_bp.route("/batch/cancel", methods=["POST"])
+def batch_cancel_vendas():
+    data = request.json or {}
+    venda_ids = _parse_venda_ids(data.get("venda_ids"))
+    if venda_ids is None:
+        return jsonify({"success": False, "error": "Informe uma lista de IDs de venda válidos"}), 400
+    if len(venda_ids) > MAX_BATCH_SIZE:
+        return jsonify({"success": False, "error": f"Máximo de {MAX_BATCH_SIZE} vendas por lote"}), 400
     
-    data = request.json
-    valor_pago = data.get("valor_pago")
-    data_pagamento = data.get("data_pagamento")
-    observacoes = data.get("observacoes")
+    # Lock the sales so concurrent cancellations can't return the same stock twice
+    status_por_id = dict(
+        db.session.query(Venda.id, Venda.status)
+        .filter(Venda.id.in_(venda_ids))
+        .with_for_update()
+        .all()
+    )
     
-    if not valor_pago or valor_pago <= 0:
-        return jsonify({"success": False, "error": "Valor pago deve ser maior que zero"}), 400
+    resultados = []
+    cancelar = []
+    for venda_id in venda_ids:
+        status = status_por_id.get(venda_id)
+        if status is None:
+            resultados.append({"venda_id": venda_id, "success": False, "error": "Venda não encontrada"})
+        elif status == "Cancelado":
+            resultados.append({"venda_id": venda_id, "success": False, "error": "Venda já está cancelada"})
+        else:
+            cancelar.append(venda_id)
+            resultados.append({"venda_id": venda_id, "success": True, "status": "Cancelado"})
     
     try:
-        # Parse date
-        payment_date = datetime.strptime(data_pagamento, "%Y-%m-%d") if data_pagamento else datetime.utcnow()
+        if cancelar:
+            _cancelar_vendas(cancelar)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Batch cancel failed: {e}", exc_info=True)
+        return jsonify({"success": False, "error": "Erro interno do servidor ao cancelar vendas."}), 500
+    
+    return jsonify({"success": True, "canceladas": len(cancelar), "resultados": resultados}), 200
+
+def _confirmar_pagamentos(pagamentos):
+    """Validates the payments and marks the valid ones paid with one bulk UPDATE (no commit).
+
+    Returns (resultados, confirmadas): one result dict per payment, in order, and how many
+    sales were confirmed.
+    """
+    venda_ids = [p.get("venda_id") for p in pagamentos if isinstance(p, dict) and _venda_id_valido(p.get("venda_id"))]
+    
+    # Load only what the discount calculation needs, locking the rows for the transaction
+    vendas = {
+        row.id: row for row in db.session.query(Venda.id, Venda.status, Venda.valor_total)
+        .filter(Venda.id.in_(venda_ids))
+        .with_for_update()
+        .all()
+    } if venda_ids else {}
+    
+    resultados = []
+    atualizacoes = []
+    vistos = set()
+    for pagamento in pagamentos:
+        venda_id = pagamento.get("venda_id") if isinstance(pagamento, dict) else None
+        resultado = {"venda_id": venda_id, "success": False}
+        resultados.append(resultado)
         
-        # Calculate discount if applicable
-        desconto_valor = venda.valor_total - float(valor_pago) if float(valor_pago) < venda.valor_total else 0
-        desconto_percentual = (desconto_valor / venda.valor_total) * 100 if venda.valor_total > 0 and desconto_valor > 0 else 0
+        if not _venda_id_valido(venda_id):
+            resultado["error"] = "venda_id inválido"
+            continue
+        venda = vendas.get(venda_id)
+        if not venda:
+            resultado["error"] = "Venda não encontrada"
+            continue
+        if venda_id in vistos:
+            resultado["error"] = "Venda repetida no lote"
+            continue
+        if venda.status != "Pagamento Pendente":
+            resultado["error"] = "Esta venda não está com pagamento pendente"
+            continue
         
-        # Update sale
-        venda.status = "Pago"
-        venda.data_pagamento = payment_date
-        venda.observacoes = observacoes
-        venda.desconto_valor = desconto_valor
-        venda.desconto_percentual = desconto_percentual
+        try:
+            valor_pago = float(pagamento.get("valor_pago") or 0)
+            data_pagamento = pagamento.get("data_pagamento")
+            payment_date = datetime.strptime(data_pagamento, "%Y-%m-%d") if data_pagamento else datetime.utcnow()
+        except (ValueError, TypeError):
+            resultado["error"] = "Erro no formato dos dados: valor_pago ou data_pagamento inválido"
+            continue
+        if valor_pago <= 0:
+            resultado["error"] = "Valor pago deve ser maior que zero"
+            continue
         
+        desconto_valor, desconto_percentual = _calcular_desconto(venda.valor_total, valor_pago)
+        atualizacao = {
+            "id": venda_id,
+            "status": "Pago",
+            "data_pagamento": payment_date,
+            "desconto_valor": desconto_valor,
+            "desconto_percentual": desconto_percentual
+        }
+        if "observacoes" in pagamento:
+            atualizacao["observacoes"] = pagamento["observacoes"]
+        atualizacoes.append(atualizacao)
+        vistos.add(venda_id)
+        
+        resultado.update({"success": True, "status": "Pago", "desconto_valor": desconto_valor})
+    
+    # ORM bulk UPDATE by primary key (executemany)
+    if atualizacoes:
+        db.session.execute(update(Venda), atualizacoes)
+    return resultados, len(atualizacoes)
+
+@venda_bp.route("/<int:venda_id>/confirm-payment", methods=["POST"])
+def confirm_payment(venda_id):
+    data = request.json or {}
+    pagamento = {
+        "venda_id": venda_id,
+        "valor_pago": data.get("valor_pago"),
+        "data_pagamento": data.get("data_pagamento"),
+        "observacoes": data.get("observacoes")
+    }
+    
+    try:
+        (resultado,), confirmadas = _confirmar_pagamentos([pagamento])
+        if not confirmadas:
+            db.session.rollback()
+            codigo = 404 if resultado["error"] == "Venda não encontrada" else 400
+            return jsonify({"success": False, "error": resultado["error"]}), codigo
         db.session.commit()
-        return jsonify({"success": True, "venda": venda.to_dict()}), 200
+        return jsonify({"success": True, "venda": db.session.get(Venda, venda_id).to_dict()}), 200
     except Exception as e:
         db.session.rollback()
-        return jsonify({
-            "success": False, 
-            "error": "Erro interno do servidor ao confirmar pagamento.", 
-            "details": str(e)
-        }), 500
+        current_app.logger.error(f"Confirm payment failed: {e}", exc_info=True)
+        return jsonify({"success": False, "error": "Erro interno do servidor ao confirmar pagamento."}), 500
+
+@venda_bp.route("/batch/confirm-payment", methods=["POST"])
+def batch_confirm_payment():
+    data = request.json or {}
+    pagamentos = data.get("pagamentos")
+    if not isinstance(pagamentos, list) or len(pagamentos) == 0:
+        return jsonify({"success": False, "error": "Informe uma lista de pagamentos"}), 400
+    if len(pagamentos) > MAX_BATCH_SIZE:
+        return jsonify({"success": False, "error": f"Máximo de {MAX_BATCH_SIZE} pagamentos por lote"}), 400
+    
+    try:
+        resultados, confirmadas = _confirmar_pagamentos(pagamentos)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Batch confirm payment failed: {e}", exc_info=True)
+        return jsonify({"success": False, "error": "Erro interno do servidor ao confirmar pagamentos."}), 500
+    
+    return jsonify({"success": True, "confirmadas": confirmadas, "resultados": resultados}), 200
 
 @venda_bp.route("/fifo_info", methods=["GET"])
 def get_fifo_info():
@@ -1,6 +1,9 @@
 # === routes/supplier_routes.py ===
 from flask import Blueprint, request, jsonify
 from src.models import db, Fornecedor # Updated import path
+from src.utils.list_rows import fornecedor_select, row_dicts
+from src.utils.product_search import refresh_search_vectors
+from src.utils.supplier_stats import nest_stats, wants_stats, with_supplier_stats
 
 # Rename blueprint for consistency
 fornecedor_bp = Blueprint("fornecedor_bp", __name__)
@@ -10,15 +13,27 @@ def get_all_fornecedores():
     # Add query parameter to optionally include inactive suppliers
     include_inactive = request.args.get("include_inactive", "false").lower() == "true"
 
-    query = Fornecedor.query
+    # Plain rows, no ORM instances (see utils/list_rows.py)
+    stmt = fornecedor_select()
     if not include_inactive:
-        query = query.filter_by(is_active=True)
+        stmt = stmt.where(Fornecedor.is_active.is_(True))
 
-    fornecedores = query.order_by(Fornecedor.nome).all()
-    return jsonify({"success": True, "fornecedores": [f.to_dict() for f in fornecedores]}), 200
+    # ?with_stats=1: purchase/stock/sales figures from the same statement (see utils/supplier_stats.py)
+    if wants_stats(request.args):
+        fornecedores = [nest_stats(f) for f in row_dicts(with_supplier_stats(stmt).order_by(Fornecedor.nome))]
+        return jsonify({"success": True, "fornecedores": fornecedores}), 200
+
+    fornecedores = row_dicts(stmt.order_by(Fornecedor.nome))
+    return jsonify({"success": True, "fornecedores": fornecedores}), 200
 
 @fornecedor_bp.route("/<int:fornecedor_id>", methods=["GET"])
 def get_fornecedor(fornecedor_id):
+    if wants_stats(request.args):
+        linhas = row_dicts(with_supplier_stats(fornecedor_select().where(Fornecedor.id == fornecedor_id)))
+        if not linhas:
+            return jsonify({"success": False, "error": "Fornecedor não encontrado"}), 404
+        return jsonify({"success": True, "fornecedor": nest_stats(linhas[0])}), 200
+
     fornecedor = Fornecedor.query.get(fornecedor_id)
     if not fornecedor:
         return jsonify({"success": False, "error": "Fornecedor não encontrado"}), 404
@@ -78,6 +93,9 @@ def update_fornecedor(fornecedor_id):
 
     if updated:
         try:
+            db.session.flush()
+            # Supplier name is part of the product search document
+            refresh_search_vectors(fornecedor_ids=[fornecedor.id])
             db.session.commit()
         except Exception as e:
             db.session.rollback()
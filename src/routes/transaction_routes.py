@@ -2,23 +2,48 @@
 from flask import Blueprint, request, jsonify
 from src.models import db, TransacaoEstoque, Produto # Updated import path
 from datetime import datetime
+from sqlalchemy.orm import joinedload
+from src.utils.helpers import parse_date_range
+from src.utils.list_rows import row_dicts, transacao_select
+from src.utils.streaming import stream_mode, stream_query
 
 # Rename blueprint
 transacao_bp = Blueprint("transacao_bp", __name__)
 
-# GET route to fetch transactions (useful for history/audit)
-@transacao_bp.route("/", methods=["GET"])
-def get_all_transacoes():
-    # Add filtering by product_id, date range, type etc. later if needed
-    produto_id = request.args.get("produto_id", type=int)
-
-    query = TransacaoEstoque.query.order_by(TransacaoEstoque.data_transacao.desc())
+def filter_transacoes(query, args):
+    """Applies the ledger filters (produto_id, tipo_transacao, start_date, end_date); shared with exports.
 
+    Raises ValueError on a malformed date.
+    """
+    produto_id = args.get("produto_id", type=int)
     if produto_id:
-        query = query.filter_by(produto_id=produto_id)
+        query = query.filter(TransacaoEstoque.produto_id == produto_id)
+    tipo_transacao = args.get("tipo_transacao")
+    if tipo_transacao:
+        query = query.filter(TransacaoEstoque.tipo_transacao == tipo_transacao)
+    start, end = parse_date_range(args)
+    if start:
+        query = query.filter(TransacaoEstoque.data_transacao >= start)
+    if end:
+        query = query.filter(TransacaoEstoque.data_transacao < end)
+    return query
 
-    transacoes = query.all()
-    return jsonify({"success": True, "transacoes": [t.to_dict() for t in transacoes]}), 200
+# GET route to fetch transactions (useful for history/audit)
+@transacao_bp.route("/", methods=["GET"])
+def get_all_transacoes():
+    ordem = (TransacaoEstoque.data_transacao.desc(), TransacaoEstoque.id.desc())
+    try:
+        # Full exports: ?stream=1 or ?format=ndjson
+        mode = stream_mode()
+        if mode:
+            query = TransacaoEstoque.query.options(joinedload(TransacaoEstoque.produto)).order_by(*ordem)
+            return stream_query(filter_transacoes(query, request.args), "transacoes", mode)
+
+        # Plain rows, no ORM instances (see utils/list_rows.py)
+        transacoes = row_dicts(filter_transacoes(transacao_select().order_by(*ordem), request.args))
+    except ValueError:
+        return jsonify({"success": False, "error": "Formato de data inválido. Use YYYY-MM-DD"}), 400
+    return jsonify({"success": True, "transacoes": transacoes}), 200
 
 # POST route primarily for adjustments and returns (purchases/sales handled elsewhere)
 @transacao_bp.route("/", methods=["POST"])
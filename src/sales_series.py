@@ -0,0 +1,216 @@
+# === sales_series.py ===
+"""Sales time series by day, week or month, with empty buckets filled with zeros.
+
+Buckets and gap filling happen in SQL: on PostgreSQL with date_trunc and generate_series,
+on SQLite (tests, local runs) with date() modifiers and a recursive CTE producing the same
+bucket starts. Weeks start on Monday in both, as with date_trunc('week').
+
+The first and last buckets are labelled with their start even when the requested period
+only covers part of them; only sales inside the period are counted.
+"""
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import String, and_, cast, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import INTERVAL
+
+from src.models import db, ItemVenda, Venda
+from src.models.sale import STATUS_CANCELADO
+from src.utils.product_search import is_postgresql
+
+GRANULARIDADES = ("dia", "semana", "mes")
+COMPARACOES = ("anterior", "ano_anterior")
+MAX_SERIES_BUCKETS = 1000
+SEM_FORMA_PAGAMENTO = "Não informada"
+
+_DATE_TRUNC = {"dia": "day", "semana": "week", "mes": "month"}
+_SQLITE_BUCKET = {"dia": (), "semana": ("weekday 0", "-6 days"), "mes": ("start of month",)}
+_SQLITE_STEP = {"dia": "+1 day", "semana": "+7 days", "mes": "+1 month"}
+
+
+class SeriesError(ValueError):
+    """Invalid series parameters; the message is safe to return to the client."""
+
+
+def bucket_start(dia, granularidade):
+    """Start of the bucket containing dia (a date)."""
+    if granularidade == "semana":
+        return dia - timedelta(days=dia.weekday())
+    if granularidade == "mes":
+        return dia.replace(day=1)
+    return dia
+
+
+def _next_bucket(dia, granularidade):
+    if granularidade == "semana":
+        return dia + timedelta(days=7)
+    if granularidade == "mes":
+        return (dia.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return dia + timedelta(days=1)
+
+
+def count_buckets(inicio, fim, granularidade):
+    atual, fim_bucket, total = bucket_start(inicio, granularidade), bucket_start(fim, granularidade), 0
+    while atual <= fim_bucket and total <= MAX_SERIES_BUCKETS:
+        atual, total = _next_bucket(atual, granularidade), total + 1
+    return total
+
+
+def _bucket(granularidade, postgresql):
+    if postgresql:
+        # Inlined (not a bind parameter) so the SELECT and GROUP BY expressions are identical
+        return func.date_trunc(literal_column(f"'{_DATE_TRUNC[granularidade]}'"), Venda.data_venda)
+    return func.date(Venda.data_venda, *_SQLITE_BUCKET[granularidade])
+
+
+def _periodos(inicio, fim, granularidade, postgresql):
+    """One row per bucket start from inicio's bucket to fim's, as a subquery with column periodo."""
+    primeiro, ultimo = bucket_start(inicio, granularidade), bucket_start(fim, granularidade)
+    if postgresql:
+        passo = cast(literal(f"1 {_DATE_TRUNC[granularidade]}"), INTERVAL)
+        inicio_ts = datetime.combine(primeiro, datetime.min.time())
+        fim_ts = datetime.combine(ultimo, datetime.min.time())
+        return select(func.generate_series(inicio_ts, fim_ts, passo).label("periodo")).subquery("periodos")
+
+    periodos = select(literal(primeiro.isoformat(), String).label("periodo")).cte("periodos", recursive=True)
+    proximo = func.date(periodos.c.periodo, _SQLITE_STEP[granularidade])
+    return periodos.union_all(select(proximo).where(proximo <= ultimo.isoformat()))
+
+
+def _no_periodo(inicio, fim):
+    """Sales counted in the period: cancelled ones returned their stock and are left out."""
+    return and_(
+        Venda.data_venda >= datetime.combine(inicio, datetime.min.time()),
+        Venda.data_venda < datetime.combine(fim + timedelta(days=1), datetime.min.time()),
+        Venda.status != STATUS_CANCELADO
+    )
+
+
+def _label(periodo):
+    if isinstance(periodo, datetime):
+        return periodo.date().isoformat()
+    if isinstance(periodo, date):
+        return periodo.isoformat()
+    return periodo
+
+
+def _totais(serie):
+    vendas = sum(p["vendas"] for p in serie)
+    receita = round(sum(p["receita"] for p in serie), 2)
+    return {
+        "vendas": vendas,
+        "receita": receita,
+        "unidades": sum(p["unidades"] for p in serie),
+        "ticket_medio": round(receita / vendas, 2) if vendas else 0.0,
+    }
+
+
+def sales_series(inicio, fim, granularidade="dia"):
+    """Gap-filled series between inicio and fim (dates, inclusive), with totals and the payment breakdown."""
+    if granularidade not in GRANULARIDADES:
+        raise SeriesError(f"granularidade deve ser um de: {', '.join(GRANULARIDADES)}")
+    if fim < inicio:
+        raise SeriesError("end_date deve ser igual ou posterior a start_date")
+    if count_buckets(inicio, fim, granularidade) > MAX_SERIES_BUCKETS:
+        raise SeriesError(f"Período longo demais para granularidade {granularidade} (máximo {MAX_SERIES_BUCKETS} pontos)")
+
+    postgresql = is_postgresql()
+    bucket = _bucket(granularidade, postgresql).label("periodo")
+    no_periodo = _no_periodo(inicio, fim)
+    periodos = _periodos(inicio, fim, granularidade, postgresql)
+
+    vendas = (
+        select(bucket, func.count(Venda.id).label("vendas"), func.sum(Venda.valor_total).label("receita"))
+        .where(no_periodo)
+        .group_by(bucket)
+        .subquery()
+    )
+    # Units are summed separately so the item join doesn't repeat sale totals
+    itens = (
+        select(bucket, func.sum(ItemVenda.quantidade).label("unidades"))
+        .select_from(ItemVenda)
+        .join(Venda, Venda.id == ItemVenda.venda_id)
+        .where(no_periodo)
+        .group_by(bucket)
+        .subquery()
+    )
+    linhas = db.session.execute(
+        select(
+            periodos.c.periodo,
+            func.coalesce(vendas.c.vendas, 0),
+            func.coalesce(vendas.c.receita, 0),
+            func.coalesce(itens.c.unidades, 0),
+        )
+        .outerjoin(vendas, vendas.c.periodo == periodos.c.periodo)
+        .outerjoin(itens, itens.c.periodo == periodos.c.periodo)
+        .order_by(periodos.c.periodo)
+    ).all()
+
+    pagamentos = {}
+    for periodo, forma_pagamento, quantidade, receita in db.session.execute(
+        select(bucket, Venda.forma_pagamento, func.count(Venda.id), func.sum(Venda.valor_total))
+        .where(no_periodo)
+        .group_by(bucket, Venda.forma_pagamento)
+    ):
+        pagamentos.setdefault(_label(periodo), {})[forma_pagamento or SEM_FORMA_PAGAMENTO] = {
+            "vendas": int(quantidade), "receita": round(float(receita or 0), 2)
+        }
+
+    serie = []
+    for periodo, quantidade, receita, unidades in linhas:
+        chave = _label(periodo)
+        quantidade, receita = int(quantidade), round(float(receita), 2)
+        serie.append({
+            "periodo": chave,
+            "vendas": quantidade,
+            "receita": receita,
+            "unidades": int(unidades),
+            "ticket_medio": round(receita / quantidade, 2) if quantidade else 0.0,
+            "por_forma_pagamento": pagamentos.get(chave, {}),
+        })
+
+    por_forma = {}
+    for formas in pagamentos.values():
+        for forma_pagamento, valores in formas.items():
+            total = por_forma.setdefault(forma_pagamento, {"forma_pagamento": forma_pagamento, "vendas": 0, "receita": 0.0})
+            total["vendas"] += valores["vendas"]
+            total["receita"] = round(total["receita"] + valores["receita"], 2)
+
+    return {
+        "granularidade": granularidade,
+        "inicio": inicio,
+        "fim": fim,
+        "serie": serie,
+        "totais": _totais(serie),
+        "por_forma_pagamento": sorted(por_forma.values(), key=lambda f: f["receita"], reverse=True),
+    }
+
+
+def comparison_period(inicio, fim, comparacao):
+    """(inicio, fim) of the period compared against: the one right before, or a year earlier."""
+    if comparacao == "anterior":
+        duracao = fim - inicio + timedelta(days=1)
+        return inicio - duracao, fim - duracao
+    if comparacao == "ano_anterior":
+        def um_ano_antes(dia):
+            try:
+                return dia.replace(year=dia.year - 1)
+            except ValueError:  # 29 February
+                return dia.replace(year=dia.year - 1, day=28)
+        return um_ano_antes(inicio), um_ano_antes(fim)
+    raise SeriesError(f"comparar deve ser um de: {', '.join(COMPARACOES)}")
+
+
+def _variacao(atual, anterior):
+    return round((atual - anterior) / anterior * 100, 2) if anterior else None
+
+
+def sales_series_comparison(atual, comparacao):
+    """Series for the comparison period of atual (a sales_series() result) and the change in each total."""
+    inicio, fim = comparison_period(atual["inicio"], atual["fim"], comparacao)
+    anterior = sales_series(inicio, fim, atual["granularidade"])
+    anterior["tipo"] = comparacao
+    anterior["variacao_percentual"] = {
+        metrica: _variacao(atual["totais"][metrica], anterior["totais"][metrica])
+        for metrica in ("vendas", "receita", "unidades", "ticket_medio")
+    }
+    return anterior
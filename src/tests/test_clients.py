@@ -0,0 +1,48 @@
+import unittest
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from src.main import create_app
+from src.models import db, Cliente
+
+class ClientSearchTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        return app
+
+    def setUp(self):
+        db.create_all()
+        db.session.add_all([
+            Cliente(nome='Mariana Souza', telefone='11988887777', email='mari@example.com'),
+            Cliente(nome='Ana Maria Lima', telefone='21977776666', email='ana@example.com'),
+            Cliente(nome='Bruno 100%', telefone='31966665555'),
+        ])
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def _search(self, query):
+        response = self.client.get(f'/api/clientes/search?{query}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return [c['nome'] for c in response.json['clientes']]
+
+    def test_prefix_matches_rank_first(self):
+        self.assertEqual(self._search('q=mari'), ['Mariana Souza', 'Ana Maria Lima'])
+
+    def test_search_by_phone_and_limit(self):
+        self.assertEqual(self._search('q=2197'), ['Ana Maria Lima'])
+        self.assertEqual(len(self._search('q=a&limit=1')), 1)
+
+    def test_like_wildcards_are_escaped(self):
+        self.assertEqual(self._search('q=%25'), ['Bruno 100%'])
+        self.assertEqual(self._search('q='), [])
+
+if __name__ == '__main__':
+    unittest.main()
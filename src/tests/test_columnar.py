@@ -0,0 +1,72 @@
+import unittest
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from src.main import create_app
+from src.models import db, Fornecedor, Produto
+from src.utils.columnar import columnar_payload
+
+def decode(payload):
+    dicionarios = payload['dictionaries']
+    return [
+        {
+            coluna: (dicionarios[coluna][payload['data'][coluna][i]]
+                     if coluna in dicionarios and payload['data'][coluna][i] is not None
+                     else payload['data'][coluna][i])
+            for coluna in payload['columns']
+        }
+        for i in range(payload['count'])
+    ]
+
+class ColumnarFormatTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        return app
+
+    def setUp(self):
+        db.create_all()
+        fornecedores = [Fornecedor(nome='Fornecedor A'), Fornecedor(nome='Fornecedor B')]
+        db.session.add_all(fornecedores)
+        db.session.flush()
+        for i in range(6):
+            db.session.add(Produto(nome=f'Body {i}', sexo='F', tamanho=['P', 'M'][i % 2], cor_estampa='Rosa',
+                                   fornecedor_id=fornecedores[i % 2].id, custo=10.0, preco_venda=30.0,
+                                   quantidade_atual=i))
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def test_columnar_matches_row_format(self):
+        for url, chave in (('/api/produtos/', 'produtos'), ('/api/relatorios/estoque/niveis', 'niveis_estoque'),
+                           ('/api/relatorios/estoque/baixo', 'produtos_estoque_baixo')):
+            with self.subTest(url=url):
+                linhas = self.client.get(url, headers=self.headers).json[chave]
+                response = self.client.get(f'{url}?format=columnar', headers=self.headers)
+                payload = response.json[chave]
+                self.assertEqual(payload['format'], 'columnar')
+                self.assertEqual(decode(payload), linhas)
+                # Built from one SQL query, no ORM lazy loads
+                self.assertIn('desc="1 queries"', response.headers['Server-Timing'])
+
+    def test_low_cardinality_columns_are_dictionary_encoded(self):
+        payload = self.client.get('/api/produtos/?format=columnar', headers=self.headers).json['produtos']
+        self.assertEqual(payload['dictionaries']['tamanho'], ['P', 'M'])
+        self.assertEqual(payload['data']['tamanho'], [0, 1, 0, 1, 0, 1])
+        self.assertEqual(payload['dictionaries']['nome_fornecedor'], ['Fornecedor A', 'Fornecedor B'])
+        self.assertEqual(payload['data']['quantidade_atual'], [0, 1, 2, 3, 4, 5])
+
+    def test_empty_and_null_values(self):
+        vazio = columnar_payload(['id', 'tamanho'], [], ('tamanho',))
+        self.assertEqual(vazio['data'], {'id': [], 'tamanho': []})
+        payload = columnar_payload(['id', 'cor'], [(1, None), (2, 'Azul')], ('cor',))
+        self.assertEqual(payload['data']['cor'], [None, 0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import gzip
+import json
+import unittest
+import zlib
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from src.compression import brotli
+from src.main import create_app
+from src.models import db, Fornecedor, Produto
+
+class CompressionTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        app.config['FACETS_CACHE_SECONDS'] = 0
+        return app
+
+    def setUp(self):
+        db.create_all()
+        fornecedor = Fornecedor(nome='Fornecedor Teste')
+        db.session.add(fornecedor)
+        db.session.flush()
+        db.session.add_all([
+            Produto(nome=f'Body manga longa {i}', sexo='F', tamanho='P', cor_estampa='Rosa',
+                    fornecedor_id=fornecedor.id, custo=10.0, preco_venda=30.0, quantidade_atual=5)
+            for i in range(50)
+        ])
+        db.session.commit()
+        self.token = f'Bearer {create_access_token(identity="1")}'
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def _get(self, url, encoding, **headers):
+        return self.client.get(url, headers={'Authorization': self.token, 'Accept-Encoding': encoding, **headers})
+
+    def test_gzip_large_json(self):
+        plain = self._get('/api/produtos/', 'identity')
+        self.assertNotIn('Content-Encoding', plain.headers)
+
+        response = self._get('/api/produtos/', 'gzip')
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        corpo = gzip.decompress(response.get_data())
+        self.assertEqual(json.loads(corpo), plain.json)
+        self.assertLess(len(response.get_data()), len(corpo) / 4)
+
+    @unittest.skipIf(brotli is None, 'brotli not installed')
+    def test_brotli_preferred_when_accepted(self):
+        response = self._get('/api/produtos/', 'gzip, deflate, br')
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+        self.assertEqual(len(json.loads(brotli.decompress(response.get_data()))['produtos']), 50)
+
+    def test_small_bodies_are_not_compressed(self):
+        response = self._get('/api/produtos/999999', 'gzip')
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_streamed_response_is_compressed_incrementally(self):
+        response = self._get('/api/relatorios/estoque/niveis?format=ndjson', 'gzip')
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', response.headers)
+        linhas = gzip.decompress(response.get_data()).decode().splitlines()
+        self.assertEqual(len(linhas), 50)
+
+        # Each chunk is flushed, so the first one decodes on its own
+        response = self._get('/api/relatorios/estoque/niveis?format=ndjson', 'gzip')
+        primeiro = next(iter(response.response))
+        parcial = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(primeiro)
+        self.assertTrue(parcial.startswith(b'{'))
+        response.close()
+
+    def test_etag_becomes_weak_and_still_validates(self):
+        self.app.config['COMPRESS_MIN_SIZE'] = 0
+        response = self._get('/api/fields/facets', 'gzip')
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        revalidado = self._get('/api/fields/facets', 'gzip', **{'If-None-Match': etag})
+        self.assertEqual(revalidado.status_code, 304)
+
+if __name__ == '__main__':
+    unittest.main()
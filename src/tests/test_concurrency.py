@@ -0,0 +1,38 @@
+import os
+import unittest
+from unittest import mock
+from src import concurrency
+
+try:
+    import gevent
+    import psycogreen
+except ImportError:
+    gevent = psycogreen = None
+
+class ServingModeTest(unittest.TestCase):
+    @unittest.skipIf(gevent is None or psycogreen is None, 'gevent/psycogreen not installed')
+    def test_sync_is_default_and_patches_nothing(self):
+        with mock.patch.dict(os.environ, {}, clear=False):
+            os.environ.pop('SERVING_MODE', None)
+            with mock.patch('gevent.monkey.patch_all') as patch_all:
+                self.assertEqual(concurrency.patch_for_serving_mode(), 'sync')
+            patch_all.assert_not_called()
+
+    def test_unknown_mode_is_rejected(self):
+        with mock.patch.dict(os.environ, {'SERVING_MODE': 'eventlet'}):
+            with self.assertRaises(RuntimeError):
+                concurrency.serving_mode()
+
+    @unittest.skipIf(gevent is None or psycogreen is None, 'gevent/psycogreen not installed')
+    def test_gevent_mode_patches_sockets_and_psycopg2_once(self):
+        with mock.patch.dict(os.environ, {'SERVING_MODE': 'gevent'}), \
+             mock.patch.object(concurrency, '_patched_mode', None), \
+             mock.patch('gevent.monkey.patch_all') as patch_all, \
+             mock.patch('psycogreen.gevent.patch_psycopg') as patch_psycopg:
+            self.assertEqual(concurrency.patch_for_serving_mode(), 'gevent')
+            concurrency.patch_for_serving_mode()
+        patch_all.assert_called_once()
+        patch_psycopg.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+from datetime import datetime, timedelta
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from sqlalchemy import update
+from src.main import create_app
+from src.models import db, DashboardInvalidacao, DashboardSnapshot, Fornecedor, Produto, Venda, ItemVenda
+from src.models.sale import STATUS_PAGAMENTO_PENDENTE
+from src.dashboard import CHAVE_DASHBOARD
+
+class DashboardTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        app.config['DASHBOARD_MIN_REFRESH_SECONDS'] = 0
+        return app
+
+    def setUp(self):
+        db.create_all()
+        fornecedor = Fornecedor(nome='Fornecedor A')
+        db.session.add(fornecedor)
+        db.session.flush()
+        # Family "Body P Rosa": 2 units left, threshold 5 -> low stock; "Macacão" has 20
+        self.produtos = [
+            Produto(nome='Body', sexo='F', tamanho='P', cor_estampa='Rosa', fornecedor_id=fornecedor.id,
+                    custo=10.0, preco_venda=30.0, quantidade_atual=1, limite_reabastecimento=5),
+            Produto(nome='Body', sexo='F', tamanho='P', cor_estampa='Rosa', fornecedor_id=fornecedor.id,
+                    custo=10.0, preco_venda=30.0, quantidade_atual=1, limite_reabastecimento=5),
+            Produto(nome='Macacão', sexo='M', tamanho='M', cor_estampa='Azul', fornecedor_id=fornecedor.id,
+                    custo=20.0, preco_venda=50.0, quantidade_atual=20, limite_reabastecimento=5),
+        ]
+        db.session.add_all(self.produtos)
+        db.session.flush()
+        agora = datetime.utcnow()
+        self._venda(agora, self.produtos[2], 2, 'Pago')
+        self._venda(agora, self.produtos[0], 1, STATUS_PAGAMENTO_PENDENTE)
+        # Before this month: only counts towards top sellers when within 30 days
+        self._venda(agora.replace(day=1) - timedelta(days=40), self.produtos[1], 5, 'Pago')
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def _venda(self, data, produto, quantidade, status):
+        venda = Venda(cliente_nome='Ana', data_venda=data, status=status,
+                      valor_total=produto.preco_venda * quantidade)
+        venda.itens.append(ItemVenda(produto_id=produto.id, quantidade=quantidade,
+                                     preco_unitario=produto.preco_venda, custo_unitario=produto.custo))
+        db.session.add(venda)
+        return venda
+
+    def _invalidacoes(self):
+        db.session.expire_all()
+        return DashboardInvalidacao.query.count()
+
+    def test_dashboard_contents(self):
+        response = self.client.get('/api/dashboard/', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        dados = response.json['dashboard']
+        self.assertEqual(dados['vendas_hoje'], {'quantidade': 2, 'valor_total': 130.0})
+        self.assertEqual(dados['mes_atual']['receita'], 130.0)
+        self.assertEqual(dados['mes_atual']['custo'], 50.0)
+        self.assertEqual(dados['mes_atual']['margem'], 80.0)
+        self.assertEqual(dados['recebiveis_pendentes'], {'quantidade': 1, 'valor_total': 30.0})
+        self.assertEqual(dados['familias_estoque_baixo'], 1)
+        self.assertEqual(
+            [(m['nome'], m['unidades'], m['receita']) for m in dados['mais_vendidos']],
+            [('Macacão', 2, 100.0), ('Body', 1, 30.0)]
+        )
+
+    def test_cancelled_sale_leaves_the_dashboard(self):
+        self.client.get('/api/dashboard/', headers=self.headers)
+        venda = Venda.query.filter_by(status='Pago').order_by(Venda.id).first()
+        response = self.client.post('/api/vendas/batch/cancel', headers=self.headers,
+                                    json={'venda_ids': [venda.id]})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self._invalidacoes())
+
+        dados = self.client.get('/api/dashboard/', headers=self.headers).json['dashboard']
+        self.assertEqual(dados['vendas_hoje'], {'quantidade': 1, 'valor_total': 30.0})
+        self.assertEqual(dados['mes_atual']['receita'], 30.0)
+        self.assertEqual(dados['mes_atual']['unidades'], 1)
+        self.assertEqual(dados['mes_atual']['custo'], 10.0)
+        self.assertEqual(dados['mes_atual']['margem'], 20.0)
+        self.assertEqual([(m['nome'], m['unidades']) for m in dados['mais_vendidos']], [('Body', 1)])
+
+    def test_served_from_snapshot_until_invalidated(self):
+        primeira = self.client.get('/api/dashboard/', headers=self.headers)
+        segunda = self.client.get('/api/dashboard/', headers=self.headers)
+        self.assertEqual(segunda.json['gerado_em'], primeira.json['gerado_em'])
+        self.assertIn('desc="1 queries"', segunda.headers['Server-Timing'])
+
+        self._venda(datetime.utcnow(), self.produtos[2], 1, 'Pago')
+        db.session.commit()
+        self.assertTrue(self._invalidacoes())
+
+        terceira = self.client.get('/api/dashboard/', headers=self.headers)
+        self.assertFalse(terceira.json['desatualizado'])
+        self.assertEqual(terceira.json['dashboard']['vendas_hoje']['quantidade'], 3)
+
+    def test_each_write_appends_and_a_recompute_consumes(self):
+        primeira = self.client.get('/api/dashboard/', headers=self.headers).json
+        gerado_em = db.session.get(DashboardSnapshot, CHAVE_DASHBOARD).gerado_em
+        for _ in range(2):
+            self._venda(datetime.utcnow(), self.produtos[2], 1, 'Pago')
+            db.session.commit()
+        self.assertEqual(self._invalidacoes(), 2)
+        # Writes never touch the snapshot row itself
+        self.assertEqual(db.session.get(DashboardSnapshot, CHAVE_DASHBOARD).gerado_em, gerado_em)
+
+        response = self.client.get('/api/dashboard/', headers=self.headers)
+        self.assertTrue(response.json['desatualizado'] is False)
+        self.assertNotEqual(response.json['gerado_em'], primeira['gerado_em'])
+        self.assertEqual(response.json['dashboard']['vendas_hoje']['quantidade'], 4)
+        self.assertEqual(self._invalidacoes(), 0)
+
+    def test_bulk_update_invalidates(self):
+        self.client.get('/api/dashboard/', headers=self.headers)
+        db.session.execute(update(Venda).where(Venda.status == STATUS_PAGAMENTO_PENDENTE).values(status='Pago'))
+        db.session.commit()
+        self.assertTrue(self._invalidacoes())
+
+    def test_rolled_back_write_keeps_snapshot(self):
+        self.client.get('/api/dashboard/', headers=self.headers)
+        self._venda(datetime.utcnow(), self.produtos[2], 1, 'Pago')
+        db.session.flush()
+        db.session.rollback()
+        db.session.commit()
+        self.assertFalse(self._invalidacoes())
+
+    def test_unrelated_write_keeps_snapshot(self):
+        self.client.get('/api/dashboard/', headers=self.headers)
+        db.session.add(Fornecedor(nome='Fornecedor B'))
+        db.session.commit()
+        self.assertFalse(self._invalidacoes())
+
+    def test_requires_auth(self):
+        self.assertEqual(self.client.get('/api/dashboard/').status_code, 401)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import unittest
+from unittest import mock
+from flask import g
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from src.config import _engine_options, _parse_timeouts
+from src.database import _apply_statement_timeout, _replica_status_cache
+from src.main import create_app
+from src.models import db
+
+class DatabaseSettingsTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        return app
+
+    def test_engine_options_from_env(self):
+        self.assertEqual(_engine_options('sqlite:///:memory:'), {})
+
+        with mock.patch.dict(os.environ, {'DB_POOL_SIZE': '20', 'DB_POOL_RECYCLE': '300'}):
+            options = _engine_options('postgresql://db/tutto')
+        self.assertEqual(options['pool_size'], 20)
+        self.assertEqual(options['pool_recycle'], 300)
+        self.assertTrue(options['pool_pre_ping'])
+
+        with mock.patch.dict(os.environ, {'DB_PGBOUNCER': 'true'}):
+            options = _engine_options('postgresql://db/tutto')
+        self.assertIs(options['poolclass'], NullPool)
+        self.assertNotIn('pool_size', options)
+
+    def test_parse_timeouts(self):
+        self.assertEqual(_parse_timeouts('report_bp=60000, alerta_bp=30000'),
+                         {'report_bp': 60000, 'alerta_bp': 30000})
+        self.assertEqual(_parse_timeouts(''), {})
+
+    def test_exports_get_the_report_timeout(self):
+        headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+        for path in ('/api/relatorios/estoque/niveis', '/api/exportacoes/produtos'):
+            with self.app.test_request_context(path, headers=headers):
+                self.app.preprocess_request()
+                self.assertEqual(g.statement_timeout_ms, 60000)
+        with self.app.test_request_context('/api/vendas/', headers=headers):
+            self.app.preprocess_request()
+            self.assertEqual(g.statement_timeout_ms, self.app.config['STATEMENT_TIMEOUT_MS'])
+
+    def test_statement_timeout_is_set_locally_on_postgresql_only(self):
+        connection = mock.Mock()
+        with self.app.test_request_context('/api/relatorios/estoque/niveis'):
+            g.statement_timeout_ms = 60000
+            connection.dialect.name = 'sqlite'
+            _apply_statement_timeout(None, None, connection)
+            connection.exec_driver_sql.assert_not_called()
+
+            connection.dialect.name = 'postgresql'
+            _apply_statement_timeout(None, None, connection)
+            connection.exec_driver_sql.assert_called_once_with('SET LOCAL statement_timeout = 60000')
+
+    def _with_replica(self):
+        replica = create_engine('sqlite://')
+        self.addCleanup(db.engines.pop, 'replica', None)
+        self.addCleanup(_replica_status_cache.clear)
+        db.engines['replica'] = replica
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+        return replica
+
+    def test_reads_on_designated_routes_use_replica(self):
+        replica = self._with_replica()
+        with self.app.test_request_context('/api/relatorios/estoque/niveis', method='GET', headers=self.headers):
+            self.app.preprocess_request()
+            self.assertIs(db.session.get_bind(), replica)
+        db.session.remove()
+
+        with self.app.test_request_context('/api/relatorios/estoque/niveis', method='POST', headers=self.headers):
+            self.app.preprocess_request()
+            self.assertIsNot(db.session.get_bind(), replica)
+        db.session.remove()
+
+        with self.app.test_request_context('/api/produtos/', method='GET'):
+            g.use_replica = False
+            self.assertIsNot(db.session.get_bind(), replica)
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        replica = self._with_replica()
+        with mock.patch('src.database._replica_lag_seconds', return_value=120.0):
+            with self.app.test_request_context('/api/relatorios/estoque/niveis', method='GET', headers=self.headers):
+                self.app.preprocess_request()
+                self.assertIsNot(db.session.get_bind(), replica)
+        db.session.remove()
+
+if __name__ == '__main__':
+    unittest.main()
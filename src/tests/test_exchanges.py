@@ -0,0 +1,108 @@
+import unittest
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from src.main import create_app
+from src.models import db, Fornecedor, Produto, Venda, ItemVenda, TransacaoEstoque, ItemTroca
+
+class ExchangeTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        return app
+
+    def setUp(self):
+        db.create_all()
+        fornecedor = Fornecedor(nome='Fornecedor Teste')
+        db.session.add(fornecedor)
+        db.session.flush()
+
+        def produto(nome, quantidade):
+            return Produto(nome=nome, sexo='F', tamanho='P', cor_estampa='Rosa',
+                           fornecedor_id=fornecedor.id, custo=10.0, preco_venda=30.0,
+                           quantidade_atual=quantidade)
+
+        self.vendido = produto('Body', 0)
+        self.novo = produto('Macacão', 1)
+        self.outro = produto('Vestido', 1)
+        db.session.add_all([self.vendido, self.novo, self.outro])
+        db.session.flush()
+
+        self.venda = Venda(cliente_nome='Maria', cliente_sobrenome='Silva', valor_total=30.0, status='Pago')
+        db.session.add(self.venda)
+        db.session.flush()
+        db.session.add(ItemVenda(venda_id=self.venda.id, produto_id=self.vendido.id,
+                                 quantidade=1, preco_unitario=30.0, custo_unitario=10.0))
+        db.session.commit()
+
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def _post_troca(self, devolvidos, novos):
+        return self.client.post('/api/trocas/', headers=self.headers, json={
+            'venda_original_id': self.venda.id,
+            'cliente_nome': 'Maria',
+            'cliente_sobrenome': 'Silva',
+            'produtos_devolvidos': [{'produto_id': pid} for pid in devolvidos],
+            'produtos_novos': [{'produto_id': pid} for pid in novos],
+        })
+
+    def test_create_troca_flips_stock_and_records_transactions(self):
+        vendido_id, novo_id, outro_id = self.vendido.id, self.novo.id, self.outro.id
+        response = self._post_troca([vendido_id], [novo_id, outro_id])
+        self.assertEqual(response.status_code, 201)
+
+        troca = response.json['troca']
+        self.assertEqual(troca['valor_produtos_devolvidos'], 30.0)
+        self.assertEqual(troca['valor_produtos_novos'], 60.0)
+        self.assertEqual(len(troca['itens']), 3)
+        self.assertEqual(response.json['venda']['status'], 'Pagamento Pendente')
+        self.assertEqual(len(response.json['venda']['produtos']), 2)
+
+        self.assertEqual(db.session.get(Produto, vendido_id).quantidade_atual, 1)
+        self.assertEqual(db.session.get(Produto, novo_id).quantidade_atual, 0)
+        self.assertEqual(db.session.get(Produto, outro_id).quantidade_atual, 0)
+
+        transacoes = TransacaoEstoque.query.filter_by(troca_id=troca['id']).all()
+        self.assertEqual(sorted(t.tipo_transacao for t in transacoes),
+                         ['troca_devolucao', 'troca_saida', 'troca_saida'])
+        self.assertEqual(ItemTroca.query.filter_by(troca_id=troca['id']).count(), 3)
+
+    def test_create_troca_rejects_product_not_in_original_sale(self):
+        response = self._post_troca([self.outro.id], [self.novo.id])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(TransacaoEstoque.query.count(), 0)
+
+    def test_create_troca_rejects_out_of_stock_product(self):
+        response = self._post_troca([self.vendido.id], [self.vendido.id])
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_all_trocas_paginates_and_filters(self):
+        self._post_troca([self.vendido.id], [self.novo.id])
+
+        response = self.client.get('/api/trocas/?per_page=1&compact=true', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['pagination']['total'], 1)
+        item = response.json['trocas'][0]['itens'][0]
+        self.assertNotIn('nome_fornecedor', item['produto'])
+
+        response = self.client.get('/api/trocas/?venda_original_id=999', headers=self.headers)
+        self.assertEqual(response.json['trocas'], [])
+
+        response = self.client.get('/api/trocas/?cliente=silv', headers=self.headers)
+        self.assertEqual(len(response.json['trocas']), 1)
+        self.assertEqual(response.json['trocas'][0]['itens'][0]['produto']['nome_fornecedor'], 'Fornecedor Teste')
+
+        # LIKE wildcards in the filter are matched literally
+        for termo in ('%25', '_'):
+            response = self.client.get(f'/api/trocas/?cliente={termo}', headers=self.headers)
+            self.assertEqual(response.json['trocas'], [])
+
+if __name__ == '__main__':
+    unittest.main()
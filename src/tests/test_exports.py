@@ -0,0 +1,154 @@
+import csv
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+import zipfile
+from datetime import datetime
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from src.exports import _save_job
+from src.main import create_app
+from src.models import db, Cliente, Fornecedor, Produto, Venda, ItemVenda, TransacaoEstoque
+
+class ExportTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        self.export_dir = tempfile.mkdtemp()
+        app.config['EXPORT_DIR'] = self.export_dir
+        return app
+
+    def setUp(self):
+        db.create_all()
+        fornecedor = Fornecedor(nome='Fornecedor Teste')
+        db.session.add(fornecedor)
+        db.session.flush()
+        self.produtos = [
+            Produto(nome=nome, sku=sku, sexo='F', tamanho=tamanho, cor_estampa='Rosa', fornecedor_id=fornecedor.id,
+                    custo=10.0, preco_venda=30.0, quantidade_atual=quantidade)
+            for nome, sku, tamanho, quantidade in (('Body', 'BOD-1', 'P', 6), ('Macacão', 'MAC-1', 'M', 0),
+                                                    ('Vestido', 'VES-1', 'P', 2))
+        ]
+        db.session.add_all(self.produtos)
+        cliente = Cliente(nome='Ana Souza')
+        db.session.add(cliente)
+        db.session.flush()
+        for dia, produtos in ((datetime(2026, 1, 10, 10), self.produtos[:2]), (datetime(2026, 2, 10, 10), self.produtos[2:])):
+            venda = Venda(cliente_id=cliente.id, cliente_nome='Ana', valor_total=30.0 * len(produtos), data_venda=dia)
+            for produto in produtos:
+                venda.itens.append(ItemVenda(produto_id=produto.id, quantidade=1, preco_unitario=30.0, custo_unitario=10.0))
+                db.session.add(TransacaoEstoque(produto_id=produto.id, tipo_transacao='venda', quantidade=-1,
+                                                data_transacao=dia))
+            db.session.add(venda)
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        shutil.rmtree(self.export_dir, ignore_errors=True)
+
+    def _csv(self, response):
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        self.assertEqual(response.mimetype, 'text/csv')
+        self.assertIn('attachment;', response.headers['Content-Disposition'])
+        return list(csv.DictReader(io.StringIO(response.get_data(as_text=True).lstrip('\ufeff'))))
+
+    def test_products_csv_uses_catalog_filters(self):
+        linhas = self._csv(self.client.get('/api/exportacoes/produtos?tamanho=P&em_estoque=true', headers=self.headers))
+        self.assertEqual([l['sku'] for l in linhas], ['BOD-1', 'VES-1'])
+        self.assertEqual(linhas[0]['nome_fornecedor'], 'Fornecedor Teste')
+
+    def test_sales_csv_has_one_row_per_item_and_date_filters(self):
+        linhas = self._csv(self.client.get('/api/exportacoes/vendas?end_date=2026-01-31', headers=self.headers))
+        self.assertEqual(sorted(l['sku'] for l in linhas), ['BOD-1', 'MAC-1'])
+        self.assertEqual(linhas[0]['data_venda'], '2026-01-10 10:00:00')
+
+        transacoes = self._csv(self.client.get('/api/exportacoes/transacoes?start_date=2026-02-01', headers=self.headers))
+        self.assertEqual([t['sku'] for t in transacoes], ['VES-1'])
+
+    def test_report_exports(self):
+        sumario = self._csv(self.client.get(
+            '/api/exportacoes/vendas_sumario?start_date=2026-01-01&end_date=2026-03-01', headers=self.headers
+        ))
+        self.assertEqual(sumario[0]['quantidade_itens'], '3')
+        self.assertEqual(float(sumario[0]['total_vendas']), 90.0)
+        clientes = self._csv(self.client.get('/api/exportacoes/clientes_sumario', headers=self.headers))
+        self.assertEqual(clientes, [{'nome_cliente': 'Ana Souza', 'numero_compras': '2', 'total_gasto': '90.0'}])
+        baixo = self._csv(self.client.get('/api/exportacoes/estoque_baixo', headers=self.headers))
+        self.assertEqual([l['sku'] for l in baixo], ['MAC-1', 'VES-1'])
+
+    def test_xlsx_export(self):
+        response = self.client.get('/api/exportacoes/produtos?formato=xlsx', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        with zipfile.ZipFile(io.BytesIO(response.get_data())) as xlsx:
+            conteudo = ''.join(xlsx.read(n).decode('utf-8') for n in xlsx.namelist() if n.startswith('xl/'))
+        self.assertIn('MAC-1', conteudo)
+        response.close()
+
+    def test_formulas_are_exported_as_text(self):
+        self.produtos[0].nome = '=HYPERLINK("http://x","y")'
+        self.produtos[0].cor_estampa = '@SOMA(1)'
+        self.produtos[1].nome = '-2+3'
+        self.produtos[2].nome = '\t=1'
+        db.session.commit()
+        linhas = self._csv(self.client.get('/api/exportacoes/produtos', headers=self.headers))
+        self.assertEqual(sorted(l['nome'] for l in linhas), ["'\t=1", "'-2+3", '\'=HYPERLINK("http://x","y")'])
+        self.assertIn("'@SOMA(1)", [l['cor_estampa'] for l in linhas])
+        # Numbers keep their sign
+        self.assertEqual({l['custo'] for l in linhas}, {'10.0'})
+
+        response = self.client.get('/api/exportacoes/produtos?formato=xlsx', headers=self.headers)
+        with zipfile.ZipFile(io.BytesIO(response.get_data())) as xlsx:
+            planilha = xlsx.read('xl/worksheets/sheet1.xml').decode('utf-8')
+        self.assertNotIn('<f>', planilha)
+        self.assertIn('=HYPERLINK', planilha)
+        response.close()
+
+    def test_invalid_requests(self):
+        for url in ('/api/exportacoes/senhas', '/api/exportacoes/produtos?formato=pdf',
+                    '/api/exportacoes/vendas?start_date=10/01/2026'):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url, headers=self.headers).status_code, 400)
+
+    def test_background_job(self):
+        response = self.client.post('/api/exportacoes/vendas/jobs?start_date=2026-02-01', headers=self.headers)
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json['job']['id']
+
+        deadline = time.monotonic() + 10
+        while True:
+            job = self.client.get(f'/api/exportacoes/jobs/{job_id}', headers=self.headers).json['job']
+            if job['status'] in ('concluido', 'erro') or time.monotonic() > deadline:
+                break
+            time.sleep(0.05)
+        self.assertEqual(job['status'], 'concluido', job)
+
+        linhas = self._csv(self.client.get(f'/api/exportacoes/jobs/{job_id}/download', headers=self.headers))
+        self.assertEqual([l['sku'] for l in linhas], ['VES-1'])
+        self.assertEqual(self.client.get('/api/exportacoes/jobs/../../etc', headers=self.headers).status_code, 404)
+
+    def test_job_of_an_exited_worker_is_reported_as_failed(self):
+        processo = subprocess.Popen([sys.executable, '-c', ''])
+        processo.wait()
+        for job_id, pid in (('a' * 32, processo.pid), ('b' * 32, os.getpid())):
+            _save_job(self.app, {'id': job_id, 'nome': 'vendas', 'formato': 'csv', 'filtros': {},
+                                 'status': 'processando', 'criado_em': '2026-01-01T00:00:00', 'pid': pid})
+
+        job = self.client.get(f'/api/exportacoes/jobs/{"a" * 32}', headers=self.headers).json['job']
+        self.assertEqual(job['status'], 'erro')
+        self.assertIn('interrompida', job['erro'])
+        job = self.client.get(f'/api/exportacoes/jobs/{"b" * 32}', headers=self.headers).json['job']
+        self.assertEqual(job['status'], 'processando')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from unittest import mock
+from flask_testing import TestCase
+from src.main import create_app
+from src.models import db
+
+class HealthTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        app.config['READINESS_CACHE_SECONDS'] = 0
+        return app
+
+    def setUp(self):
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def test_liveness_does_not_touch_database(self):
+        with mock.patch('src.health.check_readiness') as check:
+            self.assertEqual(self.client.get('/health').status_code, 200)
+            self.assertEqual(self.client.get('/health/live').status_code, 200)
+        check.assert_not_called()
+
+    def test_readiness_reports_database_and_migrations(self):
+        response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json['database']['ok'])
+        self.assertIsNone(response.json['migrations']['current'])
+        self.assertIsNotNone(response.json['migrations']['head'])
+
+        self.app.config['READINESS_REQUIRE_MIGRATIONS'] = True
+        self.assertEqual(self.client.get('/health/ready').status_code, 503)
+
+    def test_readiness_fails_when_database_is_unreachable(self):
+        erro = Exception('could not connect to server at "db.internal" (10.0.0.5)')
+        with mock.patch('src.health._check_database', side_effect=erro), \
+                self.assertLogs(self.app.logger, level='WARNING') as logs:
+            response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json['status'], 'unavailable')
+        self.assertEqual(response.json['database'], {'ok': False, 'error': 'erro'})
+        self.assertNotIn('db.internal', response.get_data(as_text=True))
+        self.assertIn('db.internal', '\n'.join(logs.output))
+
+if __name__ == '__main__':
+    unittest.main()
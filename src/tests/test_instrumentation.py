@@ -0,0 +1,70 @@
+import unittest
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from sqlalchemy.exc import OperationalError
+from src.instrumentation import _QUERY_START_KEY
+from src.main import create_app
+from src.models import db, Fornecedor, Produto
+
+class InstrumentationTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        app.config['N_PLUS_ONE_THRESHOLD'] = 2
+        app.config['SLOW_QUERY_MS'] = 0
+
+        @app.route('/_teste/n_mais_um')
+        def n_mais_um():
+            # Lazy-loads each product's fornecedor
+            return {'fornecedores': [p.fornecedor.nome for p in Produto.query.all()]}
+        return app
+
+    def setUp(self):
+        db.create_all()
+        for i in range(3):
+            fornecedor = Fornecedor(nome=f'Fornecedor {i}')
+            db.session.add(fornecedor)
+            db.session.flush()
+            db.session.add(Produto(nome=f'Body {i}', sexo='F', tamanho='P', cor_estampa='Rosa',
+                                   fornecedor_id=fornecedor.id, custo=10.0, preco_venda=30.0,
+                                   quantidade_atual=1))
+        db.session.commit()
+        db.session.remove()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def test_server_timing_header_reports_queries(self):
+        response = self.client.get('/health')
+        self.assertIn('app;dur=', response.headers['Server-Timing'])
+        self.assertIn('desc="0 queries"', response.headers['Server-Timing'])
+
+    def test_repeated_statement_is_flagged_as_n_plus_one(self):
+        with self.assertLogs(self.app.logger, level='WARNING') as logs:
+            response = self.client.get('/_teste/n_mais_um')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('desc="4 queries"', response.headers['Server-Timing'])
+        self.assertTrue(any('Possible N+1 on GET /_teste/n_mais_um' in line for line in logs.output))
+
+    def test_slow_query_log_includes_route(self):
+        self.app.config['SLOW_QUERY_MS'] = 0.000001
+        with self.assertLogs(self.app.logger, level='WARNING') as logs:
+            self.client.get('/api/produtos/', headers=self.headers)
+        self.assertTrue(any('Slow query' in line and 'GET /api/produtos/' in line for line in logs.output))
+
+    def test_failed_statement_is_not_left_on_the_timing_stack(self):
+        with db.engine.connect() as conn:
+            with self.assertRaises(OperationalError):
+                conn.exec_driver_sql('SELECT * FROM tabela_inexistente')
+            self.assertEqual(conn.info[_QUERY_START_KEY], [])
+            conn.exec_driver_sql('SELECT 1')
+            self.assertEqual(conn.info[_QUERY_START_KEY], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+from flask import jsonify
+from flask_testing import TestCase
+from src.json_provider import IsoJSONProvider, OrjsonProvider, json_provider_class, orjson
+from src.main import create_app
+
+PAYLOAD = {
+    "data_venda": datetime(2025, 3, 4, 10, 30, 15, 123456),
+    "data_compra": date(2025, 3, 1),
+    "valor": Decimal("10.50"),
+    "itens": [{"id": 1, "nome": "Body Ação"}],
+}
+
+EXPECTED = {
+    "data_venda": "2025-03-04T10:30:15.123456",
+    "data_compra": "2025-03-01",
+    "valor": "10.50",
+    "itens": [{"id": 1, "nome": "Body Ação"}],
+}
+
+class JSONProviderTest(TestCase):
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        return app
+
+    def test_providers_serialize_dates_as_iso_8601(self):
+        providers = [IsoJSONProvider(self.app)]
+        if orjson is not None:
+            providers.append(OrjsonProvider(self.app))
+        for provider in providers:
+            with self.subTest(provider=type(provider).__name__):
+                self.assertEqual(provider.loads(provider.dumps(PAYLOAD)), EXPECTED)
+                self.assertEqual(provider.loads(provider.response(PAYLOAD).get_data()), EXPECTED)
+
+    def test_jsonify_uses_configured_provider(self):
+        expected = OrjsonProvider if orjson is not None else IsoJSONProvider
+        self.assertIsInstance(self.app.json, expected)
+        self.assertEqual(jsonify(PAYLOAD).get_json(), EXPECTED)
+
+    def test_provider_selection(self):
+        self.assertIs(json_provider_class("stdlib"), IsoJSONProvider)
+        with self.assertRaises(RuntimeError):
+            json_provider_class("ujson")
+
+if __name__ == '__main__':
+    unittest.main()
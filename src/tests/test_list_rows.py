@@ -0,0 +1,79 @@
+import json
+import unittest
+from datetime import datetime, timedelta
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from src.main import create_app
+from src.models import db, Cliente, Fornecedor, Produto, Venda, ItemVenda, TransacaoEstoque
+
+class ListRowsParityTest(TestCase):
+    """The SQL-row read path must return exactly what to_dict() did."""
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        return app
+
+    def setUp(self):
+        db.create_all()
+        fornecedores = [Fornecedor(nome='Fornecedor A'), Fornecedor(nome='Fornecedor B', is_active=False)]
+        clientes = [Cliente(nome='Ana', telefone='11 99999-0000'), Cliente(nome='Bia')]
+        db.session.add_all(fornecedores + clientes)
+        db.session.flush()
+        produtos = [
+            Produto(nome=f'Body {i}', sku=f'SKU-{i}', sexo='F', tamanho='P', cor_estampa='Rosa',
+                    fornecedor_id=fornecedores[i % 2].id, custo=10.0, preco_venda=30.0, quantidade_atual=i,
+                    data_compra=datetime(2026, 1, 1).date())
+            for i in range(4)
+        ]
+        db.session.add_all(produtos)
+        db.session.flush()
+        inicio = datetime(2026, 1, 1, 9)
+        for i in range(3):
+            venda = Venda(cliente_id=clientes[0].id, cliente_nome='Ana', valor_total=30.0 + i,
+                          data_venda=inicio + timedelta(days=i), status='Pago', data_pagamento=inicio)
+            for produto in produtos[i:i + 2]:
+                venda.itens.append(ItemVenda(produto_id=produto.id, quantidade=1, preco_unitario=30.0, custo_unitario=10.0))
+                db.session.add(TransacaoEstoque(produto_id=produto.id, tipo_transacao='venda', quantidade=-1,
+                                                data_transacao=inicio + timedelta(days=i), custo_unitario_transacao=10.0))
+            db.session.add(venda)
+        # A sale without items
+        db.session.add(Venda(cliente_nome='Avulso', valor_total=0, data_venda=inicio + timedelta(days=10)))
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def _as_json(self, objetos):
+        return json.loads(self.app.json.dumps([o.to_dict() for o in objetos]))
+
+    def test_list_endpoints_match_to_dict(self):
+        casos = [
+            ('/api/produtos/', 'produtos', Produto.query.order_by(Produto.id)),
+            ('/api/relatorios/estoque/niveis', 'niveis_estoque', Produto.query.order_by(Produto.nome, Produto.id)),
+            ('/api/vendas/', 'vendas', Venda.query.order_by(Venda.data_venda.desc(), Venda.id.desc())),
+            ('/api/vendas/?start_date=2026-01-02', 'vendas',
+             Venda.query.filter(Venda.data_venda >= datetime(2026, 1, 2)).order_by(Venda.data_venda.desc())),
+            ('/api/transacoes/', 'transacoes',
+             TransacaoEstoque.query.order_by(TransacaoEstoque.data_transacao.desc(), TransacaoEstoque.id.desc())),
+            ('/api/clientes/', 'clientes', Cliente.query.order_by(Cliente.nome)),
+            ('/api/fornecedores/', 'fornecedores', Fornecedor.query.filter_by(is_active=True).order_by(Fornecedor.nome)),
+            ('/api/fornecedores/?include_inactive=true', 'fornecedores', Fornecedor.query.order_by(Fornecedor.nome)),
+        ]
+        for url, chave, query in casos:
+            with self.subTest(url=url):
+                response = self.client.get(url, headers=self.headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json[chave], self._as_json(query.all()))
+
+    def test_sales_list_uses_two_queries(self):
+        response = self.client.get('/api/vendas/', headers=self.headers)
+        self.assertIn('desc="2 queries"', response.headers['Server-Timing'])
+
+if __name__ == '__main__':
+    unittest.main()
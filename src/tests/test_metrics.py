@@ -0,0 +1,47 @@
+import unittest
+from flask_testing import TestCase
+from src.main import create_app
+from src.models import db
+
+class MetricsTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        return app
+
+    def setUp(self):
+        db.create_all()
+
+    def tearDown(self):
+        self.app.config.update(METRICS_AUTH_TOKEN='', METRICS_ALLOW_UNAUTHENTICATED=False, TESTING=True)
+        db.session.remove()
+        db.drop_all()
+
+    def test_metrics_exposes_request_counters(self):
+        self.client.get('/health')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        body = response.get_data(as_text=True)
+        self.assertIn('http_requests_total{blueprint="app",endpoint="health_check",method="GET",status="200"}', body)
+        self.assertIn('http_request_duration_seconds_bucket{blueprint="app",endpoint="health_check"', body)
+        self.assertIn('vendas_criadas_total', body)
+
+    def test_metrics_token_is_enforced(self):
+        self.app.config['METRICS_AUTH_TOKEN'] = 's3cret'
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer s3cret'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_metrics_require_token_outside_testing(self):
+        self.app.config['TESTING'] = False
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+        self.app.config['METRICS_ALLOW_UNAUTHENTICATED'] = True
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from sqlalchemy.dialects import postgresql
+from werkzeug.datastructures import MultiDict
+from src.main import create_app
+from src.models import db, Fornecedor, Produto
+from src.routes.field_routes import _facets_cache
+from src.utils.product_search import (
+    facet_grouping_sets_select, parse_facet_filters, search_vectors_update, tokenize
+)
+
+class ProductSearchTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        app.config['FACETS_CACHE_SECONDS'] = 0
+        return app
+
+    def setUp(self):
+        db.create_all()
+        kids = Fornecedor(nome='Kids Malhas')
+        bebe = Fornecedor(nome='Bebê Feliz')
+        db.session.add_all([kids, bebe])
+        db.session.flush()
+
+        def produto(nome, tamanho, cor, fornecedor, quantidade, sku):
+            return Produto(nome=nome, sexo='F', tamanho=tamanho, cor_estampa=cor, sku=sku,
+                           fornecedor_id=fornecedor.id, custo=10.0, preco_venda=30.0,
+                           quantidade_atual=quantidade)
+
+        db.session.add_all([
+            produto('Body Manga Longa', 'P', 'Rosa', kids, 1, 'BOD-F-P-ROS-001'),
+            produto('Body Manga Curta', 'M', 'Azul', kids, 0, 'BOD-F-M-AZU-001'),
+            produto('Vestido Floral', 'P', 'Rosa', bebe, 1, 'VES-F-P-ROS-001'),
+        ])
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def _search(self, query):
+        response = self.client.get(f'/api/produtos/search?{query}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json
+
+    def test_search_matches_all_tokens_across_columns(self):
+        data = self._search('q=body+rosa')
+        self.assertEqual([p['nome'] for p in data['produtos']], ['Body Manga Longa'])
+
+        data = self._search('q=kids')
+        self.assertEqual(data['pagination']['total'], 2)
+
+        data = self._search('q=VES-F')
+        self.assertEqual([p['sku'] for p in data['produtos']], ['VES-F-P-ROS-001'])
+
+    def test_query_and_index_split_tokens_at_the_same_separators(self):
+        self.assertEqual(tokenize('Body 6-9M'), ['body', '6', '9m'])
+        self.assertEqual(tokenize('BOD_F-P.ROS/001'), ['bod', 'f', 'p', 'ros', '001'])
+        self.assertEqual(tokenize('Bebê'), ['bebê'])
+        self.assertEqual([p['sku'] for p in self._search('q=bod_f/p')['produtos']], ['BOD-F-P-ROS-001'])
+
+        stmt = search_vectors_update(produto_ids=[1, 2], fornecedor_ids=[3])
+        sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+        self.assertTrue(sql.startswith('UPDATE produtos SET'))
+        self.assertIn('FROM fornecedores', sql)
+        self.assertIn('produtos.fornecedor_id = fornecedores.id', sql)
+        self.assertIn('produtos.id IN (1, 2)', sql)
+        self.assertIn('produtos.fornecedor_id IN (3)', sql)
+        self.assertIn('updated_at=produtos.updated_at', sql)
+        # Every column is indexed with the separators tokenize() splits at turned into spaces
+        for coluna, peso in (('produtos.nome', 'A'), ('produtos.sku', 'A'), ('produtos.cor_estampa', 'B'),
+                             ('produtos.tamanho', 'B'), ('fornecedores.nome', 'C')):
+            self.assertIn(
+                f"setweight(to_tsvector(CAST('simple' AS REGCONFIG), regexp_replace(coalesce({coluna}, ''), "
+                f"'[^[:alnum:]]+', ' ', 'g')), '{peso}')", sql
+            )
+
+    def test_facets_and_stock_filter(self):
+        data = self._search('q=body&em_estoque=true')
+        self.assertEqual([p['nome'] for p in data['produtos']], ['Body Manga Longa'])
+        self.assertEqual(data['facets']['tamanho'], [
+            {'valor': 'M', 'total': 1, 'em_estoque': 0},
+            {'valor': 'P', 'total': 1, 'em_estoque': 1},
+        ])
+        self.assertEqual(data['facets']['fornecedor'], [{'valor': 'Kids Malhas', 'total': 2, 'em_estoque': 1}])
+
+    def test_facets_endpoint_applies_filters_and_supports_etag(self):
+        response = self.client.get('/api/fields/facets?tamanho=P', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        facets = response.json['facets']
+        # A facet isn't narrowed by its own filter: the other sizes stay listed
+        self.assertEqual(facets['tamanho'], [
+            {'valor': 'M', 'total': 1, 'em_estoque': 0},
+            {'valor': 'P', 'total': 2, 'em_estoque': 2},
+        ])
+        self.assertEqual(facets['cor_estampa'], [{'valor': 'Rosa', 'total': 2, 'em_estoque': 2}])
+        self.assertEqual([f['valor'] for f in facets['fornecedor']], ['Bebê Feliz', 'Kids Malhas'])
+        self.assertEqual(facets['sexo'], [{'valor': 'F', 'total': 2, 'em_estoque': 2}])
+
+        etag = response.headers['ETag']
+        response = self.client.get('/api/fields/facets?tamanho=P',
+                                   headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_each_facet_gets_the_other_facets_filters(self):
+        data = self._search('tamanho=P&fornecedor=Kids+Malhas')
+        self.assertEqual([p['nome'] for p in data['produtos']], ['Body Manga Longa'])
+        facets = data['facets']
+        self.assertEqual(facets['tamanho'], [
+            {'valor': 'M', 'total': 1, 'em_estoque': 0},
+            {'valor': 'P', 'total': 1, 'em_estoque': 1},
+        ])
+        self.assertEqual(facets['fornecedor'], [
+            {'valor': 'Bebê Feliz', 'total': 1, 'em_estoque': 1},
+            {'valor': 'Kids Malhas', 'total': 1, 'em_estoque': 1},
+        ])
+        self.assertEqual(facets['cor_estampa'], [{'valor': 'Rosa', 'total': 1, 'em_estoque': 1}])
+
+    def test_grouping_sets_filter_each_facet_by_the_others(self):
+        filtros, por_facet = parse_facet_filters(MultiDict([('tamanho', 'P'), ('sexo', 'F')]))
+        sql = str(facet_grouping_sets_select(filtros, por_facet).compile(dialect=postgresql.dialect()))
+        self.assertIn('GROUP BY GROUPING SETS', sql)
+        self.assertNotIn('WHERE', sql.split('FROM')[-1])
+        # Two aggregates per facet: tamanho's filter by sexo, sexo's by tamanho, the others by both
+        tamanho, sexo = 'produtos.tamanho IN (__[POSTCOMPILE_tamanho_1])', 'produtos.sexo IN (__[POSTCOMPILE_sexo_1])'
+        self.assertEqual(sql.count(f'FILTER (WHERE {sexo})'), 2)
+        self.assertEqual(sql.count(f'FILTER (WHERE {tamanho})'), 2)
+        self.assertEqual(sql.count(f'FILTER (WHERE {tamanho} AND {sexo})'), 4)
+
+    def test_facets_cache_follows_config(self):
+        self.addCleanup(_facets_cache.clear)
+        self.app.config['FACETS_CACHE_SECONDS'] = 30
+        response = self.client.get('/api/fields/facets?tamanho=M', headers=self.headers)
+        self.assertEqual(response.cache_control.max_age, 30)
+
+        # Served from the cache for FACETS_CACHE_SECONDS: a new product doesn't show yet
+        db.session.add(Produto(nome='Macacão', sexo='M', tamanho='M', cor_estampa='Azul', custo=10.0,
+                               preco_venda=30.0, quantidade_atual=1, fornecedor_id=1))
+        db.session.commit()
+        response = self.client.get('/api/fields/facets?tamanho=M', headers=self.headers)
+        self.assertEqual(response.json['facets']['cor_estampa'], [{'valor': 'Azul', 'total': 1, 'em_estoque': 0}])
+
+if __name__ == '__main__':
+    unittest.main()
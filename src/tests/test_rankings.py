@@ -0,0 +1,111 @@
+import unittest
+from datetime import datetime, timedelta
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from src.main import create_app
+from src.models import db, Fornecedor, Produto, Venda, ItemVenda, VendaFamiliaDiaria
+from src.rankings import refresh_rankings
+
+class RankingsTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        return app
+
+    def setUp(self):
+        db.create_all()
+        fornecedor = Fornecedor(nome='Fornecedor A')
+        db.session.add(fornecedor)
+        db.session.flush()
+
+        def produto(nome, preco):
+            p = Produto(nome=nome, sexo='F', tamanho='P', cor_estampa='Rosa', fornecedor_id=fornecedor.id,
+                        custo=preco / 2, preco_venda=preco, quantidade_atual=10)
+            db.session.add(p)
+            return p
+
+        # Two lots of the same family count as one family
+        body, body_lote2, meia, vestido = produto('Body', 30.0), produto('Body', 30.0), produto('Meia', 10.0), produto('Vestido', 120.0)
+        db.session.flush()
+        self.ontem = datetime.utcnow() - timedelta(days=1)
+        self._venda(self.ontem, [(body, 1), (meia, 2)])
+        self._venda(self.ontem, [(body_lote2, 1), (meia, 1), (body, 1)])
+        self._venda(self.ontem - timedelta(days=3), [(body, 1), (meia, 1), (vestido, 1)])
+        self._venda(self.ontem - timedelta(days=90), [(vestido, 5)])
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def _venda(self, data, itens, status='Pago'):
+        venda = Venda(cliente_nome='Ana', data_venda=data, status=status, valor_total=sum(p.preco_venda * q for p, q in itens))
+        for p, q in itens:
+            venda.itens.append(ItemVenda(produto_id=p.id, quantidade=q, preco_unitario=p.preco_venda, custo_unitario=p.custo))
+        db.session.add(venda)
+
+    def test_top_sellers_by_units_and_revenue(self):
+        refresh_rankings()
+        response = self.client.get('/api/relatorios/vendas/mais_vendidos', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        ranking = [(m['nome'], m['unidades'], m['receita'], m['vendas']) for m in response.json['mais_vendidos']]
+        self.assertEqual(ranking, [('Body', 4, 120.0, 3), ('Meia', 4, 40.0, 3), ('Vestido', 1, 120.0, 1)])
+        self.assertIsNotNone(response.json['atualizado_em'])
+
+        response = self.client.get('/api/relatorios/vendas/mais_vendidos?ordem=receita&limite=1&start_date=2000-01-01',
+                                   headers=self.headers)
+        self.assertEqual([(m['nome'], m['receita']) for m in response.json['mais_vendidos']], [('Vestido', 720.0)])
+
+    def test_basket_pairs(self):
+        refresh_rankings()
+        response = self.client.get('/api/relatorios/vendas/pares', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        pares = [(p['familia_a']['nome'], p['familia_b']['nome'], p['vendas_juntas'], p['confianca_a_b'])
+                 for p in response.json['pares']]
+        self.assertEqual(pares, [('Body', 'Meia', 3, 1.0)])
+
+        response = self.client.get('/api/relatorios/vendas/pares?min_vendas=1', headers=self.headers)
+        self.assertEqual(len(response.json['pares']), 3)
+
+    def test_cancelled_sales_are_left_out(self):
+        vestido = Produto.query.filter_by(nome='Vestido').first()
+        body = Produto.query.filter_by(nome='Body').first()
+        self._venda(self.ontem, [(vestido, 10), (body, 1)], status='Cancelado')
+        db.session.commit()
+
+        refresh_rankings()
+        response = self.client.get('/api/relatorios/vendas/mais_vendidos', headers=self.headers)
+        ranking = [(m['nome'], m['unidades'], m['vendas']) for m in response.json['mais_vendidos']]
+        self.assertEqual(ranking, [('Body', 4, 3), ('Meia', 4, 3), ('Vestido', 1, 1)])
+        response = self.client.get('/api/relatorios/vendas/pares?min_vendas=1', headers=self.headers)
+        pares = {(p['familia_a']['nome'], p['familia_b']['nome']): p['vendas_juntas'] for p in response.json['pares']}
+        self.assertEqual(pares[('Body', 'Vestido')], 1)
+
+    def test_incremental_refresh_only_rebuilds_recent_days(self):
+        refresh_rankings()
+        linhas_antes = VendaFamiliaDiaria.query.count()
+        self._venda(datetime.utcnow(), [(Produto.query.filter_by(nome='Vestido').first(), 2)])
+        db.session.commit()
+
+        refresh_rankings(desde=datetime.utcnow().date() - timedelta(days=1))
+        self.assertEqual(VendaFamiliaDiaria.query.count(), linhas_antes + 1)
+        response = self.client.get('/api/relatorios/vendas/mais_vendidos?ordem=receita', headers=self.headers)
+        self.assertEqual(response.json['mais_vendidos'][0]['nome'], 'Vestido')
+        self.assertEqual(response.json['mais_vendidos'][0]['unidades'], 3)
+
+    def test_reports_are_empty_before_first_refresh(self):
+        response = self.client.get('/api/relatorios/vendas/mais_vendidos', headers=self.headers)
+        self.assertEqual(response.json['mais_vendidos'], [])
+        self.assertIsNone(response.json['atualizado_em'])
+
+    def test_invalid_order(self):
+        response = self.client.get('/api/relatorios/vendas/mais_vendidos?ordem=margem', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
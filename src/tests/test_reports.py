@@ -0,0 +1,57 @@
+import unittest
+from datetime import datetime
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from src.main import create_app
+from src.models import db, Venda
+
+class ReceivablesReportTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        return app
+
+    def setUp(self):
+        db.create_all()
+        db.session.add_all([
+            Venda(cliente_nome='Ana', valor_total=100.0, forma_pagamento='Pix',
+                  status='Pagamento Pendente', data_venda=datetime(2026, 3, 25, 15)),
+            Venda(cliente_nome='Ana', valor_total=50.0, forma_pagamento='Cartão',
+                  status='Pagamento Pendente', data_venda=datetime(2026, 2, 20, 9)),
+            Venda(cliente_nome='Bia', valor_total=70.0, forma_pagamento='Pix',
+                  status='Pagamento Pendente', data_venda=datetime(2025, 12, 1, 9)),
+            Venda(cliente_nome='Bia', valor_total=999.0, forma_pagamento='Pix',
+                  status='Pago', data_venda=datetime(2026, 3, 1, 9)),
+        ])
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def test_receivables_aging_and_totals(self):
+        response = self.client.get('/api/relatorios/vendas/recebiveis?data_referencia=2026-04-01&per_page=2',
+                                   headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        data = response.json
+        self.assertEqual(data['faixas']['0-30'], {'quantidade': 1, 'valor_total': 100.0})
+        self.assertEqual(data['faixas']['31-60'], {'quantidade': 1, 'valor_total': 50.0})
+        self.assertEqual(data['faixas']['60+'], {'quantidade': 1, 'valor_total': 70.0})
+        self.assertEqual(data['total_pendente'], 220.0)
+        self.assertEqual(data['por_cliente'][0]['cliente_nome'], 'Ana')
+        self.assertEqual(data['por_cliente'][0]['valor_total'], 150.0)
+        self.assertEqual({f['forma_pagamento']: f['valor_total'] for f in data['por_forma_pagamento']},
+                         {'Pix': 170.0, 'Cartão': 50.0})
+
+        self.assertEqual(data['pagination']['total'], 3)
+        self.assertEqual(data['pagination']['pages'], 2)
+        self.assertEqual([r['faixa'] for r in data['recebiveis']], ['60+', '31-60'])
+        self.assertEqual(data['recebiveis'][1]['dias_em_aberto'], 40)
+
+if __name__ == '__main__':
+    unittest.main()
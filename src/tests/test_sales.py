@@ -0,0 +1,134 @@
+import unittest
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from src.main import create_app
+from src.models import db, Fornecedor, Produto, Venda, ItemVenda, TransacaoEstoque
+
+class SaleBatchTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        return app
+
+    def setUp(self):
+        db.create_all()
+        fornecedor = Fornecedor(nome='Fornecedor Teste')
+        db.session.add(fornecedor)
+        db.session.flush()
+
+        self.venda_ids = []
+        self.produto_ids = []
+        for i in range(3):
+            produto = Produto(nome=f'Body {i}', sexo='F', tamanho='P', cor_estampa='Rosa',
+                              fornecedor_id=fornecedor.id, custo=10.0, preco_venda=40.0,
+                              quantidade_atual=0)
+            venda = Venda(cliente_nome='Maria', valor_total=40.0, status='Pagamento Pendente')
+            db.session.add_all([produto, venda])
+            db.session.flush()
+            db.session.add(ItemVenda(venda_id=venda.id, produto_id=produto.id,
+                                     quantidade=1, preco_unitario=40.0, custo_unitario=10.0))
+            self.venda_ids.append(venda.id)
+            self.produto_ids.append(produto.id)
+        db.session.commit()
+
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def test_batch_confirm_payment_reports_per_id_outcomes(self):
+        primeira, segunda, _ = self.venda_ids
+        response = self.client.post('/api/vendas/batch/confirm-payment', headers=self.headers, json={
+            'pagamentos': [
+                {'venda_id': primeira, 'valor_pago': 40, 'data_pagamento': '2026-01-31'},
+                {'venda_id': segunda, 'valor_pago': 30, 'observacoes': 'Extrato jan'},
+                {'venda_id': 9999, 'valor_pago': 10},
+                {'venda_id': primeira, 'valor_pago': 40},
+            ]
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['confirmadas'], 2)
+        self.assertEqual([r['success'] for r in response.json['resultados']], [True, True, False, False])
+
+        venda = db.session.get(Venda, segunda)
+        self.assertEqual(venda.status, 'Pago')
+        self.assertEqual(venda.desconto_valor, 10)
+        self.assertEqual(venda.desconto_percentual, 25)
+        self.assertEqual(venda.observacoes, 'Extrato jan')
+        self.assertEqual(db.session.get(Venda, primeira).data_pagamento.day, 31)
+
+    def test_batch_confirm_payment_reports_invalid_ids(self):
+        primeira = self.venda_ids[0]
+        response = self.client.post('/api/vendas/batch/confirm-payment', headers=self.headers, json={
+            'pagamentos': [
+                {'venda_id': [primeira], 'valor_pago': 40},
+                {'venda_id': {'id': primeira}, 'valor_pago': 40},
+                {'venda_id': True, 'valor_pago': 40},
+                'pagamento',
+                {'venda_id': primeira, 'valor_pago': 40},
+            ]
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['confirmadas'], 1)
+        self.assertEqual([r.get('error') for r in response.json['resultados']],
+                         ['venda_id inválido'] * 4 + [None])
+
+    def test_confirm_payment_single_sale(self):
+        venda_id = self.venda_ids[0]
+        response = self.client.post(f'/api/vendas/{venda_id}/confirm-payment', headers=self.headers, json={
+            'valor_pago': 36, 'data_pagamento': '2026-02-10', 'observacoes': 'Pix'
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json['success'])
+        self.assertEqual(response.json['venda']['id'], venda_id)
+        self.assertEqual(response.json['venda']['status'], 'Pago')
+
+        venda = db.session.get(Venda, venda_id)
+        self.assertEqual(venda.desconto_valor, 4)
+        self.assertEqual(venda.desconto_percentual, 10)
+        self.assertEqual(venda.observacoes, 'Pix')
+        self.assertEqual(venda.data_pagamento.day, 10)
+
+        # Already paid, unknown sale and invalid amount
+        repetida = self.client.post(f'/api/vendas/{venda_id}/confirm-payment', headers=self.headers,
+                                    json={'valor_pago': 40})
+        self.assertEqual(repetida.status_code, 400)
+        ausente = self.client.post('/api/vendas/9999/confirm-payment', headers=self.headers, json={'valor_pago': 40})
+        self.assertEqual(ausente.status_code, 404)
+        invalida = self.client.post(f'/api/vendas/{self.venda_ids[1]}/confirm-payment', headers=self.headers,
+                                    json={'valor_pago': 0})
+        self.assertEqual(invalida.status_code, 400)
+        self.assertEqual(db.session.get(Venda, self.venda_ids[1]).status, 'Pagamento Pendente')
+
+    def test_batch_cancel_returns_stock_and_records_transactions(self):
+        primeira, segunda, terceira = self.venda_ids
+        response = self.client.post('/api/vendas/batch/cancel', headers=self.headers,
+                                    json={'venda_ids': [primeira, segunda, 9999]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['canceladas'], 2)
+        self.assertFalse(response.json['resultados'][2]['success'])
+
+        self.assertEqual(db.session.get(Venda, primeira).status, 'Cancelado')
+        self.assertEqual(db.session.get(Venda, terceira).status, 'Pagamento Pendente')
+        self.assertEqual(db.session.get(Produto, self.produto_ids[0]).quantidade_atual, 1)
+        self.assertEqual(db.session.get(Produto, self.produto_ids[2]).quantidade_atual, 0)
+        self.assertEqual(TransacaoEstoque.query.filter_by(tipo_transacao='cancelamento').count(), 2)
+
+        # Cancelling again must not return the stock twice
+        response = self.client.post('/api/vendas/batch/cancel', headers=self.headers,
+                                    json={'venda_ids': [primeira]})
+        self.assertEqual(response.json['canceladas'], 0)
+        self.assertEqual(TransacaoEstoque.query.filter_by(tipo_transacao='cancelamento').count(), 2)
+
+    def test_batch_cancel_rejects_invalid_payload(self):
+        response = self.client.post('/api/vendas/batch/cancel', headers=self.headers,
+                                    json={'venda_ids': 'todas'})
+        self.assertEqual(response.status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
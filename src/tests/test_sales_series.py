@@ -0,0 +1,115 @@
+import unittest
+from datetime import date, datetime
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from src.main import create_app
+from src.models import db, Fornecedor, Produto, Venda, ItemVenda
+from src.sales_series import bucket_start
+
+class SalesSeriesTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        return app
+
+    def setUp(self):
+        db.create_all()
+        fornecedor = Fornecedor(nome='Fornecedor A')
+        db.session.add(fornecedor)
+        db.session.flush()
+        self.produto = Produto(nome='Body', sexo='F', tamanho='P', cor_estampa='Rosa', fornecedor_id=fornecedor.id,
+                               custo=10.0, preco_venda=25.0, quantidade_atual=100)
+        db.session.add(self.produto)
+        db.session.flush()
+        # Thursday 2026-01-01 .. Monday 2026-01-05, none on 01-02/01-03; February for the month view
+        self._venda(datetime(2026, 1, 1, 10), 2, 'Pix')
+        self._venda(datetime(2026, 1, 1, 23, 59), 1, 'Cartão')
+        self._venda(datetime(2026, 1, 4, 9), 1, None)
+        self._venda(datetime(2026, 1, 5, 0, 0), 3, 'Pix')
+        self._venda(datetime(2026, 2, 10, 12), 4, 'Pix')
+        # Comparison period (the 5 days before)
+        self._venda(datetime(2025, 12, 30, 12), 2, 'Pix')
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def _venda(self, data, quantidade, forma_pagamento):
+        venda = Venda(cliente_nome='Ana', data_venda=data, forma_pagamento=forma_pagamento,
+                      valor_total=self.produto.preco_venda * quantidade)
+        # Two item rows per sale: units must not repeat the sale's revenue
+        venda.itens.append(ItemVenda(produto_id=self.produto.id, quantidade=quantidade, preco_unitario=25.0, custo_unitario=10.0))
+        venda.itens.append(ItemVenda(produto_id=self.produto.id, quantidade=1, preco_unitario=0.0, custo_unitario=0.0))
+        db.session.add(venda)
+
+    def test_cancelled_sales_are_left_out(self):
+        antes = self._get('start_date=2026-01-01&end_date=2026-01-05&comparar=anterior')
+        self._venda(datetime(2026, 1, 4, 15), 5, 'Pix')
+        self._venda(datetime(2025, 12, 31, 15), 5, 'Pix')
+        for venda in Venda.query.filter(Venda.id > 6):
+            venda.status = 'Cancelado'
+        db.session.commit()
+
+        depois = self._get('start_date=2026-01-01&end_date=2026-01-05&comparar=anterior')
+        self.assertEqual(depois['serie'], antes['serie'])
+        self.assertEqual(depois['totais'], antes['totais'])
+        self.assertEqual(depois['por_forma_pagamento'], antes['por_forma_pagamento'])
+        self.assertEqual(depois['comparacao']['variacao_percentual'], antes['comparacao']['variacao_percentual'])
+
+    def _get(self, query):
+        response = self.client.get(f'/api/relatorios/vendas/serie?{query}', headers=self.headers)
+        self.assertEqual(response.status_code, 200, response.json)
+        return response.json
+
+    def test_daily_series_is_gap_filled(self):
+        dados = self._get('start_date=2026-01-01&end_date=2026-01-05')
+        self.assertEqual(
+            [(p['periodo'], p['vendas'], p['receita'], p['unidades']) for p in dados['serie']],
+            [('2026-01-01', 2, 75.0, 5), ('2026-01-02', 0, 0.0, 0), ('2026-01-03', 0, 0.0, 0),
+             ('2026-01-04', 1, 25.0, 2), ('2026-01-05', 1, 75.0, 4)]
+        )
+        self.assertEqual(dados['totais'], {'vendas': 4, 'receita': 175.0, 'unidades': 11, 'ticket_medio': 43.75})
+        self.assertEqual(dados['serie'][0]['por_forma_pagamento'],
+                         {'Pix': {'vendas': 1, 'receita': 50.0}, 'Cartão': {'vendas': 1, 'receita': 25.0}})
+        self.assertEqual(
+            [(f['forma_pagamento'], f['vendas'], f['receita']) for f in dados['por_forma_pagamento']],
+            [('Pix', 2, 125.0), ('Cartão', 1, 25.0), ('Não informada', 1, 25.0)]
+        )
+
+    def test_weekly_and_monthly_buckets(self):
+        semanal = self._get('start_date=2026-01-01&end_date=2026-01-20&granularidade=semana')
+        self.assertEqual([(p['periodo'], p['vendas']) for p in semanal['serie']],
+                         [('2025-12-29', 3), ('2026-01-05', 1), ('2026-01-12', 0), ('2026-01-19', 0)])
+
+        mensal = self._get('start_date=2025-12-01&end_date=2026-03-31&granularidade=mes')
+        self.assertEqual([(p['periodo'], p['vendas']) for p in mensal['serie']],
+                         [('2025-12-01', 1), ('2026-01-01', 4), ('2026-02-01', 1), ('2026-03-01', 0)])
+
+    def test_comparison_with_previous_period(self):
+        dados = self._get('start_date=2026-01-01&end_date=2026-01-05&comparar=anterior')
+        comparacao = dados['comparacao']
+        self.assertEqual((comparacao['inicio'], comparacao['fim']), ('2025-12-27', '2025-12-31'))
+        self.assertEqual(comparacao['totais']['receita'], 50.0)
+        self.assertEqual(comparacao['variacao_percentual']['receita'], 250.0)
+        self.assertEqual(len(comparacao['serie']), len(dados['serie']))
+
+    def test_invalid_parameters(self):
+        for query in ('granularidade=ano', 'comparar=semana', 'start_date=2026-02-01&end_date=2026-01-01',
+                      'start_date=2000-01-01&end_date=2026-01-01'):
+            with self.subTest(query=query):
+                response = self.client.get(f'/api/relatorios/vendas/serie?{query}', headers=self.headers)
+                self.assertEqual(response.status_code, 400)
+
+    def test_bucket_start(self):
+        self.assertEqual(bucket_start(date(2026, 1, 4), 'semana'), date(2025, 12, 29))
+        self.assertEqual(bucket_start(date(2026, 1, 5), 'semana'), date(2026, 1, 5))
+        self.assertEqual(bucket_start(date(2026, 2, 28), 'mes'), date(2026, 2, 1))
+
+if __name__ == '__main__':
+    unittest.main()
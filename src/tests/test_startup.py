@@ -0,0 +1,45 @@
+import os
+import unittest
+from unittest import mock
+from flask_testing import TestCase
+from sqlalchemy import inspect
+from src.main import create_app
+from src.models import db
+from src.models.user import User
+
+class StartupTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        return app
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def test_create_app_does_no_schema_work(self):
+        self.assertEqual(inspect(db.engine).get_table_names(), [])
+
+    def test_create_app_can_be_called_again(self):
+        other = create_app()
+        self.assertIn('produto_bp', other.blueprints)
+
+    def test_bootstrap_command_creates_tables_and_admin(self):
+        env = {'ADMIN_EMAIL': 'admin@tuttobaby.com.br', 'ADMIN_PASS': 'segredo'}
+        with mock.patch.dict(os.environ, env):
+            result = self.app.test_cli_runner().invoke(args=['bootstrap'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        admin = User.query.filter_by(email='admin@tuttobaby.com.br').one()
+        self.assertEqual(admin.role, 'admin')
+
+        # Running it again leaves the existing users alone
+        with mock.patch.dict(os.environ, env):
+            self.app.test_cli_runner().invoke(args=['bootstrap'])
+        self.assertEqual(User.query.count(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from src.main import create_app
+from src.models import db, Fornecedor, Produto, Venda, ItemVenda, TransacaoEstoque
+
+class StreamingExportTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        return app
+
+    def setUp(self):
+        db.create_all()
+        fornecedor = Fornecedor(nome='Fornecedor Teste')
+        db.session.add(fornecedor)
+        db.session.flush()
+        inicio = datetime(2026, 1, 1, 9)
+        for i in range(7):
+            produto = Produto(nome=f'Body {i}', sexo='F', tamanho='P', cor_estampa='Rosa',
+                              fornecedor_id=fornecedor.id, custo=10.0, preco_venda=30.0, quantidade_atual=5)
+            db.session.add(produto)
+            db.session.flush()
+            venda = Venda(cliente_nome='Ana', valor_total=30.0, data_venda=inicio + timedelta(days=i))
+            venda.itens.append(ItemVenda(produto_id=produto.id, quantidade=1, preco_unitario=30.0, custo_unitario=10.0))
+            db.session.add(venda)
+            db.session.add(TransacaoEstoque(produto_id=produto.id, tipo_transacao='compra', quantidade=5,
+                                            data_transacao=inicio + timedelta(days=i)))
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def test_streamed_json_matches_buffered_response(self):
+        # Small batches so the rows span several chunks
+        with mock.patch('src.utils.streaming.STREAM_BATCH_SIZE', 3):
+            for url, key in (('/api/vendas/', 'vendas'), ('/api/transacoes/', 'transacoes'),
+                             ('/api/relatorios/estoque/niveis', 'niveis_estoque')):
+                with self.subTest(url=url):
+                    buffered = self.client.get(url, headers=self.headers).json
+                    response = self.client.get(f'{url}?stream=1', headers=self.headers)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertTrue(response.is_streamed)
+                    self.assertEqual(json.loads(response.get_data()), buffered)
+                    self.assertEqual(len(buffered[key]), 7)
+
+    def test_ndjson_emits_one_row_per_line(self):
+        with mock.patch('src.utils.streaming.STREAM_BATCH_SIZE', 2):
+            response = self.client.get('/api/vendas/?format=ndjson', headers=self.headers)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        linhas = response.get_data(as_text=True).splitlines()
+        self.assertEqual(len(linhas), 7)
+        primeira = json.loads(linhas[0])
+        self.assertEqual(primeira['data_venda'], '2026-01-07T09:00:00')
+        self.assertEqual(primeira['produtos'][0]['nome'], 'Body 6')
+
+    def test_empty_export_is_valid_json(self):
+        response = self.client.get('/api/transacoes/?stream=1&produto_id=999', headers=self.headers)
+        self.assertEqual(json.loads(response.get_data()), {'success': True, 'transacoes': []})
+
+if __name__ == '__main__':
+    unittest.main()
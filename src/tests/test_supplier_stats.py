@@ -0,0 +1,93 @@
+import unittest
+from datetime import date, datetime
+from flask_testing import TestCase
+from flask_jwt_extended import create_access_token
+from src.main import create_app
+from src.models import db, Fornecedor, Produto, Venda, ItemVenda, TransacaoEstoque
+
+class SupplierStatsTest(TestCase):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    TESTING = True
+
+    def create_app(self):
+        app = create_app()
+        app.config['SQLALCHEMY_DATABASE_URI'] = self.SQLALCHEMY_DATABASE_URI
+        app.config['TESTING'] = True
+        return app
+
+    def setUp(self):
+        db.create_all()
+        self.fornecedor_a = Fornecedor(nome='Fornecedor A')
+        self.fornecedor_b = Fornecedor(nome='Fornecedor B')
+        db.session.add_all([self.fornecedor_a, self.fornecedor_b])
+        db.session.flush()
+
+        # Supplier A: 3 single-unit products bought on 2026-01-01, two sold (after 10 and 20 days)
+        produtos = []
+        for _ in range(3):
+            produto = Produto(nome='Body', sexo='F', tamanho='P', cor_estampa='Rosa', fornecedor_id=self.fornecedor_a.id,
+                              custo=10.0, preco_venda=30.0, quantidade_atual=1, data_compra=date(2026, 1, 1))
+            db.session.add(produto)
+            db.session.add(TransacaoEstoque(produto=produto, tipo_transacao='compra', quantidade=1,
+                                            custo_unitario_transacao=10.0))
+            produtos.append(produto)
+        db.session.flush()
+        # Two items in one sale: the sale total must not be counted twice
+        for dia, produto in ((11, produtos[0]), (21, produtos[1])):
+            venda = Venda(cliente_nome='Ana', data_venda=datetime(2026, 1, dia, 15), valor_total=30.0)
+            venda.itens.append(ItemVenda(produto_id=produto.id, quantidade=1, preco_unitario=30.0, custo_unitario=10.0))
+            db.session.add(venda)
+            db.session.add(TransacaoEstoque(produto_id=produto.id, tipo_transacao='venda', quantidade=-1))
+            produto.quantidade_atual = 0
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def test_list_with_stats(self):
+        response = self.client.get('/api/fornecedores/?with_stats=1', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        fornecedores = {f['nome']: f for f in response.json['fornecedores']}
+        self.assertEqual(fornecedores['Fornecedor A']['estatisticas'], {
+            'pecas_compradas': 3,
+            'pecas_em_estoque': 1,
+            'pecas_vendidas': 2,
+            'receita': 60.0,
+            'cmv': 20.0,
+            'margem': 40.0,
+            'margem_percentual': 66.67,
+            'dias_medios_para_venda': 15.0,
+        })
+        self.assertEqual(fornecedores['Fornecedor B']['estatisticas']['pecas_compradas'], 0)
+        self.assertIsNone(fornecedores['Fornecedor B']['estatisticas']['dias_medios_para_venda'])
+        # Same supplier fields as without stats
+        self.assertEqual(fornecedores['Fornecedor A']['id'], self.fornecedor_a.id)
+        self.assertIn('is_active', fornecedores['Fornecedor A'])
+
+    def test_cancelled_sales_are_left_out(self):
+        venda = Venda.query.order_by(Venda.data_venda).first()
+        venda.status = 'Cancelado'
+        db.session.commit()
+        response = self.client.get(f'/api/fornecedores/{self.fornecedor_a.id}?with_stats=1', headers=self.headers)
+        estatisticas = response.json['fornecedor']['estatisticas']
+        self.assertEqual((estatisticas['pecas_vendidas'], estatisticas['receita'], estatisticas['cmv']), (1, 30.0, 10.0))
+        self.assertEqual(estatisticas['dias_medios_para_venda'], 20.0)
+
+    def test_stats_come_from_one_query(self):
+        response = self.client.get('/api/fornecedores/?with_stats=1', headers=self.headers)
+        self.assertIn('desc="1 queries"', response.headers['Server-Timing'])
+
+    def test_single_supplier_with_stats(self):
+        response = self.client.get(f'/api/fornecedores/{self.fornecedor_a.id}?with_stats=true', headers=self.headers)
+        self.assertEqual(response.json['fornecedor']['estatisticas']['pecas_vendidas'], 2)
+        response = self.client.get('/api/fornecedores/999?with_stats=1', headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+
+    def test_without_stats_unchanged(self):
+        response = self.client.get('/api/fornecedores/', headers=self.headers)
+        self.assertNotIn('estatisticas', response.json['fornecedores'][0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+# === utils/cache.py ===
+import threading
+import time
+
+class TTLCache:
+    """Small thread-safe in-process cache whose entries expire after ttl seconds.
+
+    Each gunicorn worker keeps its own copy, so only use it for data where a few seconds of
+    staleness is acceptable. Without a default ttl, every set() must pass one (e.g. from config).
+    """
+
+    def __init__(self, ttl=None, maxsize=256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is None:
+            raise ValueError("TTLCache.set() needs a ttl when the cache has no default")
+        with self._lock:
+            if len(self._data) >= self.maxsize and key not in self._data:
+                # Drop the entry closest to expiry
+                del self._data[min(self._data, key=lambda k: self._data[k][0])]
+            self._data[key] = (time.monotonic() + ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,77 @@
+# === utils/columnar.py ===
+"""Columnar, dictionary-encoded list payloads (?format=columnar).
+
+Instead of one object per row, the payload holds one array per column:
+
+    {
+        "format": "columnar",
+        "count": 3,
+        "columns": ["id", "tamanho", ...],
+        "data": {"id": [1, 2, 3], "tamanho": [0, 1, 0], ...},
+        "dictionaries": {"tamanho": ["P", "M"], ...}
+    }
+
+Columns listed in "dictionaries" hold indexes into that list (null stays null), so row i is
+{c: dictionaries[c][data[c][i]] if c in dictionaries else data[c][i] for c in columns}.
+Payloads are built straight from SQL result tuples, without loading ORM objects.
+"""
+from sqlalchemy import select
+
+from src.models import db, Fornecedor, Produto
+
+# Same keys as Produto.to_dict()
+PRODUTO_COLUMNS = (
+    Produto.id,
+    Produto.sku,
+    Produto.nome,
+    Produto.sexo,
+    Produto.tamanho,
+    Produto.cor_estampa,
+    Produto.fornecedor_id,
+    Fornecedor.nome.label("nome_fornecedor"),
+    Produto.custo,
+    Produto.preco_venda,
+    Produto.quantidade_atual,
+    Produto.limite_reabastecimento,
+    Produto.created_at,
+    Produto.updated_at,
+    Produto.data_compra,
+)
+PRODUTO_DICTIONARY_COLUMNS = ("sexo", "tamanho", "cor_estampa", "nome_fornecedor")
+
+
+def wants_columnar(args):
+    return args.get("format") == "columnar"
+
+
+def columnar_payload(colunas, linhas, dictionary_columns=()):
+    """Builds the columnar payload from row tuples ordered like colunas."""
+    linhas = list(linhas)
+    data, dictionaries = {}, {}
+    valores_por_coluna = zip(*linhas) if linhas else [()] * len(colunas)
+    for coluna, valores in zip(colunas, valores_por_coluna):
+        if coluna in dictionary_columns:
+            codigos = {}
+            data[coluna] = [None if v is None else codigos.setdefault(v, len(codigos)) for v in valores]
+            dictionaries[coluna] = list(codigos)
+        else:
+            data[coluna] = list(valores)
+    return {
+        "format": "columnar",
+        "count": len(linhas),
+        "columns": list(colunas),
+        "data": data,
+        "dictionaries": dictionaries,
+    }
+
+
+def produtos_columnar(*criterios, order_by=(Produto.id,)):
+    """Columnar payload of the products matching criterios, in Produto.to_dict() keys."""
+    stmt = (
+        select(*PRODUTO_COLUMNS)
+        .outerjoin(Fornecedor, Produto.fornecedor_id == Fornecedor.id)
+        .where(*criterios)
+        .order_by(*order_by)
+    )
+    result = db.session.execute(stmt)
+    return columnar_payload(list(result.keys()), result.tuples(), PRODUTO_DICTIONARY_COLUMNS)
@@ -1,4 +1,5 @@
 # === utils/helpers.py ===
+from datetime import datetime, timedelta
 from src.models.product import Produto # Use the new model name
 
 def generate_sku(produto):
@@ -36,3 +37,23 @@ def generate_sku(produto):
     # Return the new SKU with a padded suffix
     return f"{base_sku}-{new_suffix:03d}"
 
+
+def escape_like(value, escape_char='\\'):
+    """Escapes LIKE/ILIKE wildcards in user input; use with .like(..., escape=escape_char)."""
+    return (
+        value.replace(escape_char, escape_char * 2)
+        .replace('%', f'{escape_char}%')
+        .replace('_', f'{escape_char}_')
+    )
+
+def parse_date_range(args):
+    """(start, end) datetimes from start_date/end_date args (YYYY-MM-DD), either may be None.
+
+    end is the midnight after end_date, so filter with < end for an inclusive end date.
+    Raises ValueError on a malformed date.
+    """
+    start_date_str = args.get("start_date")
+    end_date_str = args.get("end_date")
+    start = datetime.strptime(start_date_str, "%Y-%m-%d") if start_date_str else None
+    end = datetime.strptime(end_date_str, "%Y-%m-%d") + timedelta(days=1) if end_date_str else None
+    return start, end
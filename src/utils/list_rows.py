@@ -0,0 +1,127 @@
+# === utils/list_rows.py ===
+"""Read path for the list endpoints: plain SQL rows serialized straight to dicts.
+
+Loading ORM instances for a list we only serialize once pays for identity-map bookkeeping,
+change tracking and per-row relationship loads. These helpers select just the columns that
+to_dict() returns (joins included) and build the same dicts from the result tuples. Keep the
+selects in sync with the models' to_dict(); the tests compare both paths.
+
+Each *_select() returns a Select that the routes can filter and order like an ORM query
+(filter_vendas/filter_transacoes accept either).
+"""
+from collections import defaultdict
+
+from sqlalchemy import func, select
+
+from src.models import db, Cliente, Fornecedor, ItemVenda, Produto, TransacaoEstoque, Venda
+from src.utils.columnar import PRODUTO_COLUMNS
+
+# Keeps IN lists under SQLite's bound-parameter limit
+IN_CHUNK_SIZE = 900
+
+
+def row_dicts(stmt):
+    """Executes stmt and returns one dict per row, keyed by the selected column labels."""
+    result = db.session.execute(stmt)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def produto_select():
+    """Columns of Produto.to_dict(), supplier name included."""
+    return select(*PRODUTO_COLUMNS).outerjoin(Fornecedor, Produto.fornecedor_id == Fornecedor.id)
+
+
+def transacao_select():
+    """Columns of TransacaoEstoque.to_dict()."""
+    return select(
+        TransacaoEstoque.id,
+        TransacaoEstoque.produto_id,
+        Produto.nome.label("nome_produto"),
+        TransacaoEstoque.tipo_transacao,
+        TransacaoEstoque.quantidade,
+        TransacaoEstoque.data_transacao,
+        TransacaoEstoque.observacoes,
+        TransacaoEstoque.created_at,
+        TransacaoEstoque.custo_unitario_transacao,
+        TransacaoEstoque.venda_id,
+        TransacaoEstoque.troca_id,
+    ).outerjoin(Produto, Produto.id == TransacaoEstoque.produto_id)
+
+
+def cliente_select():
+    """Columns of Cliente.to_dict(); total_gasto is summed in SQL."""
+    total_gasto = (
+        select(func.coalesce(func.sum(Venda.valor_total), 0))
+        .where(Venda.cliente_id == Cliente.id)
+        .scalar_subquery()
+    )
+    return select(
+        Cliente.id,
+        Cliente.nome,
+        Cliente.telefone,
+        Cliente.email,
+        Cliente.endereco,
+        Cliente.observacoes,
+        Cliente.created_at,
+        Cliente.updated_at,
+        total_gasto.label("total_gasto"),
+    )
+
+
+def fornecedor_select():
+    """Columns of Fornecedor.to_dict()."""
+    return select(Fornecedor.id, Fornecedor.nome, Fornecedor.is_active, Fornecedor.created_at, Fornecedor.updated_at)
+
+
+def venda_select():
+    """Columns of Venda.to_dict() except the items; see venda_dicts()."""
+    return select(
+        Venda.id,
+        Venda.cliente_id,
+        Venda.cliente_nome,
+        Venda.cliente_sobrenome,
+        Venda.data_venda,
+        Venda.data_pagamento,
+        Venda.valor_total,
+        Venda.forma_pagamento,
+        Venda.status,
+        Venda.observacoes,
+        Venda.desconto_percentual,
+        Venda.desconto_valor,
+        Venda.troca_id,
+    )
+
+
+def _itens_por_venda(venda_ids):
+    """ItemVenda.to_dict() rows grouped by venda_id, one query per IN_CHUNK_SIZE sales."""
+    itens = defaultdict(list)
+    for i in range(0, len(venda_ids), IN_CHUNK_SIZE):
+        stmt = (
+            select(
+                ItemVenda.id,
+                ItemVenda.venda_id,
+                ItemVenda.produto_id,
+                ItemVenda.quantidade,
+                ItemVenda.preco_unitario.label("preco_venda"),
+                ItemVenda.custo_unitario.label("custo"),
+                Produto.nome,
+                Produto.tamanho,
+                Produto.cor_estampa,
+            )
+            .outerjoin(Produto, Produto.id == ItemVenda.produto_id)
+            .where(ItemVenda.venda_id.in_(venda_ids[i:i + IN_CHUNK_SIZE]))
+            .order_by(ItemVenda.id)
+        )
+        for item in row_dicts(stmt):
+            itens[item["venda_id"]].append(item)
+    return itens
+
+
+def venda_dicts(stmt):
+    """Venda.to_dict() for each row of stmt (a filtered/ordered venda_select())."""
+    vendas = row_dicts(stmt)
+    itens = _itens_por_venda([v["id"] for v in vendas])
+    for venda in vendas:
+        venda["produtos"] = itens.get(venda["id"], [])
+    return vendas
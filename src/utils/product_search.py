@@ -0,0 +1,195 @@
+# === utils/product_search.py ===
+import re
+from sqlalchemy import and_, case, cast, func, literal, or_, select, union_all, update
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from src.models import db, Produto, Fornecedor
+from src.utils.helpers import escape_like
+
+# 'simple' only lowercases: no stemming or stop words, so names and colors match as typed
+SEARCH_CONFIG = "simple"
+# Anything but letters and digits separates tokens, in the index and in the query alike. Left
+# alone, the PostgreSQL parser applies its own hyphen and sign rules (a "-9" signed integer in
+# "6-9M"), which tokenize()'s "9m" would not match.
+# SKUs and sizes are indexed as their parts ("BOD-F-P" -> bod, f, p) and each query token is
+# matched as a prefix, so "VES-F" still finds VES-F-P-ROS-001.
+SEPARATORS_SQL = "[^[:alnum:]]+"
+
+# Facet name -> column, shared by the search and facet endpoints
+FACET_COLUMNS = {
+    "tamanho": Produto.tamanho,
+    "cor_estampa": Produto.cor_estampa,
+    "sexo": Produto.sexo,
+    "fornecedor": Fornecedor.nome,
+}
+
+def is_postgresql():
+    return db.session.get_bind().dialect.name == "postgresql"
+
+def tokenize(termo):
+    """Splits free text into lowercase alphanumeric tokens (SKU separators become token breaks)."""
+    return [token for token in re.split(r"[\W_]+", termo.lower()) if token]
+
+def _search_vector_expression():
+    config = cast(literal(SEARCH_CONFIG), REGCONFIG)
+
+    def weighted(valor, peso):
+        texto = func.regexp_replace(func.coalesce(valor, ""), SEPARATORS_SQL, " ", "g")
+        return func.setweight(func.to_tsvector(config, texto), peso)
+
+    return (
+        weighted(Produto.nome, "A")
+        .op("||")(weighted(Produto.sku, "A"))
+        .op("||")(weighted(Produto.cor_estampa, "B"))
+        .op("||")(weighted(Produto.tamanho, "B"))
+        .op("||")(weighted(Fornecedor.nome, "C"))
+    )
+
+def search_vectors_update(produto_ids=None, fornecedor_ids=None):
+    """The UPDATE ... FROM fornecedores that recomputes produtos.search_vector for the given
+    products and/or suppliers (PostgreSQL only)."""
+    stmt = (
+        update(Produto)
+        .where(Produto.fornecedor_id == Fornecedor.id)
+        # Keep updated_at as is: supplier renames shouldn't look like product edits
+        .values(search_vector=_search_vector_expression(), updated_at=Produto.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    if produto_ids:
+        stmt = stmt.where(Produto.id.in_(produto_ids))
+    if fornecedor_ids:
+        stmt = stmt.where(Produto.fornecedor_id.in_(fornecedor_ids))
+    return stmt
+
+def refresh_search_vectors(produto_ids=None, fornecedor_ids=None):
+    """Recomputes produtos.search_vector with one set-based UPDATE ... FROM fornecedores.
+
+    Call after flushing product or supplier changes, before committing. No-op outside PostgreSQL,
+    where search falls back to LIKE over the plain columns.
+    """
+    if not is_postgresql() or (not produto_ids and not fornecedor_ids):
+        return
+    db.session.execute(search_vectors_update(produto_ids, fornecedor_ids))
+
+def text_match(tokens):
+    """Returns (filter, rank) expressions matching every token as a prefix.
+
+    The LIKE fallback needs fornecedores joined into the query.
+    """
+    if is_postgresql():
+        tsquery = func.to_tsquery(
+            cast(literal(SEARCH_CONFIG), REGCONFIG),
+            " & ".join(f"{token}:*" for token in tokens)
+        )
+        return Produto.search_vector.op("@@")(tsquery), func.ts_rank(Produto.search_vector, tsquery)
+
+    colunas = [Produto.nome, Produto.sku, Produto.cor_estampa, Produto.tamanho, Fornecedor.nome]
+    condicoes = [
+        or_(*[func.lower(coluna).like(f"%{escape_like(token)}%", escape="\\") for coluna in colunas])
+        for token in tokens
+    ]
+    return and_(*condicoes), literal(0)
+
+def parse_facet_filters(args):
+    """Splits the catalog query args into (filtros, por_facet).
+
+    filtros holds the text match, which applies to every facet; por_facet maps each filtered
+    facet to its IN filter, so the facet's own counts can leave it out.
+    """
+    filtros = []
+    tokens = tokenize(args.get("q", "").strip())
+    if tokens:
+        filtros.append(text_match(tokens)[0])
+    por_facet = {}
+    for nome, coluna in FACET_COLUMNS.items():
+        valores = [v for v in args.getlist(nome) if v]
+        if valores:
+            por_facet[nome] = coluna.in_(valores)
+    return filtros, por_facet
+
+def parse_catalog_filters(args):
+    """Builds filter expressions from catalog query args (q, tamanho, cor_estampa, sexo, fornecedor).
+
+    Attribute filters accept repeated values (?tamanho=P&tamanho=M). Filters on Fornecedor.nome
+    need fornecedores joined into the query.
+    """
+    filtros, por_facet = parse_facet_filters(args)
+    return filtros + list(por_facet.values())
+
+def _outros_filtros(por_facet, nome):
+    """The attribute filters of every facet but nome."""
+    return [filtro for outro, filtro in por_facet.items() if outro != nome]
+
+def _facet_aggregates(outros):
+    total = func.count(Produto.id)
+    em_estoque = func.sum(case((Produto.quantidade_atual > 0, 1), else_=0))
+    if outros:
+        criterio = and_(*outros)
+        return total.filter(criterio), em_estoque.filter(criterio)
+    return total, em_estoque
+
+def facet_grouping_sets_select(filtros, por_facet):
+    """One GROUPING SETS scan; each facet's aggregates carry the other facets' filters as
+    FILTER (WHERE ...) clauses."""
+    colunas = list(FACET_COLUMNS.values())
+    agregados = [
+        agregado
+        for nome in FACET_COLUMNS
+        for agregado in _facet_aggregates(_outros_filtros(por_facet, nome))
+    ]
+    return (
+        select(*colunas, *[func.grouping(coluna) for coluna in colunas], *agregados)
+        .select_from(Produto)
+        .outerjoin(Fornecedor, Produto.fornecedor_id == Fornecedor.id)
+        .where(*filtros)
+        .group_by(func.grouping_sets(*colunas))
+    )
+
+def _facet_rows_grouping_sets(filtros, por_facet):
+    nomes = list(FACET_COLUMNS)
+    quantidade = len(nomes)
+    for row in db.session.execute(facet_grouping_sets_select(filtros, por_facet)):
+        # GROUPING(col) is 0 for the column the row is grouped by
+        indice = list(row[quantidade:2 * quantidade]).index(0)
+        total, em_estoque = row[2 * quantidade + 2 * indice:2 * quantidade + 2 * indice + 2]
+        yield nomes[indice], row[indice], total, em_estoque
+
+def _facet_rows_union(filtros, por_facet):
+    selects = []
+    for nome, coluna in FACET_COLUMNS.items():
+        total, em_estoque = _facet_aggregates([])
+        selects.append(
+            select(
+                literal(nome).label("facet"),
+                coluna.label("valor"),
+                total.label("total"),
+                em_estoque.label("em_estoque"),
+            )
+            .select_from(Produto)
+            .outerjoin(Fornecedor, Produto.fornecedor_id == Fornecedor.id)
+            .where(*filtros, *_outros_filtros(por_facet, nome))
+            .group_by(coluna)
+        )
+    return db.session.execute(union_all(*selects))
+
+def facet_counts(filtros, por_facet=None):
+    """Counts products and in-stock products per value of each facet.
+
+    filtros apply to every facet; each facet also gets the por_facet filters of the other
+    facets but not its own, so ?tamanho=P still lists the other sizes (with the counts they
+    would have). A single GROUPING SETS scan on PostgreSQL, a single UNION ALL round trip
+    elsewhere. Returns {facet: [{"valor", "total", "em_estoque"}, ...]}.
+    """
+    por_facet = por_facet or {}
+    linhas = (
+        _facet_rows_grouping_sets(filtros, por_facet) if is_postgresql()
+        else _facet_rows_union(filtros, por_facet)
+    )
+    facets = {nome: [] for nome in FACET_COLUMNS}
+    for facet, valor, total, estoque in linhas:
+        # total is 0 for values only found in rows another facet's filter leaves out
+        if valor is None or valor == "" or not total:
+            continue
+        facets[facet].append({"valor": valor, "total": int(total), "em_estoque": int(estoque or 0)})
+    for valores in facets.values():
+        valores.sort(key=lambda v: v["valor"])
+    return facets
@@ -0,0 +1,66 @@
+# === utils/streaming.py ===
+"""Streamed list responses for full exports.
+
+`?stream=1` sends the same document as the buffered endpoint ({"success": true, "<key>": [...]})
+but writes it while iterating the query; `?format=ndjson` (or Accept: application/x-ndjson)
+sends one JSON object per line instead. Rows are fetched with yield_per, which uses a
+server-side cursor on PostgreSQL, so a worker holds about one batch of rows at a time.
+
+Status and headers are sent before the first row, so a failure mid-stream can only cut the
+body short: a JSON array then fails to parse, and an NDJSON consumer sees a missing tail.
+"""
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500
+
+
+def stream_mode():
+    """'ndjson', 'json' (streamed array) or None for the regular buffered response."""
+    if request.args.get("format") == "ndjson" or request.accept_mimetypes.best == NDJSON_MIMETYPE:
+        return "ndjson"
+    if request.args.get("stream", "").lower() in ("1", "true", "json"):
+        return "json"
+    return None
+
+
+def _rows(query, serialize, batch_size):
+    dumps = current_app.json.dumps
+    batch = []
+    for obj in query.yield_per(batch_size):
+        batch.append(dumps(serialize(obj)))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _generate(query, key, serialize, mode, batch_size):
+    try:
+        if mode == "ndjson":
+            for batch in _rows(query, serialize, batch_size):
+                yield "\n".join(batch) + "\n"
+            return
+
+        yield f'{{"success":true,"{key}":['
+        first = True
+        for batch in _rows(query, serialize, batch_size):
+            yield ("" if first else ",") + ",".join(batch)
+            first = False
+        yield "]}\n"
+    except Exception as e:
+        current_app.logger.error(f"Error streaming {key}: {e}", exc_info=True)
+        raise
+
+
+def stream_query(query, key, mode, serialize=lambda obj: obj.to_dict(), batch_size=None):
+    """Streaming response for query; each row is serialize(obj). See stream_mode() for mode."""
+    mimetype = NDJSON_MIMETYPE if mode == "ndjson" else "application/json"
+    response = Response(
+        stream_with_context(_generate(query, key, serialize, mode, batch_size or STREAM_BATCH_SIZE)),
+        mimetype=mimetype
+    )
+    # Let reverse proxies pass chunks through instead of buffering the whole export
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,101 @@
+# === utils/supplier_stats.py ===
+"""Per-supplier purchase, stock and sales figures (GET /api/fornecedores/?with_stats=1).
+
+Each fact table is aggregated by fornecedor_id in its own subquery before being joined to
+fornecedores, so the supplier list and its stats come back in one statement without the
+row fan-out (and double counting) a plain join of ledger, products and sale items causes.
+
+- pecas_compradas: units of 'compra' ledger entries;
+- pecas_em_estoque: positive quantidade_atual of the supplier's products;
+- pecas_vendidas, receita, cmv: items of sales not cancelled (unit price and unit cost at the
+  time of sale);
+- dias_medios_para_venda: average days from data_compra to the sale, weighted by units.
+"""
+from sqlalchemy import Date, case, cast, func, select
+
+from src.models import Fornecedor, ItemVenda, Produto, TransacaoEstoque, Venda
+from src.models.sale import STATUS_CANCELADO
+from src.utils.product_search import is_postgresql
+
+
+def wants_stats(args):
+    return args.get("with_stats", "").lower() in ("1", "true")
+
+
+def _dias_ate_venda():
+    if is_postgresql():
+        # date - date is an integer number of days
+        return cast(Venda.data_venda, Date) - Produto.data_compra
+    return func.julianday(func.date(Venda.data_venda)) - func.julianday(Produto.data_compra)
+
+
+def with_supplier_stats(stmt):
+    """Adds the stats columns to a fornecedor_select() statement."""
+    compras = (
+        select(Produto.fornecedor_id, func.sum(TransacaoEstoque.quantidade).label("pecas"))
+        .join(Produto, Produto.id == TransacaoEstoque.produto_id)
+        .where(TransacaoEstoque.tipo_transacao == "compra")
+        .group_by(Produto.fornecedor_id)
+        .subquery()
+    )
+    estoque = (
+        select(
+            Produto.fornecedor_id,
+            func.sum(case((Produto.quantidade_atual > 0, Produto.quantidade_atual), else_=0)).label("pecas")
+        )
+        .group_by(Produto.fornecedor_id)
+        .subquery()
+    )
+    dias = _dias_ate_venda()
+    vendas = (
+        select(
+            Produto.fornecedor_id,
+            func.sum(ItemVenda.quantidade).label("pecas"),
+            func.sum(ItemVenda.preco_unitario * ItemVenda.quantidade).label("receita"),
+            func.sum(ItemVenda.custo_unitario * ItemVenda.quantidade).label("cmv"),
+            # Items of products without data_compra don't count towards the average
+            func.sum(case((Produto.data_compra.isnot(None), dias * ItemVenda.quantidade))).label("dias_ponderados"),
+            func.sum(case((Produto.data_compra.isnot(None), ItemVenda.quantidade))).label("pecas_com_data"),
+        )
+        .select_from(ItemVenda)
+        .join(Produto, Produto.id == ItemVenda.produto_id)
+        .join(Venda, Venda.id == ItemVenda.venda_id)
+        .where(Venda.status != STATUS_CANCELADO)
+        .group_by(Produto.fornecedor_id)
+        .subquery()
+    )
+    return (
+        stmt.add_columns(
+            func.coalesce(compras.c.pecas, 0).label("pecas_compradas"),
+            func.coalesce(estoque.c.pecas, 0).label("pecas_em_estoque"),
+            func.coalesce(vendas.c.pecas, 0).label("pecas_vendidas"),
+            func.coalesce(vendas.c.receita, 0).label("receita"),
+            func.coalesce(vendas.c.cmv, 0).label("cmv"),
+            vendas.c.dias_ponderados,
+            vendas.c.pecas_com_data,
+        )
+        .outerjoin(compras, compras.c.fornecedor_id == Fornecedor.id)
+        .outerjoin(estoque, estoque.c.fornecedor_id == Fornecedor.id)
+        .outerjoin(vendas, vendas.c.fornecedor_id == Fornecedor.id)
+    )
+
+
+def nest_stats(fornecedor):
+    """Moves the stats columns of a row dict into fornecedor["estatisticas"]; returns it."""
+    receita = round(float(fornecedor.pop("receita")), 2)
+    cmv = round(float(fornecedor.pop("cmv")), 2)
+    dias_ponderados = fornecedor.pop("dias_ponderados")
+    pecas_com_data = fornecedor.pop("pecas_com_data")
+    fornecedor["estatisticas"] = {
+        "pecas_compradas": int(fornecedor.pop("pecas_compradas")),
+        "pecas_em_estoque": int(fornecedor.pop("pecas_em_estoque")),
+        "pecas_vendidas": int(fornecedor.pop("pecas_vendidas")),
+        "receita": receita,
+        "cmv": cmv,
+        "margem": round(receita - cmv, 2),
+        "margem_percentual": round((receita - cmv) / receita * 100, 2) if receita else None,
+        "dias_medios_para_venda": (
+            round(float(dias_ponderados) / pecas_com_data, 1) if pecas_com_data else None
+        ),
+    }
+    return fornecedor
@@ -1,5 +1,12 @@
 # wsgi.py
-from src.main import app
+from src.concurrency import patch_for_serving_mode
+
+# Must run before src.main imports the database drivers (SERVING_MODE=gevent)
+patch_for_serving_mode()
+
+from src.main import create_app
+
+app = create_app()
 
 if __name__ == "__main__":
     app.run()